@@ -0,0 +1,6 @@
+"""Offline benchmarks, a fake Divera server and soak runs for the integration.
+
+Run them with ``python -m pytest benchmarks/bench_divera.py`` or
+``benchmarks/bench_soak.py`` (see benchmarks/README.md); the normal test run
+does not collect them.
+"""
@@ -0,0 +1,352 @@
+"""Benchmarks of the Divera client, its getters and the entity updates.
+
+Run from the repository root (offline; the API is served on localhost):
+
+    python -m pytest benchmarks/bench_divera.py
+
+Environment variables:
+    DIVERA_BENCH_SIZE: small, medium (default) or large (see payload.SIZES).
+    DIVERA_BENCH_ROUNDS: Rounds per benchmark (default 20).
+    DIVERA_BENCH_JSON: Results file (default benchmarks/results.json).
+    DIVERA_BENCH_RECORDING: A recording whose pull/all sequence is replayed
+        by test_replay (skipped without one).
+"""
+
+from datetime import timedelta
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from homeassistant.helpers.update_coordinator import (  # noqa: E402
+    DataUpdateCoordinator,
+)
+from homeassistant.util import dt as dt_util  # noqa: E402
+from homeassistant.util.json import json_loads  # noqa: E402
+from yarl import URL  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.divera247.calendar_index import (  # noqa: E402
+    DiveraEventIndex,
+)
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_FLOW_MINOR_VERSION,
+    CONF_FLOW_VERSION,
+    DATA_ACCESSKEY,
+    DATA_BASE_URL,
+    DATA_SCHEDULER,
+    DATA_UCRS,
+    DIVERA_API_ALARMS_PATH,
+    DIVERA_API_PULL_PATH,
+    DOMAIN,
+    PARAM_UCR,
+)
+from custom_components.divera247.divera247 import DiveraClient  # noqa: E402
+from custom_components.divera247.events import diff_snapshots  # noqa: E402
+from custom_components.divera247.recorder import read_recording  # noqa: E402
+from custom_components.divera247.scheduler import DiveraPollScheduler  # noqa: E402
+from custom_components.divera247.snapshot import (  # noqa: E402
+    DiveraSnapshot,
+    changed_slices,
+    helper_key,
+)
+
+from .payload import (  # noqa: E402
+    ACCESSKEY,
+    SIZES,
+    generate_alarms_v2,
+    generate_pull_all,
+    mutate_pull_all,
+)
+from .results import RESULTS_KEY, BenchmarkResults  # noqa: E402
+
+SIZE = os.environ.get("DIVERA_BENCH_SIZE", "medium")
+ROUNDS = int(os.environ.get("DIVERA_BENCH_ROUNDS", "20"))
+RESULTS_FILE = Path(
+    os.environ.get("DIVERA_BENCH_JSON", Path(__file__).parent / "results.json")
+)
+SPEC = SIZES[SIZE]
+RECORDING = os.environ.get("DIVERA_BENCH_RECORDING")
+# Fixed, so runs on different days produce the same payload
+NOW = 1_767_225_600  # 2026-01-01 00:00 UTC
+# Vehicles and helpers changed per pull in the update benchmarks
+CHANGES = 3
+
+
+class PayloadServer:
+    """Serves generated payloads as pull/all and /api/v2/alarms."""
+
+    def __init__(self, pull_all: dict, alarms_v2: dict) -> None:
+        """Serve pull_all and alarms_v2 until set_pull_all is called."""
+        self.set_pull_all(pull_all)
+        self.alarms_v2 = web.json_response(alarms_v2).body
+
+    def set_pull_all(self, pull_all: dict) -> None:
+        """Serve another pull/all body from the next request on."""
+        self.pull_all = web.json_response(pull_all).body
+
+    async def _pull_all(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.pull_all, content_type="application/json")
+
+    async def _alarms(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.alarms_v2, content_type="application/json")
+
+    def app(self) -> web.Application:
+        """Return the application serving the payloads."""
+        app = web.Application()
+        app.router.add_get("/api/v2/pull/all", self._pull_all)
+        app.router.add_get("/api/v2/alarms", self._alarms)
+        return app
+
+
+@pytest.fixture(scope="module")
+def results(request):
+    """Collect the timings of the module and write them at its end."""
+    collected = BenchmarkResults(
+        ROUNDS, {"size": SIZE, "spec": SPEC.as_dict(), "changes": CHANGES}
+    )
+    yield collected
+    collected.write(RESULTS_FILE)
+    # Printed by pytest_terminal_summary in conftest.py
+    request.config.stash[RESULTS_KEY] = (collected, RESULTS_FILE)
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    """The generated pull/all body, its alarms and its JSON encoding."""
+    pull_all = generate_pull_all(SPEC, NOW)
+    alarms_v2 = generate_alarms_v2(pull_all)
+    return pull_all, alarms_v2, web.json_response(pull_all).body
+
+
+@pytest.fixture
+def history_db(monkeypatch, tmp_path):
+    """Keep the history database out of the shared test config directory."""
+    monkeypatch.setattr(
+        "custom_components.divera247.history.HISTORY_DB_FILE",
+        str(tmp_path / "history.db"),
+    )
+
+
+def _client(pull_all: dict, alarms_v2: dict) -> DiveraClient:
+    """Return a client holding the data of the payloads."""
+    client = DiveraClient(None, ACCESSKEY, ucr_id=1)
+    client.restore_data(pull_all, alarms_v2)
+    return client
+
+
+def test_parse(results, payloads):
+    """Decoding the body and building the snapshot."""
+    pull_all, alarms_v2, body = payloads
+    results.measure("parse.json_decode", lambda: json_loads(body))
+    results.measure(
+        "parse.snapshot", lambda: DiveraSnapshot.from_payload(pull_all, alarms_v2)
+    )
+    snapshot = DiveraSnapshot.from_payload(pull_all, alarms_v2)
+    results.measure("parse.slices", snapshot.slices)
+
+
+async def test_pull_data(results, payloads, socket_enabled):
+    """A changed pull over loopback HTTP: request, hash, decode and snapshot."""
+    pull_all, alarms_v2, _ = payloads
+    server = PayloadServer(pull_all, alarms_v2)
+    test_server = TestServer(server.app())
+    await test_server.start_server()
+    # Alternating bodies, so every pull is a change
+    bodies = [pull_all, mutate_pull_all(pull_all, CHANGES, seed=1)]
+    pulls = 0
+
+    async def _change() -> None:
+        nonlocal pulls
+        server.set_pull_all(bodies[pulls % 2])
+        pulls += 1
+
+    try:
+        async with ClientSession() as session:
+            client = DiveraClient(
+                session,
+                ACCESSKEY,
+                base_url=str(test_server.make_url("")).rstrip("/"),
+                ucr_id=1,
+            )
+            await results.measure_async("pull.changed", client.pull_data, setup=_change)
+            await results.measure_async("pull.unchanged", client.pull_data)
+    finally:
+        await test_server.close()
+
+
+def test_getters(results, payloads):
+    """Every getter the entities and services call, on one snapshot."""
+    pull_all, alarms_v2, _ = payloads
+    client = _client(pull_all, alarms_v2)
+    vehicle_ids = client.get_vehicle_id_list()
+    helper_keys = [helper_key(helper) for helper in client.get_helpers()]
+    group_ids = list(pull_all["data"]["cluster"]["group"])
+    ucr_ids = client.get_all_ucrs()
+    state_name = client.get_all_state_name()[0]
+
+    getters = {
+        "get_user": client.get_user,
+        "get_user_state": client.get_user_state,
+        "get_user_state_attributes": client.get_user_state_attributes,
+        "get_all_state_name": client.get_all_state_name,
+        "get_state_id_by_name": lambda: client.get_state_id_by_name(state_name),
+        "find_state_name": lambda: client.find_state_name(state_name.upper()),
+        "get_last_alarm": client.get_last_alarm,
+        "get_last_alarm_attributes": client.get_last_alarm_attributes,
+        "has_open_alarms": client.has_open_alarms,
+        "get_last_news": client.get_last_news,
+        "get_last_news_attributes": client.get_last_news_attributes,
+        "get_last_event": client.get_last_event,
+        "get_vehicle_id_list": client.get_vehicle_id_list,
+        # Per vehicle, helper, group or UCR: all of them per round
+        "get_vehicle_state[all]": lambda: [
+            client.get_vehicle_state(vehicle_id) for vehicle_id in vehicle_ids
+        ],
+        "get_vehicle_attributes[all]": lambda: [
+            client.get_vehicle_attributes(vehicle_id) for vehicle_id in vehicle_ids
+        ],
+        "get_vehicle_name_by_id[all]": lambda: [
+            client.get_vehicle_name_by_id(vehicle_id) for vehicle_id in vehicle_ids
+        ],
+        "get_helpers": client.get_helpers,
+        "get_helper[all]": lambda: [client.get_helper(key) for key in helper_keys],
+        "get_helper_counts": client.get_helper_counts,
+        "get_group_name_by_id[all]": lambda: [
+            client.get_group_name_by_id(group_id) for group_id in group_ids
+        ],
+        "get_cluster_name_from_ucr[all]": lambda: [
+            client.get_cluster_name_from_ucr(ucr_id) for ucr_id in ucr_ids
+        ],
+        "get_all_cluster_names": client.get_all_cluster_names,
+        "get_cluster_version": client.get_cluster_version,
+        "get_organization_name": client.get_organization_name,
+        "check_usergroup_id": client.check_usergroup_id,
+    }
+    for name, getter in getters.items():
+        results.measure(f"getter.{name}", getter, number=10)
+
+
+def test_calendar(results, payloads):
+    """Building the event index and querying ranges of growing length."""
+    pull_all, alarms_v2, _ = payloads
+    client = _client(pull_all, alarms_v2)
+    events = client.get_snapshot().events
+    results.measure(
+        "calendar.index",
+        lambda: DiveraEventIndex(events, DiveraClient.map_event_to_calendar),
+    )
+    start = dt_util.utc_from_timestamp(NOW)
+    for name, days in (("day", 1), ("week", 7), ("month", 31), ("year", 366)):
+        end = start + timedelta(days=days)
+        results.measure(
+            f"calendar.get_events[{name}]",
+            lambda end=end: client.get_events(start, end),
+            number=10,
+        )
+
+
+async def test_entity_updates(
+    hass, enable_custom_integrations, socket_enabled, history_db, results, payloads
+):
+    """Setup, and refreshes updating the entities of all platforms."""
+    pull_all, alarms_v2, _ = payloads
+    server = PayloadServer(pull_all, alarms_v2)
+    test_server = TestServer(server.app())
+    await test_server.start_server()
+    # No request budget: the refreshes follow each other without pause
+    hass.data.setdefault(DOMAIN, {})[DATA_SCHEDULER] = DiveraPollScheduler(
+        rate=1e9, burst=10**9
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONF_FLOW_VERSION,
+        minor_version=CONF_FLOW_MINOR_VERSION,
+        data={
+            DATA_ACCESSKEY: ACCESSKEY,
+            DATA_UCRS: [1],
+            DATA_BASE_URL: str(test_server.make_url("")).rstrip("/"),
+        },
+    )
+    entry.add_to_hass(hass)
+
+    started = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    results.add("entities.setup", [time.perf_counter() - started])
+    results.meta["entities"] = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+    coordinator = entry.runtime_data.coordinators[1]
+    mutations = 0
+
+    async def _change() -> None:
+        nonlocal mutations
+        mutations += 1
+        server.set_pull_all(mutate_pull_all(pull_all, CHANGES, seed=mutations))
+
+    async def _refresh() -> None:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    try:
+        await results.measure_async("entities.refresh_changed", _refresh, setup=_change)
+        await results.measure_async("entities.refresh_unchanged", _refresh)
+
+        def _update_all() -> None:
+            # As after a failed refresh: every entity of every platform
+            coordinator.changed_slices = None
+            DataUpdateCoordinator.async_update_listeners(coordinator)
+
+        results.measure("entities.update_all", _update_all)
+    finally:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await test_server.close()
+
+
+@pytest.mark.skipif(not RECORDING, reason="DIVERA_BENCH_RECORDING not set")
+def test_replay(results):
+    """Snapshots and change events of a recorded pull/all sequence."""
+    _, responses = read_recording(RECORDING)
+    # Per UCR, the recorded bodies with the /api/v2/alarms body of their time
+    sequences: dict[str | None, list[tuple[dict, dict | None]]] = {}
+    alarms_v2: dict[str | None, dict] = {}
+    for response in responses:
+        url = URL(response["url"])
+        ucr_id = url.query.get(PARAM_UCR)
+        if response["body"] is None:
+            continue
+        if url.path == DIVERA_API_ALARMS_PATH:
+            alarms_v2[ucr_id] = response["body"]
+        elif url.path == DIVERA_API_PULL_PATH:
+            sequences.setdefault(ucr_id, []).append(
+                (response["body"], alarms_v2.get(ucr_id))
+            )
+    results.meta["recording"] = {
+        "responses": len(responses),
+        "bodies": sum(len(sequence) for sequence in sequences.values()),
+    }
+
+    def _snapshots() -> list[list[DiveraSnapshot]]:
+        return [
+            [DiveraSnapshot.from_payload(*bodies) for bodies in sequence]
+            for sequence in sequences.values()
+        ]
+
+    def _diff(snapshots: list[list[DiveraSnapshot]]) -> None:
+        for sequence in snapshots:
+            slices = [snapshot.slices() for snapshot in sequence]
+            for index in range(1, len(sequence)):
+                changed = changed_slices(slices[index - 1], slices[index])
+                diff_snapshots(sequence[index - 1], sequence[index], changed)
+
+    results.measure("replay.snapshots", _snapshots)
+    snapshots = _snapshots()
+    results.measure("replay.diff", lambda: _diff(snapshots))
@@ -0,0 +1,154 @@
+"""Soak run of many config entries against the fake Divera server.
+
+Run from the repository root (offline; the API is served on localhost):
+
+    python -m pytest benchmarks/bench_soak.py
+
+The entries poll on their own timers, with telemetry enabled, while the
+server runs through the scenario. Every DIVERA_SOAK_SAMPLE seconds the
+throughput, errors, request/update/alarm latencies and memory are sampled
+into the results file.
+
+Environment variables:
+    DIVERA_SOAK_ENTRIES: Config entries, each with its own access key
+        (default 20).
+    DIVERA_SOAK_DURATION: Seconds to run (default 300; hours for leaks).
+    DIVERA_SOAK_SCENARIO: A scenario of fake_server.SCENARIOS or a JSON file
+        (default mixed).
+    DIVERA_SOAK_INTERVAL: Scan interval of the entries in seconds (default 10).
+    DIVERA_SOAK_SAMPLE: Seconds between samples (default 10).
+    DIVERA_SOAK_THROTTLE: 1 to keep the poll budget of the integration; by
+        default it is lifted, so the client and coordinators see the full
+        load.
+    DIVERA_BENCH_SIZE: Payload size per access key (default small).
+    DIVERA_SOAK_RECORDING: Replay this recording instead of a scenario; the
+        entries poll the recorded UCRs.
+    DIVERA_SOAK_SPEED: Time factor of the replay (default 1).
+    DIVERA_SOAK_JSON: Results file (default benchmarks/soak.json).
+"""
+
+import asyncio
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp.test_utils import TestServer  # noqa: E402
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_FLOW_MINOR_VERSION,
+    CONF_FLOW_VERSION,
+    CONF_SCAN_INTERVAL,
+    CONF_TELEMETRY,
+    DATA_ACCESSKEY,
+    DATA_BASE_URL,
+    DATA_SCHEDULER,
+    DATA_UCRS,
+    DOMAIN,
+)
+from custom_components.divera247.recorder import read_recording  # noqa: E402
+from custom_components.divera247.scheduler import DiveraPollScheduler  # noqa: E402
+
+from .fake_server import FakeDiveraServer, load_scenario  # noqa: E402
+from .payload import SIZES  # noqa: E402
+from .replay import ReplayServer  # noqa: E402
+from .results import SOAK_KEY  # noqa: E402
+from .soak import SoakRecorder  # noqa: E402
+
+ENTRIES = int(os.environ.get("DIVERA_SOAK_ENTRIES", "20"))
+DURATION = float(os.environ.get("DIVERA_SOAK_DURATION", "300"))
+SCENARIO = os.environ.get("DIVERA_SOAK_SCENARIO", "mixed")
+INTERVAL = int(os.environ.get("DIVERA_SOAK_INTERVAL", "10"))
+SAMPLE = float(os.environ.get("DIVERA_SOAK_SAMPLE", "10"))
+THROTTLE = os.environ.get("DIVERA_SOAK_THROTTLE") == "1"
+SIZE = os.environ.get("DIVERA_BENCH_SIZE", "small")
+RECORDING = os.environ.get("DIVERA_SOAK_RECORDING")
+SPEED = float(os.environ.get("DIVERA_SOAK_SPEED", "1"))
+RESULTS_FILE = Path(
+    os.environ.get("DIVERA_SOAK_JSON", Path(__file__).parent / "soak.json")
+)
+
+
+@pytest.fixture
+def history_db(monkeypatch, tmp_path):
+    """Keep the history database out of the shared test config directory."""
+    monkeypatch.setattr(
+        "custom_components.divera247.history.HISTORY_DB_FILE",
+        str(tmp_path / "history.db"),
+    )
+
+
+async def test_soak(
+    hass, enable_custom_integrations, socket_enabled, history_db, request
+):
+    """Poll with ENTRIES config entries for DURATION seconds."""
+    if RECORDING:
+        _, responses = await hass.async_add_executor_job(read_recording, RECORDING)
+        server = ReplayServer(responses, speed=SPEED)
+        ucr_ids = server.ucr_ids
+    else:
+        server = FakeDiveraServer(load_scenario(SCENARIO), SIZES[SIZE])
+        ucr_ids = [1]
+    test_server = TestServer(server.app())
+    await test_server.start_server()
+    if not THROTTLE:
+        hass.data.setdefault(DOMAIN, {})[DATA_SCHEDULER] = DiveraPollScheduler(
+            rate=1e9, burst=10**9
+        )
+    recorder = SoakRecorder(
+        RESULTS_FILE,
+        {
+            "entries": ENTRIES,
+            "scenario": SCENARIO if not RECORDING else None,
+            "recording": RECORDING,
+            "speed": SPEED if RECORDING else None,
+            "phases": [phase.name for phase in server.scenario],
+            "interval": INTERVAL,
+            "throttle": THROTTLE,
+            "size": SIZE,
+            "spec": SIZES[SIZE].as_dict(),
+        },
+    )
+    request.config.stash[SOAK_KEY] = recorder
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=CONF_FLOW_VERSION,
+            minor_version=CONF_FLOW_MINOR_VERSION,
+            data={
+                DATA_ACCESSKEY: f"soak-accesskey-{index:04d}",
+                DATA_UCRS: ucr_ids,
+                DATA_BASE_URL: str(test_server.make_url("")).rstrip("/"),
+            },
+            options={CONF_SCAN_INTERVAL: INTERVAL, CONF_TELEMETRY: True},
+        )
+        for index in range(ENTRIES)
+    ]
+    try:
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinators = [
+            coordinator
+            for entry in entries
+            for coordinator in entry.runtime_data.coordinators.values()
+        ]
+        server.take_stats()  # the setup is not part of the samples
+        started = time.monotonic()
+        while (elapsed := time.monotonic() - started) < DURATION:
+            await asyncio.sleep(min(SAMPLE, DURATION - elapsed))
+            recorder.sample(
+                time.monotonic() - started, server.take_stats(), coordinators
+            )
+    finally:
+        for entry in entries:
+            if entry.state is ConfigEntryState.LOADED:
+                await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await test_server.close()
@@ -0,0 +1,77 @@
+"""Compare two benchmark results files.
+
+    python -m benchmarks.compare old.json new.json [--threshold 10]
+
+Prints the change of the median of every benchmark and exits with 1 if one
+got slower by more than the threshold (percent).
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+from typing import Any
+
+from .results import load
+
+
+def compare(
+    old: dict[str, Any], new: dict[str, Any], threshold: float
+) -> tuple[list[str], list[str]]:
+    """
+    Compare the medians of two runs.
+
+    Args:
+        old (dict[str, Any]): The baseline run.
+        new (dict[str, Any]): The run to check.
+        threshold (float): Percent a median may grow before it is a regression.
+
+    Returns:
+        tuple[list[str], list[str]]: The report lines and the names of the
+            regressed benchmarks.
+    """
+    lines: list[str] = []
+    regressions: list[str] = []
+    if old.get("spec") != new.get("spec"):
+        lines.append("warning: the runs used different payload specs")
+    old_results, new_results = old["results"], new["results"]
+    width = max((len(name) for name in old_results | new_results), default=0)
+    for name in sorted(old_results | new_results):
+        if name not in old_results or name not in new_results:
+            where = "new" if name not in old_results else "old"
+            lines.append(f"{name:<{width}}  only in {where} run")
+            continue
+        before = old_results[name]["median"]
+        after = new_results[name]["median"]
+        change = (after - before) / before * 100 if before else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        lines.append(f"{name:<{width}}  {change:+7.1f} %{marker}")
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the comparison from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", type=Path, help="baseline results file")
+    parser.add_argument("new", type=Path, help="results file to check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="percent a median may grow (default: 10)",
+    )
+    args = parser.parse_args(argv)
+    old, new = load(args.old), load(args.new)
+    lines, regressions = compare(old, new, args.threshold)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for line in lines:
+        print(line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Report the benchmark and soak results at the end of the pytest run."""
+
+from .results import RESULTS_KEY, SOAK_KEY
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print the median and min of every benchmark and the soak totals."""
+    stashed = config.stash.get(RESULTS_KEY, None)
+    if stashed is not None:
+        results, path = stashed
+        terminalreporter.section("Divera benchmarks")
+        for line in results.summary():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"results written to {path}")
+    recorder = config.stash.get(SOAK_KEY, None)
+    if recorder is not None:
+        terminalreporter.section("Divera soak run")
+        for line in recorder.summary():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"samples written to {recorder.path}")
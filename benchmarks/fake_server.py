@@ -0,0 +1,469 @@
+"""Local stand-in for the Divera 24/7 API, driven by scriptable scenarios.
+
+Serves /api/v2/pull/all, /api/v2/alarms, /api/v2/statusgeber/set-status and
+/api/test-push for any number of access keys, each with a payload of its own
+(see payload.py). A scenario is a list of phases that add latency, answer
+with errors, raise new alarms, change statuses or grow the payload; the
+last phase is followed by the first again.
+
+Standalone, to point a Home Assistant instance at it (base URL
+http://localhost:8080, any access key):
+
+    python -m benchmarks.fake_server --scenario alarm_storm --size medium
+
+The soak harness (bench_soak.py) serves it from within the test run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, fields
+import hashlib
+import json
+from pathlib import Path
+import random
+import time
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from custom_components.divera247.const import (
+    DIVERA_API_ALARMS_PATH,
+    DIVERA_API_PULL_PATH,
+    DIVERA_API_STATUS_PATH,
+)
+
+from .payload import SIZES, PayloadSpec, generate_alarms_v2, generate_pull_all
+
+TEST_PUSH_PATH = "/api/test-push"
+"""Path of the probe alarm endpoint (not a constant of the integration)."""
+
+MAX_ALARMS = 200
+"""Alarms kept per access key; the oldest are dropped during alarm storms."""
+
+
+@dataclass(frozen=True, slots=True)
+class Phase:
+    """
+    One step of a scenario.
+
+    Attributes:
+        name (str): Shown in the soak reports.
+        duration (float): Seconds the phase lasts.
+        latency (float): Seconds every response is delayed.
+        error_status (int | None): Status answered instead of the body, e.g.
+            401 or 503; None for no errors.
+        error_rate (float): Share of the requests answered with error_status.
+        alarm_every (float | None): Seconds between new alarms per access key.
+        change_every (float | None): Seconds between vehicle and helper status
+            changes per access key.
+        growth (float): Helpers and events added per second and access key.
+    """
+
+    name: str = "steady"
+    duration: float = 60.0
+    latency: float = 0.0
+    error_status: int | None = None
+    error_rate: float = 1.0
+    alarm_every: float | None = None
+    change_every: float | None = 30.0
+    growth: float = 0.0
+
+
+SCENARIOS: dict[str, tuple[Phase, ...]] = {
+    "steady": (Phase(),),
+    "alarm_storm": (
+        Phase(duration=120),
+        Phase(name="alarm_storm", duration=60, alarm_every=2, change_every=1),
+    ),
+    "slow": (
+        Phase(duration=60),
+        Phase(name="slow", duration=120, latency=5),
+    ),
+    "unauthorized": (
+        Phase(duration=60),
+        Phase(name="unauthorized", duration=30, error_status=401),
+    ),
+    "server_errors": (
+        Phase(duration=120),
+        Phase(name="server_errors", duration=60, error_status=503, error_rate=0.8),
+    ),
+    "growth": (Phase(name="growth", duration=3600, growth=0.5),),
+    "mixed": (
+        Phase(duration=120),
+        Phase(name="alarm_storm", duration=60, alarm_every=2, change_every=1),
+        Phase(name="slow", duration=60, latency=3),
+        Phase(name="server_errors", duration=30, error_status=503, error_rate=0.5),
+        Phase(name="growth", duration=120, growth=1),
+    ),
+}
+"""Built-in scenarios. Home Assistant stops polling a UCR after a 401, so
+"unauthorized" is not part of "mixed"."""
+
+
+def load_scenario(name_or_path: str) -> tuple[Phase, ...]:
+    """
+    Return a built-in scenario or one read from a JSON file.
+
+    The file holds a list of phases, each an object with the fields of Phase,
+    e.g. ``[{"name": "slow", "duration": 30, "latency": 2}]``.
+
+    Args:
+        name_or_path (str): A key of SCENARIOS or the path of a JSON file.
+
+    Returns:
+        tuple[Phase, ...]: The phases of the scenario.
+
+    Raises:
+        ValueError: If the scenario is unknown or the file is invalid.
+    """
+    if name_or_path in SCENARIOS:
+        return SCENARIOS[name_or_path]
+    path = Path(name_or_path)
+    if not path.is_file():
+        raise ValueError(
+            f"Unknown scenario {name_or_path!r}, use a file or one of "
+            + ", ".join(SCENARIOS)
+        )
+    known = {field.name for field in fields(Phase)}
+    try:
+        phases = json.loads(path.read_text(encoding="utf-8"))
+        if not phases:
+            raise ValueError(f"{path}: no phases")
+        return tuple(
+            Phase(**{key: value for key, value in phase.items() if key in known})
+            for phase in phases
+        )
+    except (TypeError, AttributeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"{path}: invalid scenario ({exc})") from None
+
+
+class _Account:
+    """Payload and scenario state of one access key."""
+
+    def __init__(self, spec: PayloadSpec, now: float, seed: int) -> None:
+        self.pull_all = generate_pull_all(spec, int(now))
+        self.rng = random.Random(seed)
+        data = self.pull_all["data"]
+        self.next_alarm_id = 1000 + len(data["alarm"]["items"])
+        self.next_helper_id = len(data["helpers"]) + 1
+        self.next_event_id = 3000 + len(data["events"]["items"])
+        self.updated = now
+        # Fractions of the alarms, changes and growth due since `updated`
+        self.due: Counter[str] = Counter()
+        # Encoded bodies and ETags by path, dropped on every change
+        self.bodies: dict[str, tuple[bytes, str]] = {}
+
+    def body(self, path: str) -> tuple[bytes, str]:
+        """Return the encoded body of an endpoint and its ETag."""
+        if path not in self.bodies:
+            payload = (
+                self.pull_all
+                if path == DIVERA_API_PULL_PATH
+                else generate_alarms_v2(self.pull_all)
+            )
+            body = json.dumps(payload).encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            self.bodies[path] = (body, etag)
+        return self.bodies[path]
+
+    def advance(self, phase: Phase, now: float) -> None:
+        """Apply the alarms, changes and growth of the phase due until now."""
+        elapsed = now - self.updated
+        self.updated = now
+        if phase.alarm_every:
+            self.due["alarm"] += elapsed / phase.alarm_every
+        if phase.change_every:
+            self.due["change"] += elapsed / phase.change_every
+        self.due["growth"] += elapsed * phase.growth
+        while self.due["alarm"] >= 1:
+            self.due["alarm"] -= 1
+            self.add_alarm("Einsatz", now)
+        if self.due["change"] >= 1:
+            self.change_status(int(self.due["change"]))
+            self.due["change"] %= 1
+        if self.due["growth"] >= 1:
+            self.grow(int(self.due["growth"]), now)
+            self.due["growth"] %= 1
+
+    def add_alarm(self, title: str, now: float) -> None:
+        """Open a new alarm, the previous ones are no longer new."""
+        data = self.pull_all["data"]
+        items = {
+            alarm_id: {**alarm, "new": False}
+            for alarm_id, alarm in data["alarm"]["items"].items()
+        }
+        if items:
+            template = next(iter(items.values()))
+        else:
+            template = {"group": [], "vehicle": [], "ucr_self_addressed": True}
+        alarm_id = self.next_alarm_id
+        self.next_alarm_id += 1
+        items = {
+            str(alarm_id): {
+                **template,
+                "id": alarm_id,
+                "foreign_id": f"E-{alarm_id}",
+                "title": f"{title} {alarm_id}",
+                "text": f"Einsatztext {alarm_id}",
+                "date": int(now),
+                "ts_update": int(now),
+                "closed": False,
+                "new": True,
+                "ucr_answered": {},
+            },
+            **items,
+        }
+        for alarm_id in list(items)[MAX_ALARMS:]:
+            del items[alarm_id]
+        self._replace(
+            alarm={"sorting": [int(alarm_id) for alarm_id in items], "items": items}
+        )
+
+    def change_status(self, count: int) -> None:
+        """Change the FMS status of vehicles and the status of helpers."""
+        data = self.pull_all["data"]
+        vehicles = dict(data["cluster"]["vehicle"])
+        for vehicle_id in self.rng.sample(sorted(vehicles), min(count, len(vehicles))):
+            vehicle = vehicles[vehicle_id]
+            vehicles[vehicle_id] = {
+                **vehicle,
+                "fmsstatus_id": vehicle["fmsstatus_id"] % 6 + 1,
+                "fmsstatus_ts": int(time.time()),
+            }
+        helpers = list(data["helpers"])
+        for index in self.rng.sample(range(len(helpers)), min(count, len(helpers))):
+            helper = helpers[index]
+            helpers[index] = {
+                **helper,
+                "status": "inactive" if helper["status"] == "active" else "active",
+            }
+        self._replace(cluster={**data["cluster"], "vehicle": vehicles}, helpers=helpers)
+
+    def grow(self, count: int, now: float) -> None:
+        """Add helpers and events."""
+        data = self.pull_all["data"]
+        helpers = list(data["helpers"])
+        events = dict(data["events"]["items"])
+        for _ in range(count):
+            helper_id = self.next_helper_id
+            self.next_helper_id += 1
+            helpers.append(
+                {
+                    "id": helper_id,
+                    "firstname": f"Vorname{helper_id}",
+                    "lastname": f"Nachname{helper_id}",
+                    "status": "active",
+                    "group": [],
+                    "qualification": [],
+                }
+            )
+            event_id = self.next_event_id
+            self.next_event_id += 1
+            start = int(now) + self.rng.randint(1, 365) * 86400
+            events[str(event_id)] = {
+                "id": event_id,
+                "title": f"Termin {event_id}",
+                "text": f"Dienst {event_id}",
+                "address": "Gerätehaus",
+                "start": start,
+                "end": start + 7200,
+                "group": [],
+            }
+        self._replace(
+            helpers=helpers,
+            events={
+                "sorting": sorted(
+                    (int(event_id) for event_id in events),
+                    key=lambda event_id: events[str(event_id)]["start"],
+                ),
+                "items": events,
+            },
+        )
+
+    def set_status(self, status_id: int) -> None:
+        """Set the status of the user, as the status buttons do."""
+        self._replace(
+            status={"status_id": status_id, "status_set_date": int(time.time())}
+        )
+
+    def _replace(self, **sections: Any) -> None:
+        """Replace sections of the payload, keeping the old one intact."""
+        self.pull_all = {
+            **self.pull_all,
+            "data": {**self.pull_all["data"], **sections},
+        }
+        self.bodies.clear()
+
+
+class FakeDiveraServer:
+    """
+    Serves the Divera API for any access key, following a scenario.
+
+    Every access key gets a payload of its own on its first request, so
+    config entries with distinct keys behave like distinct users.
+    """
+
+    def __init__(
+        self,
+        scenario: tuple[Phase, ...] = SCENARIOS["steady"],
+        spec: PayloadSpec = SIZES["small"],
+        seed: int = 0,
+    ) -> None:
+        """
+        Initialize FakeDiveraServer.
+
+        Args:
+            scenario (tuple[Phase, ...], optional): The phases to run through,
+                starting when the application starts. Defaults to "steady".
+            spec (PayloadSpec, optional): Size of the payload of every access
+                key. Defaults to the "small" size.
+            seed (int, optional): Seed of the errors and changes. Defaults to 0.
+        """
+        self.scenario = scenario
+        self.spec = spec
+        self.rng = random.Random(seed)
+        self.accounts: dict[str, _Account] = {}
+        self.started = time.monotonic()
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self.bytes_sent = 0
+        # Names of the phases requests were served in, in order
+        self.phases: dict[str, None] = {}
+
+    def phase(self) -> Phase:
+        """Return the phase of the scenario running now."""
+        elapsed = (time.monotonic() - self.started) % sum(
+            phase.duration for phase in self.scenario
+        )
+        for phase in self.scenario:
+            if elapsed < phase.duration:
+                return phase
+            elapsed -= phase.duration
+        return self.scenario[-1]
+
+    def take_stats(self) -> dict[str, Any]:
+        """
+        Return the requests and bytes served since the last call.
+
+        Returns:
+            dict[str, Any]: phases (names of the phases served in), requests
+                (count by "path status") and bytes_sent.
+        """
+        stats = {
+            "phases": list(self.phases),
+            "requests": {
+                f"{path} {status}": count
+                for (path, status), count in sorted(self.requests.items())
+            },
+            "bytes_sent": self.bytes_sent,
+        }
+        self.requests.clear()
+        self.bytes_sent = 0
+        self.phases.clear()
+        return stats
+
+    def app(self) -> web.Application:
+        """Return the application; the scenario starts with it."""
+        app = web.Application()
+        app.router.add_get(DIVERA_API_PULL_PATH, self._get)
+        app.router.add_get(DIVERA_API_ALARMS_PATH, self._get)
+        app.router.add_post(DIVERA_API_STATUS_PATH, self._set_status)
+        app.router.add_post(TEST_PUSH_PATH, self._test_push)
+        app.on_startup.append(self._start)
+        return app
+
+    async def _start(self, app: web.Application) -> None:
+        self.started = time.monotonic()
+
+    async def _account(
+        self, request: web.Request
+    ) -> tuple[_Account | None, web.Response | None]:
+        """Apply the phase to a request: its account, or the error to answer."""
+        phase = self.phase()
+        self.phases[phase.name] = None
+        if phase.latency:
+            await asyncio.sleep(phase.latency)
+        accesskey = request.query.get("accesskey")
+        if not accesskey:
+            return None, self._respond(request, {"success": False}, status=401)
+        if phase.error_status and self.rng.random() < phase.error_rate:
+            return None, self._respond(
+                request, {"success": False}, status=phase.error_status
+            )
+        now = time.time()
+        account = self.accounts.get(accesskey)
+        if account is None:
+            account = self.accounts[accesskey] = _Account(
+                self.spec, now, seed=len(self.accounts)
+            )
+        account.advance(phase, now)
+        return account, None
+
+    def _respond(
+        self, request: web.Request, payload: Any, status: int = 200
+    ) -> web.Response:
+        response = web.json_response(payload, status=status)
+        self._count(request, response)
+        return response
+
+    def _count(self, request: web.Request, response: web.Response) -> None:
+        self.requests[(request.path, response.status)] += 1
+        self.bytes_sent += len(response.body or b"")
+
+    async def _get(self, request: web.Request) -> web.Response:
+        account, error = await self._account(request)
+        if account is None:
+            return error
+        body, etag = account.body(request.path)
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            response = web.Response(status=304, headers={hdrs.ETAG: etag})
+        else:
+            response = web.Response(
+                body=body, content_type="application/json", headers={hdrs.ETAG: etag}
+            )
+        self._count(request, response)
+        return response
+
+    async def _set_status(self, request: web.Request) -> web.Response:
+        account, error = await self._account(request)
+        if account is None:
+            return error
+        try:
+            status_id = int((await request.json())["Status"]["id"])
+        except (ValueError, TypeError, KeyError):
+            return self._respond(request, {"success": False}, status=400)
+        account.set_status(status_id)
+        return self._respond(request, {"success": True})
+
+    async def _test_push(self, request: web.Request) -> web.Response:
+        account, error = await self._account(request)
+        if account is None:
+            return error
+        account.add_alarm("Probealarm", time.time())
+        return self._respond(request, {"success": True})
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve the fake API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--scenario",
+        default="steady",
+        help=f"one of {', '.join(SCENARIOS)} or a JSON file (default: steady)",
+    )
+    parser.add_argument("--size", choices=SIZES, default="medium")
+    args = parser.parse_args(argv)
+    try:
+        scenario = load_scenario(args.scenario)
+    except ValueError as exc:
+        parser.error(str(exc))
+    server = FakeDiveraServer(scenario, SIZES[args.size])
+    web.run_app(server.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
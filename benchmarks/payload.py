@@ -0,0 +1,274 @@
+"""Synthetic pull/all and /api/v2/alarms payloads of configurable size.
+
+The payloads have the shape DiveraClient reads (see tests/test_divera247.py
+for a minimal one); the sizes, not the content, are what the benchmarks
+vary. The same spec and seed always produce the same payload.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import random
+from typing import Any
+
+HELPER_STATUSES = ("active", "inactive", "on_duty")
+"""Helper status values, as counted by the status sensors."""
+
+ACCESSKEY = "benchmark-accesskey"
+"""Access key of the generated user (never a real one)."""
+
+
+@dataclass(frozen=True, slots=True)
+class PayloadSpec:
+    """
+    Size of a generated payload.
+
+    Attributes:
+        helpers (int): Helper records.
+        vehicles (int): Vehicles of the cluster.
+        groups (int): Groups of the cluster.
+        alarms (int): Alarms; the first one is open, the others closed.
+        news (int): News items.
+        events (int): Calendar events, spread over one year around now.
+        ucrs (int): UCRs of the user (the first one is active).
+        seed (int): Seed of the random content.
+    """
+
+    helpers: int = 100
+    vehicles: int = 20
+    groups: int = 10
+    alarms: int = 10
+    news: int = 10
+    events: int = 50
+    ucrs: int = 1
+    seed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the spec as a dict, e.g. for the benchmark results."""
+        return asdict(self)
+
+
+SIZES: dict[str, PayloadSpec] = {
+    "small": PayloadSpec(helpers=20, vehicles=5, groups=3, alarms=3, news=3, events=10),
+    "medium": PayloadSpec(),
+    "large": PayloadSpec(
+        helpers=1000, vehicles=200, groups=50, alarms=100, news=100, events=1000
+    ),
+}
+"""Named specs, chosen with DIVERA_BENCH_SIZE in the benchmarks."""
+
+
+def generate_pull_all(spec: PayloadSpec, now: int) -> dict[str, Any]:
+    """
+    Return a pull/all body of the given size.
+
+    Args:
+        spec (PayloadSpec): The size of the payload.
+        now (int): Unix time the alarms, news and events are dated around.
+
+    Returns:
+        dict[str, Any]: The decoded body of /api/v2/pull/all.
+    """
+    rng = random.Random(spec.seed)
+    group_ids = [str(group_id) for group_id in range(1, spec.groups + 1)]
+    vehicle_ids = [str(vehicle_id) for vehicle_id in range(1, spec.vehicles + 1)]
+
+    def _some_groups() -> list[int]:
+        if not group_ids:
+            return []
+        chosen = rng.sample(group_ids, min(3, len(group_ids)))
+        return [int(group_id) for group_id in chosen]
+
+    alarms = {
+        str(alarm_id): {
+            "id": alarm_id,
+            "foreign_id": f"E-{alarm_id}",
+            "title": f"Einsatz {alarm_id}",
+            "text": f"Einsatztext {alarm_id}",
+            "address": f"Musterstraße {alarm_id}, 12345 Musterstadt",
+            "lat": 50.0 + rng.random(),
+            "lng": 8.0 + rng.random(),
+            "date": now - 3600 * index,
+            "ts_update": now - 3600 * index,
+            "priority": rng.random() < 0.5,
+            "closed": index > 0,
+            "new": index == 0,
+            "group": _some_groups(),
+            "vehicle": [
+                int(vehicle_id)
+                for vehicle_id in rng.sample(vehicle_ids, min(3, len(vehicle_ids)))
+            ],
+            "ucr_answered": {"1": {"1": {"ts": now - 60, "note": ""}}},
+            "ucr_self_addressed": True,
+        }
+        for index, alarm_id in enumerate(range(1000, 1000 + spec.alarms))
+    }
+    news = {
+        str(news_id): {
+            "id": news_id,
+            "title": f"Mitteilung {news_id}",
+            "text": f"Mitteilungstext {news_id}",
+            "address": "",
+            "date": now - 86400 * index,
+            "group": _some_groups(),
+            "new": index == 0,
+            "ucr_self_addressed": True,
+        }
+        for index, news_id in enumerate(range(2000, 2000 + spec.news))
+    }
+    events: dict[str, dict[str, Any]] = {}
+    for event_id in range(3000, 3000 + spec.events):
+        start = now + rng.randint(-182, 182) * 86400 + rng.randint(0, 23) * 3600
+        events[str(event_id)] = {
+            "id": event_id,
+            "title": f"Termin {event_id}",
+            "text": f"Dienst {event_id}",
+            "address": "Gerätehaus",
+            "start": start,
+            "end": start + rng.choice((1, 2, 3, 24)) * 3600,
+            "group": _some_groups(),
+        }
+    return {
+        "success": True,
+        "data": {
+            "user": {
+                "firstname": "Max",
+                "lastname": "Muster",
+                "email": "max@example.org",
+                "accesskey": ACCESSKEY,
+            },
+            "status": {"status_id": 1, "status_set_date": now - 600},
+            "ucr_default": 1,
+            "ucr_active": 1,
+            "ucr": {
+                str(ucr_id): {
+                    "name": f"FF Benchmark {ucr_id}",
+                    "cluster_id": 100 + ucr_id,
+                    "usergroup_id": 8,
+                }
+                for ucr_id in range(1, spec.ucrs + 1)
+            },
+            "cluster": {
+                "name": "FF Benchmark 1",
+                "organisation": "Feuerwehr",
+                "version_id": 3,
+                "status": {
+                    str(status_id): {"name": f"Status {status_id}"}
+                    for status_id in range(1, 10)
+                },
+                "statussorting": list(range(1, 10)),
+                "group": {
+                    group_id: {"id": int(group_id), "name": f"Gruppe {group_id}"}
+                    for group_id in group_ids
+                },
+                "vehicle": {
+                    vehicle_id: {
+                        "id": int(vehicle_id),
+                        "shortname": f"HLF {vehicle_id}",
+                        "name": f"Florian Musterstadt {vehicle_id}",
+                        "fullname": f"Hilfeleistungslöschfahrzeug {vehicle_id}",
+                        "fmsstatus_id": rng.randint(1, 6),
+                        "fmsstatus_note": "",
+                        "fmsstatus_ts": now - rng.randint(0, 86400),
+                        "lat": 50.0 + rng.random(),
+                        "lng": 8.0 + rng.random(),
+                        "opta": f"FL MUS {vehicle_id}",
+                        "issi": str(1000000 + int(vehicle_id)),
+                        "number": vehicle_id,
+                    }
+                    for vehicle_id in vehicle_ids
+                },
+            },
+            "helpers": [
+                {
+                    "id": helper_id,
+                    "firstname": f"Vorname{helper_id}",
+                    "lastname": f"Nachname{helper_id}",
+                    "status": rng.choice(HELPER_STATUSES),
+                    "group": _some_groups(),
+                    "qualification": rng.sample(range(1, 11), 2),
+                }
+                for helper_id in range(1, spec.helpers + 1)
+            ],
+            "alarm": {
+                "sorting": [int(alarm_id) for alarm_id in alarms],
+                "items": alarms,
+            },
+            "news": {"sorting": [int(news_id) for news_id in news], "items": news},
+            "events": {
+                "sorting": sorted(
+                    (int(event_id) for event_id in events),
+                    key=lambda event_id: events[str(event_id)]["start"],
+                ),
+                "items": events,
+            },
+        },
+    }
+
+
+def generate_alarms_v2(pull_all: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the /api/v2/alarms body matching a generated pull/all body.
+
+    Args:
+        pull_all (dict[str, Any]): A body of generate_pull_all.
+
+    Returns:
+        dict[str, Any]: The decoded body of /api/v2/alarms.
+    """
+    alarms = pull_all["data"]["alarm"]["items"]
+    return {
+        "success": True,
+        "data": {
+            "items": {
+                alarm_id: {"id": alarm["id"], "vehicle": alarm["vehicle"]}
+                for alarm_id, alarm in alarms.items()
+            }
+        },
+    }
+
+
+def mutate_pull_all(
+    pull_all: dict[str, Any], changes: int, seed: int
+) -> dict[str, Any]:
+    """
+    Return a copy of a pull/all body with some vehicles and helpers changed.
+
+    Only the changed records and their containers are copied, so a mutation
+    costs as much as a real pull with a few status changes would.
+
+    Args:
+        pull_all (dict[str, Any]): A body of generate_pull_all.
+        changes (int): Vehicles and helpers (each) whose status changes.
+        seed (int): Seed choosing the changed records.
+
+    Returns:
+        dict[str, Any]: The changed body.
+    """
+    rng = random.Random(seed)
+    data = pull_all["data"]
+    vehicles = dict(data["cluster"]["vehicle"])
+    for vehicle_id in rng.sample(sorted(vehicles), min(changes, len(vehicles))):
+        vehicle = vehicles[vehicle_id]
+        vehicles[vehicle_id] = {
+            **vehicle,
+            "fmsstatus_id": vehicle["fmsstatus_id"] % 6 + 1,
+            "fmsstatus_ts": vehicle["fmsstatus_ts"] + 1,
+        }
+    helpers = list(data["helpers"])
+    for index in rng.sample(range(len(helpers)), min(changes, len(helpers))):
+        status = helpers[index]["status"]
+        helpers[index] = {
+            **helpers[index],
+            "status": HELPER_STATUSES[
+                (HELPER_STATUSES.index(status) + 1) % len(HELPER_STATUSES)
+            ],
+        }
+    return {
+        **pull_all,
+        "data": {
+            **data,
+            "cluster": {**data["cluster"], "vehicle": vehicles},
+            "helpers": helpers,
+        },
+    }
@@ -0,0 +1,166 @@
+"""Replay of recorded Divera responses (see recorder.py of the integration).
+
+Serves a recording as the Divera API: in real time, the response recorded at
+the same offset from the start (accelerated by --speed), or in steps, one
+recorded response per request and UCR. Any access key is accepted; the
+config entry has to use the recorded UCRs.
+
+    python -m benchmarks.replay divera247_recordings/<entry_id>.jsonl.gz --speed 60
+
+The soak harness replays a recording with DIVERA_SOAK_RECORDING, the
+benchmarks with DIVERA_BENCH_RECORDING.
+"""
+
+from __future__ import annotations
+
+import argparse
+from bisect import bisect_right
+from collections import Counter
+import json
+import time
+from typing import Any
+
+from aiohttp import hdrs, web
+from yarl import URL
+
+from custom_components.divera247.const import DIVERA_API_PULL_PATH, PARAM_UCR
+from custom_components.divera247.recorder import read_recording
+
+from .fake_server import FakeDiveraServer, Phase
+
+
+class ReplayServer(FakeDiveraServer):
+    """
+    Serves the responses of a recording, with the statistics of the fake server.
+
+    Responses recorded without a body (304, unchanged or errors) keep the
+    last body of their path and UCR, so conditional requests get a 304
+    whenever the recorded ones did.
+    """
+
+    def __init__(
+        self, responses: list[dict[str, Any]], speed: float = 1.0, step: bool = False
+    ) -> None:
+        """
+        Initialize ReplayServer.
+
+        Args:
+            responses (list[dict[str, Any]]): The responses of read_recording.
+            speed (float, optional): Factor the recorded time is accelerated
+                by. Defaults to 1.0.
+            step (bool, optional): Serve the next recorded response on every
+                request instead. Defaults to False.
+        """
+        start = responses[0]["time"] if responses else 0.0
+        # Offsets, statuses and body indexes by path and UCR
+        self.offsets: dict[tuple[str, str | None], list[float]] = {}
+        self.frames: dict[tuple[str, str | None], list[tuple[int, int | None]]] = {}
+        self.bodies: list[bytes] = []
+        last_body: dict[tuple[str, str | None], int] = {}
+        for response in responses:
+            url = URL(response["url"])
+            key = (url.path, url.query.get(PARAM_UCR))
+            if response["body"] is not None:
+                self.bodies.append(json.dumps(response["body"]).encode())
+                last_body[key] = len(self.bodies) - 1
+            self.offsets.setdefault(key, []).append(response["time"] - start)
+            self.frames.setdefault(key, []).append(
+                (response["status"], last_body.get(key))
+            )
+        self.duration = max(
+            (offsets[-1] for offsets in self.offsets.values()), default=0.0
+        )
+        self.speed = speed
+        self.step = step
+        self.cursors: Counter[tuple[str, str | None]] = Counter()
+        super().__init__(
+            (
+                Phase(
+                    name="replay",
+                    duration=max(self.duration / speed, 1.0),
+                    change_every=None,
+                ),
+            )
+        )
+
+    @property
+    def ucr_ids(self) -> list[int]:
+        """The UCRs pull/all was recorded for."""
+        return sorted(
+            int(ucr_id)
+            for path, ucr_id in self.frames
+            if path == DIVERA_API_PULL_PATH and ucr_id is not None
+        )
+
+    @property
+    def finished(self) -> bool:
+        """Whether the last recorded response was served (or is due)."""
+        if self.step:
+            return all(
+                self.cursors[key] >= len(frames) for key, frames in self.frames.items()
+            )
+        return (time.monotonic() - self.started) * self.speed >= self.duration
+
+    async def _get(self, request: web.Request) -> web.Response:
+        key = (request.path, request.query.get(PARAM_UCR))
+        frames = self.frames.get(key)
+        if not frames:
+            return self._respond(request, {"success": False}, status=404)
+        if self.step:
+            index = min(self.cursors[key], len(frames) - 1)
+            self.cursors[key] += 1
+        else:
+            offset = (time.monotonic() - self.started) * self.speed
+            index = max(bisect_right(self.offsets[key], offset) - 1, 0)
+        status, body_index = frames[index]
+        if status >= 400 or body_index is None:
+            # Before the first body only an error can be replayed
+            status = status if status >= 400 else 503
+            return self._respond(request, {"success": False}, status=status)
+        etag = f'"{body_index}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            response = web.Response(status=304, headers={hdrs.ETAG: etag})
+        else:
+            response = web.Response(
+                body=self.bodies[body_index],
+                content_type="application/json",
+                headers={hdrs.ETAG: etag},
+            )
+        self._count(request, response)
+        return response
+
+    async def _set_status(self, request: web.Request) -> web.Response:
+        # The recording decides the status
+        return self._respond(request, {"success": True})
+
+    async def _test_push(self, request: web.Request) -> web.Response:
+        return self._respond(request, {"success": True})
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve a recording from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="a recording (.jsonl.gz)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="time factor (default: 1)"
+    )
+    parser.add_argument(
+        "--step", action="store_true", help="one recorded response per request"
+    )
+    args = parser.parse_args(argv)
+    try:
+        _, responses = read_recording(args.recording)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    server = ReplayServer(responses, speed=args.speed, step=args.step)
+    print(
+        f"{len(responses)} responses over {server.duration:.0f} s, "
+        f"UCRs {', '.join(map(str, server.ucr_ids)) or '-'}"
+    )
+    web.run_app(server.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
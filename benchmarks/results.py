@@ -0,0 +1,187 @@
+"""Timing and machine-readable results of the benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from .soak import SoakRecorder
+
+SCHEMA_VERSION = 1
+"""Version of the results file format."""
+
+
+class BenchmarkResults:
+    """
+    Collects the timings of one benchmark run.
+
+    Every benchmark runs its operation `number` times per round; the time per
+    operation of each round is kept, and min, median and mean over the
+    rounds are written. Compare runs by min or median, not by mean.
+    """
+
+    def __init__(self, rounds: int, meta: dict[str, Any]) -> None:
+        """
+        Initialize BenchmarkResults.
+
+        Args:
+            rounds (int): Rounds per benchmark.
+            meta (dict[str, Any]): Run information written with the results,
+                e.g. the payload spec.
+        """
+        self.rounds = rounds
+        self.meta = meta
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def measure(self, name: str, func: Callable[[], Any], number: int = 1) -> None:
+        """
+        Time a synchronous operation.
+
+        Args:
+            name (str): Name of the benchmark, unique within the run.
+            func (Callable[[], Any]): The operation.
+            number (int, optional): Calls per round. Defaults to 1.
+        """
+        func()  # warm-up: caches and lazy imports are not measured
+        timings = []
+        for _ in range(self.rounds):
+            started = perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((perf_counter() - started) / number)
+        self.add(name, timings)
+
+    async def measure_async(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        number: int = 1,
+        setup: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """
+        Time an asynchronous operation.
+
+        Args:
+            name (str): Name of the benchmark, unique within the run.
+            func (Callable[[], Awaitable[Any]]): The operation.
+            number (int, optional): Calls per round. Defaults to 1.
+            setup (Callable[[], Awaitable[Any]] | None, optional): Runs before
+                every call, outside the timing. Defaults to None.
+        """
+        timings = []
+        for _ in range(self.rounds + 1):
+            elapsed = 0.0
+            for _ in range(number):
+                if setup is not None:
+                    await setup()
+                started = perf_counter()
+                await func()
+                elapsed += perf_counter() - started
+            timings.append(elapsed / number)
+        # The first round is the warm-up
+        self.add(name, timings[1:])
+
+    def add(self, name: str, timings: list[float]) -> None:
+        """
+        Add the per-operation timings (seconds) of a benchmark.
+
+        Args:
+            name (str): Name of the benchmark, unique within the run.
+            timings (list[float]): Seconds per operation, one per round.
+        """
+        self.results[name] = {
+            "rounds": len(timings),
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+            "unit": "s",
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the run as written to the results file."""
+        return {
+            "schema": SCHEMA_VERSION,
+            "created": datetime.now(UTC).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **self.meta,
+            "results": dict(sorted(self.results.items())),
+        }
+
+    def write(self, path: Path) -> None:
+        """
+        Write the run as JSON.
+
+        Args:
+            path (Path): The results file; its directory is created.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def summary(self) -> list[str]:
+        """Return one line per benchmark with its median and min."""
+        width = max((len(name) for name in self.results), default=0)
+        return [
+            f"{name:<{width}}  median {_format(result['median'])}"
+            f"  min {_format(result['min'])}"
+            for name, result in sorted(self.results.items())
+        ]
+
+
+RESULTS_KEY = pytest.StashKey[tuple[BenchmarkResults, Path]]()
+"""Stash key of the results of a pytest run and the file they were written to."""
+
+SOAK_KEY: pytest.StashKey[SoakRecorder] = pytest.StashKey()
+"""Stash key of the recorder of a soak run (see soak.py)."""
+
+
+def load(path: Path) -> dict[str, Any]:
+    """
+    Read a results file.
+
+    Args:
+        path (Path): A file written by BenchmarkResults.write.
+
+    Returns:
+        dict[str, Any]: The run.
+
+    Raises:
+        ValueError: If the file has another schema version.
+    """
+    run = json.loads(path.read_text(encoding="utf-8"))
+    if run.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schema {run.get('schema')!r}")
+    return run
+
+
+def _format(seconds: float) -> str:
+    """Return a duration with a unit that keeps 3-4 significant digits."""
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:8.3f} {unit}"
+    return f"{seconds * 1e9:8.1f} ns"
+
+
+def git_commit() -> str | None:
+    """Return the commit the benchmarks ran on, None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,191 @@
+"""Samples and report of a soak run against the fake server."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import gc
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import sys
+from typing import Any
+
+from custom_components.divera247.coordinator import DiveraCoordinator
+from custom_components.divera247.telemetry import (
+    METRIC_ALARM_LATENCY,
+    METRIC_REQUEST_TIME,
+    METRIC_UPDATE_TIME,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed
+
+from .results import git_commit
+
+SOAK_SCHEMA_VERSION = 1
+"""Version of the soak results file format."""
+
+
+def rss_bytes() -> int | None:
+    """
+    Return the resident memory of the process.
+
+    Returns:
+        int | None: Bytes in use on Linux; elsewhere the peak so far, None if
+            the platform reports neither.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # not available on Windows
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _across(coordinators: list[DiveraCoordinator], metric: str) -> dict[str, Any]:
+    """Return the median p50 and the worst p95 of a metric over the UCRs."""
+    stats = [
+        coordinator.telemetry.stats(metric)
+        for coordinator in coordinators
+        if coordinator.telemetry is not None
+    ]
+    p50 = [stat["p50"] for stat in stats if stat["p50"] is not None]
+    p95 = [stat["p95"] for stat in stats if stat["p95"] is not None]
+    return {
+        "count": sum(stat["count"] for stat in stats),
+        "p50": statistics.median(p50) if p50 else None,
+        "p95": max(p95, default=None),
+    }
+
+
+class SoakRecorder:
+    """
+    Collects the samples of a soak run and writes them as JSON.
+
+    The file is rewritten after every sample, so an aborted run of several
+    hours still leaves its results behind.
+    """
+
+    def __init__(self, path: Path, meta: dict[str, Any]) -> None:
+        """
+        Initialize SoakRecorder.
+
+        Args:
+            path (Path): The results file; its directory is created.
+            meta (dict[str, Any]): Run information written with the samples.
+        """
+        self.path = path
+        self.meta = meta
+        self.created = datetime.now(UTC).isoformat()
+        self.samples: list[dict[str, Any]] = []
+
+    def sample(
+        self,
+        elapsed: float,
+        server_stats: dict[str, Any],
+        coordinators: list[DiveraCoordinator],
+    ) -> dict[str, Any]:
+        """
+        Add a sample and rewrite the results file.
+
+        Args:
+            elapsed (float): Seconds since the entries were set up.
+            server_stats (dict[str, Any]): FakeDiveraServer.take_stats().
+            coordinators (list[DiveraCoordinator]): The coordinators of all
+                entries.
+
+        Returns:
+            dict[str, Any]: The sample.
+        """
+        since = elapsed - (self.samples[-1]["elapsed"] if self.samples else 0.0)
+        requests = sum(server_stats["requests"].values())
+        errors = sum(
+            count
+            for key, count in server_stats["requests"].items()
+            if int(key.rsplit(" ", 1)[1]) >= 400
+        )
+        sample = {
+            "elapsed": round(elapsed, 1),
+            **server_stats,
+            "throughput": round(requests / since, 2) if since else None,
+            "errors": errors,
+            "failing": sum(
+                not coordinator.last_update_success for coordinator in coordinators
+            ),
+            # Home Assistant stops polling a UCR after an authentication error
+            "auth_failed": sum(
+                isinstance(coordinator.last_exception, ConfigEntryAuthFailed)
+                for coordinator in coordinators
+            ),
+            "request_time_ms": _across(coordinators, METRIC_REQUEST_TIME),
+            "update_time_ms": _across(coordinators, METRIC_UPDATE_TIME),
+            "alarm_latency_s": _across(coordinators, METRIC_ALARM_LATENCY),
+            "rss_bytes": rss_bytes(),
+            "gc_objects": len(gc.get_objects()),
+        }
+        self.samples.append(sample)
+        self.write()
+        return sample
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the run as written to the results file."""
+        return {
+            "schema": SOAK_SCHEMA_VERSION,
+            "created": self.created,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **self.meta,
+            "samples": self.samples,
+        }
+
+    def write(self) -> None:
+        """Write the run as JSON."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8"
+        )
+
+    def summary(self) -> list[str]:
+        """Return the totals of the run, for the terminal."""
+        if not self.samples:
+            return ["no samples"]
+        duration = self.samples[-1]["elapsed"]
+        requests = sum(sum(sample["requests"].values()) for sample in self.samples)
+        request_p95 = [
+            sample["request_time_ms"]["p95"]
+            for sample in self.samples
+            if sample["request_time_ms"]["p95"] is not None
+        ]
+        lines = [
+            f"duration          {duration:.0f} s, {len(self.samples)} samples",
+            f"requests          {requests} ({requests / duration:.2f}/s), "
+            f"{sum(sample['errors'] for sample in self.samples)} errors",
+            f"request p95       worst {max(request_p95, default=0):.1f} ms",
+            f"failing at end    {self.samples[-1]['failing']} UCRs, "
+            f"{self.samples[-1]['auth_failed']} stopped by auth errors",
+        ]
+        rss = [
+            (sample["elapsed"], sample["rss_bytes"])
+            for sample in self.samples
+            if sample["rss_bytes"]
+        ]
+        if len(rss) > 2:
+            # Growth over the second half: the first one includes the warm-up
+            (start, before), (end, after) = rss[len(rss) // 2], rss[-1]
+            per_hour = (after - before) / max(end - start, 1) * 3600
+            lines.append(
+                f"memory            {after / 2**20:.1f} MiB at end, max "
+                f"{max(value for _, value in rss) / 2**20:.1f} MiB, "
+                f"{per_hour / 2**20:+.1f} MiB/h over the second half"
+            )
+        lines.append(
+            f"gc objects        {self.samples[0]['gc_objects']} -> "
+            f"{self.samples[-1]['gc_objects']}"
+        )
+        return lines
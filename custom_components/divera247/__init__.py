@@ -5,27 +5,75 @@ from __future__ import annotations
 import asyncio
 from pathlib import Path
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, CONF_NAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_API_KEY, CONF_NAME, CONF_WEBHOOK_ID, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+from homeassistant.util.dt import parse_time
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALARMS_V2_ON_CHANGE,
+    CONF_FAST_SCAN_INTERVAL,
     CONF_FLOW_MINOR_VERSION,
     CONF_FLOW_VERSION,
+    CONF_HISTORY,
+    CONF_PUSH_ENABLED,
+    CONF_QUIET_HOURS_END,
+    CONF_QUIET_HOURS_START,
+    CONF_QUIET_SCAN_INTERVAL,
+    CONF_RECORD_RESPONSES,
     CONF_SCAN_INTERVAL,
+    CONF_STATUS_SENSORS,
+    CONF_TELEMETRY,
+    CONF_VEHICLE_NAME_MODE,
     DATA_ACCESSKEY,
     DATA_BASE_URL,
+    DATA_HISTORY,
     DATA_UCRS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ALARMS_V2_ON_CHANGE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_HISTORY,
+    DEFAULT_PUSH_ENABLED,
+    DEFAULT_QUIET_SCAN_INTERVAL,
+    DEFAULT_RECORD_RESPONSES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATUS_SENSORS,
+    DEFAULT_TELEMETRY,
     DIVERA_BASE_URL,
     DIVERA_GMBH,
     DOMAIN,
+    HISTORY_KIND_ALARM,
+    HISTORY_KIND_EVENT,
+    HISTORY_KIND_NEWS,
+    HISTORY_QUERY_LIMIT,
     LOGGER,
+    RECORDING_DIR,
+    SERVICE_GET_HISTORY,
+    SIGNAL_OPTIONS_UPDATED,
 )
-from .coordinator import DiveraCoordinator
+from .coordinator import AdaptivePolling, DiveraCoordinator
 from .data import DiveraRuntimeData
 from .divera247 import DiveraClient, DiveraError
+from .fetcher import DiveraFetcher
+from .history import async_get_history
+from .push import async_register_push
+from .recorder import DiveraRecorder
+from .scheduler import async_get_scheduler
+from .store import DiveraSnapshotStore
+from .telemetry import DiveraTelemetry
 
 __version__ = "0.0.0"  # Lazy-loaded inside async_setup_entry
 
@@ -40,6 +88,66 @@ PLATFORMS = [
 
 type DiveraConfigEntry = ConfigEntry[DiveraRuntimeData]
 
+ATTR_KIND = "kind"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_KEYWORD = "keyword"
+ATTR_UCR_ID = "ucr_id"
+ATTR_GROUP = "group"
+ATTR_LIMIT = "limit"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_KIND): vol.In(
+            [HISTORY_KIND_ALARM, HISTORY_KIND_NEWS, HISTORY_KIND_EVENT]
+        ),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_KEYWORD): cv.string,
+        vol.Optional(ATTR_UCR_ID): vol.Coerce(str),
+        vol.Optional(ATTR_GROUP): vol.Coerce(str),
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_QUERY_LIMIT)
+        ),
+    }
+)
+
+
+def _adaptive_polling_from_options(options) -> AdaptivePolling | None:
+    """
+    Build the adaptive polling settings from the config entry options.
+
+    :param options: Options of the config entry
+    :return: The settings, or None if adaptive polling is disabled
+    """
+    if not options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+        return None
+    quiet_start = options.get(CONF_QUIET_HOURS_START)
+    quiet_end = options.get(CONF_QUIET_HOURS_END)
+    return AdaptivePolling(
+        fast_interval=int(
+            options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+        ),
+        quiet_interval=int(
+            options.get(CONF_QUIET_SCAN_INTERVAL, DEFAULT_QUIET_SCAN_INTERVAL)
+        ),
+        quiet_start=parse_time(quiet_start) if quiet_start else None,
+        quiet_end=parse_time(quiet_end) if quiet_end else None,
+    )
+
+
+def _scan_interval_from_options(options) -> int:
+    """
+    Return the scan interval from the config entry options.
+
+    :param options: Options of the config entry
+    :return: The scan interval in seconds (fallback to the default)
+    """
+    try:
+        return int(options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+    except Exception:
+        return DEFAULT_SCAN_INTERVAL
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
     """
@@ -86,6 +194,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
 
     websession = async_get_clientsession(hass)
     tasks = []
+    pending: list[int] = []
     coordinators = {}
 
     # Create a DiveraClient instance and store it for the service
@@ -93,12 +202,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
     hass.data[DOMAIN]["divera_client"] = divera_client
 
     # Determine update interval from options (fallback to default)
-    try:
-        scan_interval = int(
-            entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    scan_interval = _scan_interval_from_options(entry.options)
+    alarms_v2_on_change = bool(
+        entry.options.get(CONF_ALARMS_V2_ON_CHANGE, DEFAULT_ALARMS_V2_ON_CHANGE)
+    )
+    adaptive_polling = _adaptive_polling_from_options(entry.options)
+    # One fetcher per entry: entries are unique per user, i.e. per access key
+    fetcher = DiveraFetcher(
+        websession,
+        accesskey,
+        base_url=base_url,
+        alarms_v2_on_change=alarms_v2_on_change,
+    )
+
+    # Integration-wide: spreads the polls of all entries and budgets requests
+    scheduler = async_get_scheduler(hass)
+    scheduler.register(entry.entry_id)
+    entry.async_on_unload(lambda: scheduler.unregister(entry.entry_id))
+
+    # Data of the last run: entities are set up from it without waiting for
+    # the network, the live refresh runs in the background
+    store = DiveraSnapshotStore(hass, entry.entry_id)
+    await store.async_load()
+    restored: list[DiveraCoordinator] = []
+    # Integration-wide: keeps alarms, news and events beyond the API window
+    history = None
+    if entry.options.get(CONF_HISTORY, DEFAULT_HISTORY):
+        history = async_get_history(hass)
+    telemetry = bool(entry.options.get(CONF_TELEMETRY, DEFAULT_TELEMETRY))
+    # One recording per entry, shared by its UCRs (the URLs keep the UCR)
+    recorder = None
+    if entry.options.get(CONF_RECORD_RESPONSES, DEFAULT_RECORD_RESPONSES):
+        recorder = DiveraRecorder(
+            hass, hass.config.path(RECORDING_DIR, f"{entry.entry_id}.jsonl.gz")
         )
-    except Exception:
-        scan_interval = DEFAULT_SCAN_INTERVAL
+        LOGGER.info("Recording the API responses to %s", recorder.path)
 
     for ucr_id in ucr_ids:
         divera_coordinator = DiveraCoordinator(
@@ -108,18 +246,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
             base_url=base_url,
             ucr_id=ucr_id,
             update_interval=scan_interval,
+            alarms_v2_on_change=alarms_v2_on_change,
+            adaptive_polling=adaptive_polling,
+            fetcher=fetcher,
+            scheduler=scheduler,
+            poll_group=entry.entry_id,
+            store=store,
+            history=history,
+            telemetry=DiveraTelemetry() if telemetry else None,
+            recorder=recorder,
         )
         coordinators[ucr_id] = divera_coordinator
-        tasks.append(divera_coordinator.async_config_entry_first_refresh())
+        if divera_coordinator.async_restore():
+            restored.append(divera_coordinator)
+        else:
+            pending.append(ucr_id)
+            tasks.append(divera_coordinator.async_config_entry_first_refresh())
 
     # Run initial refreshes with error collection
     results = await asyncio.gather(*tasks, return_exceptions=True)
-    errors: list[Exception] = [r for r in results if isinstance(r, Exception)]
-    if errors:
-        for err in errors:
-            LOGGER.error("Initial data refresh failed for Divera: %s", err)
-        # If any coordinator failed we abort setup to prevent partial broken state
-        return False
+    failed: dict[int, BaseException] = {}
+    for ucr_id, result in zip(pending, results):
+        if isinstance(result, ConfigEntryAuthFailed):
+            # Same access key for all units: start the reauth flow
+            raise result
+        if isinstance(result, BaseException):
+            failed[ucr_id] = result.__cause__ or result
+    if failed and len(failed) == len(coordinators):
+        raise ConfigEntryNotReady(
+            f"Initial data refresh failed for all units: {next(iter(failed.values()))}"
+        )
+    # Units that failed retry in the background (see DiveraCoordinator) and
+    # get their entities once their data arrives; the others start right away
+    for ucr_id, err in failed.items():
+        LOGGER.warning(
+            "Initial data refresh failed for UCR %s, retrying in the background: %s",
+            ucr_id,
+            err,
+        )
 
     # Register hub devices BEFORE loading platforms to ensure via_device references work
     from homeassistant.helpers import device_registry as dr
@@ -150,7 +314,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
             configuration_url=DIVERA_BASE_URL,
         )
 
-    entry.runtime_data = DiveraRuntimeData(coordinators)
+    entry.runtime_data = DiveraRuntimeData(
+        coordinators,
+        fetcher=fetcher,
+        data=dict(entry.data),
+        options=dict(entry.options),
+    )
 
     LOGGER.debug(
         "Divera setup completed for %d coordinator(s) (entry_id=%s)",
@@ -159,6 +328,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
     )
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
 
+    webhook_id: str | None = entry.options.get(CONF_WEBHOOK_ID)
+    if webhook_id and entry.options.get(CONF_PUSH_ENABLED, DEFAULT_PUSH_ENABLED):
+        entry.runtime_data.push_unregister = async_register_push(
+            hass, entry, webhook_id
+        )
+        LOGGER.debug("Push webhook registered (entry_id=%s)", entry.entry_id)
+
     # Register the service to trigger a test probe alarm
     async def trigger_probe_alarm_service(call):
         """
@@ -189,14 +365,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
             return
         # Validate available states (case-insensitive)
         try:
-            valid = divera_client.get_all_state_name()
+            match_name = divera_client.find_state_name(state_name)
         except Exception:
             LOGGER.error("❌ set_user_state: cannot fetch state list")
             return
-        match_name = next((s for s in valid if s.lower() == state_name.lower()), None)
         if match_name is None:
             LOGGER.error(
-                "❌ set_user_state: unknown state '%s' (valid: %s)", state_name, valid
+                "❌ set_user_state: unknown state '%s' (valid: %s)",
+                state_name,
+                divera_client.get_all_state_name(),
             )
             return
         try:
@@ -208,20 +385,95 @@ async def async_setup_entry(hass: HomeAssistant, entry: DiveraConfigEntry):
     LOGGER.info("🔔 Registering service divera247.set_user_state")
     hass.services.async_register(DOMAIN, "set_user_state", set_user_state_service)
 
+    # Service: query the alarm, news and event history
+    async def get_history_service(call: ServiceCall) -> ServiceResponse:
+        history = hass.data.get(DOMAIN, {}).get(DATA_HISTORY)
+        if history is None:
+            LOGGER.error("❌ get_history: the history is not enabled")
+            return {"items": []}
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        items = await history.async_query(
+            call.data[ATTR_KIND],
+            start=dt_util.as_utc(start) if start is not None else None,
+            end=dt_util.as_utc(end) if end is not None else None,
+            keyword=call.data.get(ATTR_KEYWORD),
+            ucr_id=call.data.get(ATTR_UCR_ID),
+            group=call.data.get(ATTR_GROUP),
+            limit=call.data[ATTR_LIMIT],
+        )
+        return {"items": items}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        get_history_service,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
     # Forward platform setups (must be awaited to avoid frame warning in HA >=2025.1)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     LOGGER.debug("Forwarded setups for platforms: %s", PLATFORMS)
+
+    for coordinator in restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{coordinator.name} refresh"
+        )
     return True
 
 
-async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+async def async_update_listener(hass: HomeAssistant, entry: DiveraConfigEntry) -> None:
     """
     Asynchronous update listener.
 
+    Changed units or credentials (the entry data), toggling the telemetry or
+    the status sensors (which adds or removes sensors), the recording or the
+    history reload the entry; other option changes are applied to the running coordinators and
+    entities.
+
     :param hass: Home Assistant instance
     :param entry: Config entry for Divera
     """
-    await hass.config_entries.async_reload(entry_id=entry.entry_id)
+    runtime_data = entry.runtime_data
+    old_options, options = runtime_data.options, dict(entry.options)
+    if dict(entry.data) != runtime_data.data or any(
+        bool(options.get(key, default)) != bool(old_options.get(key, default))
+        for key, default in (
+            (CONF_TELEMETRY, DEFAULT_TELEMETRY),
+            (CONF_RECORD_RESPONSES, DEFAULT_RECORD_RESPONSES),
+            (CONF_HISTORY, DEFAULT_HISTORY),
+            (CONF_STATUS_SENSORS, DEFAULT_STATUS_SENSORS),
+        )
+    ):
+        await hass.config_entries.async_reload(entry_id=entry.entry_id)
+        return
+    if options == old_options:
+        return
+    runtime_data.options = options
+
+    scan_interval = _scan_interval_from_options(options)
+    adaptive_polling = _adaptive_polling_from_options(options)
+    for coordinator in runtime_data.coordinators.values():
+        coordinator.async_set_polling(scan_interval, adaptive_polling)
+    if runtime_data.fetcher is not None:
+        runtime_data.fetcher.set_alarms_v2_on_change(
+            bool(options.get(CONF_ALARMS_V2_ON_CHANGE, DEFAULT_ALARMS_V2_ON_CHANGE))
+        )
+
+    webhook_id: str | None = options.get(CONF_WEBHOOK_ID)
+    push = bool(webhook_id and options.get(CONF_PUSH_ENABLED, DEFAULT_PUSH_ENABLED))
+    if runtime_data.push_unregister is not None and (
+        not push or webhook_id != old_options.get(CONF_WEBHOOK_ID)
+    ):
+        runtime_data.push_unregister()
+        runtime_data.push_unregister = None
+    if push and runtime_data.push_unregister is None:
+        runtime_data.push_unregister = async_register_push(hass, entry, webhook_id)
+
+    if options.get(CONF_VEHICLE_NAME_MODE) != old_options.get(CONF_VEHICLE_NAME_MODE):
+        async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id))
+    LOGGER.debug("Options applied without reload (entry_id=%s)", entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -246,6 +498,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Remove the data stored for a deleted config entry.
+
+    :param hass: Home Assistant instance
+    :param entry: Config entry for Divera
+    """
+    await DiveraSnapshotStore(hass, entry.entry_id).async_remove()
+    # The history file may also hold items of an earlier run with the history on
+    await async_get_history(hass).async_remove(entry.data.get(DATA_UCRS, []))
+
+
 async def async_migrate_entry(hass, config_entry: ConfigEntry):
     """
     Migrate old entry.
@@ -287,6 +551,17 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
         ucr_id = divera_client.get_active_ucr()
         new[DATA_UCRS] = [ucr_id]
 
+    if config_entry.version < 3 or config_entry.minor_version < 2:
+        # Helper sensors shared one unique id per UCR, so only the first
+        # helper was registered; they are now keyed by helper
+        entity_registry = er.async_get(hass)
+        for ucr_id in new[DATA_UCRS]:
+            for key in ("helper_name", "helper_status"):
+                if entity_id := entity_registry.async_get_entity_id(
+                    "sensor", DOMAIN, f"{DOMAIN}_{ucr_id}_{key}"
+                ):
+                    entity_registry.async_remove(entity_id)
+
     hass.config_entries.async_update_entry(
         config_entry,
         data=new,
@@ -14,9 +14,10 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import DiveraConfigEntry
+from .const import SLICE_ALARM
 from .coordinator import DiveraCoordinator
 from .divera247 import DiveraClient
-from .entity import DiveraEntity, DiveraEntityDescription
+from .entity import DiveraEntity, DiveraEntityDescription, async_add_divera_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -43,6 +44,7 @@ BINARY_SENSORS: tuple[DiveraBinarySensorEntityDescription, ...] = (
         icon="mdi:alarm-light",
         value_fn=lambda divera: divera.has_open_alarms(),
         attribute_fn=lambda divera: divera.get_last_alarm_attributes(),
+        data_slice=SLICE_ALARM,
     ),
 )
 
@@ -60,13 +62,14 @@ async def async_setup_entry(
         entry (DiveraConfigEntry): Configuration entry for the integration.
         async_add_entities (AddEntitiesCallback): Function to add entities.
     """
-    coordinators = entry.runtime_data.coordinators
-    entities: list[DiveraBinarySensorEntity] = [
-        DiveraBinarySensorEntity(coordinators[ucr_id], description)
-        for ucr_id in coordinators
-        for description in BINARY_SENSORS
-    ]
-    async_add_entities(entities, False)
+    async_add_divera_entities(
+        entry,
+        async_add_entities,
+        lambda coordinator: [
+            DiveraBinarySensorEntity(coordinator, description)
+            for description in BINARY_SENSORS
+        ],
+    )
 
 
 class DiveraBinarySensorEntity(DiveraEntity, BinarySensorEntity):
@@ -8,7 +8,7 @@ from . import DiveraConfigEntry, DiveraCoordinator
 from .const import DOMAIN
 from dataclasses import dataclass
 
-from .entity import DiveraEntity, DiveraEntityDescription
+from .entity import DiveraEntity, DiveraEntityDescription, async_add_divera_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -39,11 +39,11 @@ async def async_setup_entry(
         entry (DiveraConfigEntry): Configuration entry for the integration.
         async_add_entities (AddEntitiesCallback): Function to add entities.
     """
-    coordinators = entry.runtime_data.coordinators
-    entities = [
-        DiveraTestAlarmButton(coordinator) for coordinator in coordinators.values()
-    ]
-    async_add_entities(entities, False)
+    async_add_divera_entities(
+        entry,
+        async_add_entities,
+        lambda coordinator: [DiveraTestAlarmButton(coordinator)],
+    )
 
 
 class DiveraTestAlarmButton(DiveraEntity, ButtonEntity):
@@ -16,8 +16,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import DiveraConfigEntry, DiveraCoordinator
+from .const import HISTORY_KIND_EVENT, SLICE_EVENTS
 from .divera247 import DiveraClient
-from .entity import DiveraEntity, DiveraEntityDescription
+from .entity import DiveraEntity, DiveraEntityDescription, async_add_divera_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -42,6 +43,7 @@ CALENDARS: tuple[DiveraCalendarEntityDescription, ...] = (
         icon="mdi:calendar-text",
         event_fn=lambda divera: divera.get_last_event(),
         attribute_fn=lambda divera: divera.get_last_event_attributes(),
+        data_slice=SLICE_EVENTS,
     ),
 )
 
@@ -59,13 +61,13 @@ async def async_setup_entry(
         async_add_entities (AddEntitiesCallback): Function to add entities.
 
     """
-    coordinators = entry.runtime_data.coordinators
-    entities: list[DiveraCalendarEntity] = [
-        DiveraCalendarEntity(coordinators[ucr_id], description)
-        for ucr_id in coordinators
-        for description in CALENDARS
-    ]
-    async_add_entities(entities, False)
+    async_add_divera_entities(
+        entry,
+        async_add_entities,
+        lambda coordinator: [
+            DiveraCalendarEntity(coordinator, description) for description in CALENDARS
+        ],
+    )
 
 
 class DiveraCalendarEntity(DiveraEntity, CalendarEntity):
@@ -114,6 +116,10 @@ class DiveraCalendarEntity(DiveraEntity, CalendarEntity):
     ) -> list[CalendarEvent]:
         """Get all events in a specific time frame.
 
+        Events the API no longer returns are taken from the history, if it
+        is enabled. It is only queried for the part of the range before the earliest event
+        the API still returns.
+
         Args:
             hass (HomeAssistant): Home Assistant instance.
             start_date (datetime): The start date for the event retrieval.
@@ -123,4 +129,51 @@ class DiveraCalendarEntity(DiveraEntity, CalendarEntity):
             list[CalendarEvent]: A list of calendar events within the specified time frame.
 
         """
-        return self.coordinator.data.get_events(start_date, end_date)
+        client = self.coordinator.data
+        events = client.get_events(start_date, end_date)
+        history = self.coordinator.history
+        if history is None:
+            return events
+        end = history_end(client, start_date, end_date)
+        if end is None:
+            return events
+        stored = await history.async_query(
+            HISTORY_KIND_EVENT, start=start_date, end=end, ucr_id=self._ucr_id
+        )
+        known = {str(event.uid) for event in events}
+        past = [
+            client.map_event_to_calendar(item)
+            for item in stored
+            if str(item.get("id")) not in known
+            and item.get("start") is not None
+            and item.get("end") is not None
+        ]
+        if not past:
+            return events
+        return sorted([*events, *past], key=lambda event: event.start)
+
+
+def history_end(
+    client: DiveraClient, start_date: datetime, end_date: datetime
+) -> datetime | None:
+    """
+    Return the end of the part of a range the history has to be queried for.
+
+    The API returns every event from its earliest one on, so only events
+    starting before it can be missing.
+
+    Args:
+        client (DiveraClient): The client holding the live events.
+        start_date (datetime): Start of the range.
+        end_date (datetime): End of the range (exclusive).
+
+    Returns:
+        datetime | None: The end of the history range, None if the live
+        events cover the whole range.
+    """
+    first = client.get_first_event_start()
+    if first is None or first > end_date:
+        return end_date
+    if first <= start_date:
+        return None
+    return first
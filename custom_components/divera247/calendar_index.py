@@ -0,0 +1,87 @@
+"""Calendar Index Module for Divera 24/7 Integration.
+
+Sorts the events of a snapshot by start once, so the range queries of the
+calendar card and the calendar.get_events service bisect into the events
+instead of converting and filtering all of them per call.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+_EventT = TypeVar("_EventT")
+
+
+class DiveraEventIndex(Generic[_EventT]):
+    """Events of the event section by start, converted once."""
+
+    def __init__(
+        self,
+        events: Iterable[Mapping[str, Any]],
+        convert: Callable[[Mapping[str, Any]], _EventT],
+    ) -> None:
+        """
+        Initialize DiveraEventIndex.
+
+        Events without a start are left out; an end before the start is
+        treated as a zero-length event.
+
+        Args:
+            events (Iterable[Mapping[str, Any]]): Raw events with ``start`` and
+                ``end`` as Unix timestamps.
+            convert (Callable[[Mapping[str, Any]], _EventT]): Builds the event
+                returned by between() from a raw event.
+        """
+        entries: list[tuple[float, float, _EventT]] = []
+        for event in events:
+            start = event.get("start")
+            if start is None:
+                continue
+            end = event.get("end")
+            if end is None or end < start:
+                end = start
+            entries.append((start, end, convert(event)))
+        entries.sort(key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._events = [entry[2] for entry in entries]
+        # Events starting this long before a range may still reach into it
+        self._max_duration = max((end - start for start, end, _ in entries), default=0)
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._events)
+
+    @property
+    def first_start(self) -> float | None:
+        """Return the earliest start as Unix timestamp, None without events."""
+        return self._starts[0] if self._starts else None
+
+    def between(self, start_date: datetime, end_date: datetime) -> list[_EventT]:
+        """
+        Return the events overlapping a time range, ordered by start.
+
+        An event overlaps if it starts before end_date and ends after
+        start_date, so events spanning either boundary are included.
+        Zero-length events are included if they lie within the range.
+
+        Args:
+            start_date (datetime): Start of the range.
+            end_date (datetime): End of the range (exclusive).
+
+        Returns:
+            list[_EventT]: The overlapping events.
+        """
+        range_start = start_date.timestamp()
+        range_end = end_date.timestamp()
+        starts, ends = self._starts, self._ends
+        low = bisect_left(starts, range_start - self._max_duration)
+        high = bisect_left(starts, range_end, low)
+        return [
+            self._events[i]
+            for i in range(low, high)
+            if ends[i] > range_start or starts[i] >= range_start
+        ]
@@ -5,31 +5,55 @@ from urllib.parse import urlparse
 
 from voluptuous import Optional, Required, Schema, Invalid
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import HANDLERS, ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.const import CONF_WEBHOOK_ID
 from homeassistant.data_entry_flow import FlowHandler
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import NoURLAvailableError
 from homeassistant.helpers.selector import (
     SelectSelector,
     SelectSelectorConfig,
     TextSelector,
     TextSelectorConfig,
     TextSelectorType,
+    TimeSelector,
 )
 
 from .const import (
     CONF_ACCESSKEY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALARMS_V2_ON_CHANGE,
     CONF_BASE_URL,
     CONF_CLUSTERS,
+    CONF_FAST_SCAN_INTERVAL,
     CONF_FLOW_MINOR_VERSION,
     CONF_FLOW_NAME_API,
     CONF_FLOW_NAME_RECONFIGURE,
     CONF_FLOW_NAME_UCR,
     CONF_FLOW_VERSION,
+    CONF_HISTORY,
+    CONF_PUSH_ENABLED,
+    CONF_QUIET_HOURS_END,
+    CONF_QUIET_HOURS_START,
+    CONF_QUIET_SCAN_INTERVAL,
+    CONF_RECORD_RESPONSES,
     CONF_SCAN_INTERVAL,
+    CONF_STATUS_SENSORS,
+    CONF_TELEMETRY,
     CONF_VEHICLE_NAME_MODE,
     DATA_ACCESSKEY,
     DATA_BASE_URL,
     DATA_UCRS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ALARMS_V2_ON_CHANGE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_HISTORY,
+    DEFAULT_PUSH_ENABLED,
+    DEFAULT_QUIET_SCAN_INTERVAL,
+    DEFAULT_RECORD_RESPONSES,
+    DEFAULT_STATUS_SENSORS,
+    DEFAULT_TELEMETRY,
     DIVERA_BASE_URL,
     DOMAIN,
     ERROR_AUTH,
@@ -278,8 +302,8 @@ class DiveraConfigFlow(DiveraFlow, ConfigFlow):
 
         if user_input is not None and not errors:
             vehicle_name_mode = user_input.get(CONF_VEHICLE_NAME_MODE, current_mode)
-            # Apply both data and options updates, then reload and abort
-            await self.hass.config_entries.async_update_entry(
+            # Apply both data and options updates, then abort
+            self.hass.config_entries.async_update_entry(
                 self._config_entry,
                 data={
                     **self._config_entry.data,
@@ -293,7 +317,8 @@ class DiveraConfigFlow(DiveraFlow, ConfigFlow):
                 },
             )
             # The entry's update listener (async_update_listener) reloads the
-            # integration so the new vehicle name mode takes effect.
+            # integration if the units changed and otherwise applies the new
+            # vehicle name mode in place.
             return self.async_abort(reason="reconfigure_successful")
 
         vehicle_schema = Schema(
@@ -551,40 +576,81 @@ class DiveraConfigFlow(DiveraFlow, ConfigFlow):
 
 
 class DiveraOptionsFlowHandler(OptionsFlow):
-    """Options flow for Divera integration (scan interval, vehicle name mode)."""
+    """Options flow for Divera integration (scan intervals, vehicle name mode, alarm fetching, push, telemetry)."""
 
     def __init__(self, config_entry: ConfigEntry) -> None:
         self._entry = config_entry
+        # Generated once and kept, so the URL configured in Divera stays valid
+        self._webhook_id: str = (
+            config_entry.options.get(CONF_WEBHOOK_ID) or webhook.async_generate_id()
+        )
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None):  # type: ignore[override]
         errors: dict[str, str] = {}
-        current_scan = self._entry.options.get(CONF_SCAN_INTERVAL, 60)
-        current_mode = self._entry.options.get(
-            CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODES[0]
+        options = self._entry.options
+        current_scan = options.get(CONF_SCAN_INTERVAL, 60)
+        current_mode = options.get(CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODES[0])
+        current_alarms_v2_on_change = options.get(
+            CONF_ALARMS_V2_ON_CHANGE, DEFAULT_ALARMS_V2_ON_CHANGE
         )
+        current_adaptive = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        current_fast = options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+        current_quiet = options.get(
+            CONF_QUIET_SCAN_INTERVAL, DEFAULT_QUIET_SCAN_INTERVAL
+        )
+        current_push = options.get(CONF_PUSH_ENABLED, DEFAULT_PUSH_ENABLED)
+        current_status = options.get(CONF_STATUS_SENSORS, DEFAULT_STATUS_SENSORS)
+        current_telemetry = options.get(CONF_TELEMETRY, DEFAULT_TELEMETRY)
+        current_record = options.get(CONF_RECORD_RESPONSES, DEFAULT_RECORD_RESPONSES)
+        current_history = options.get(CONF_HISTORY, DEFAULT_HISTORY)
 
         if user_input is not None:
-            scan = user_input.get(CONF_SCAN_INTERVAL, current_scan)
-            try:
-                scan_int = int(scan)
-                if scan_int < 10 or scan_int > 300:
-                    errors[CONF_SCAN_INTERVAL] = "range_error"
-                else:
-                    new_options = {
-                        **self._entry.options,
-                        CONF_SCAN_INTERVAL: scan_int,
-                        CONF_VEHICLE_NAME_MODE: user_input.get(
-                            CONF_VEHICLE_NAME_MODE, current_mode
-                        ),
-                    }
-                    # Persist options. The entry's update listener
-                    # (async_update_listener) reloads the integration so sensors
-                    # are recreated with the new interval and naming mode.
-                    return self.async_create_entry(
-                        title="Divera Options", data=new_options
-                    )
-            except (TypeError, ValueError):
-                errors[CONF_SCAN_INTERVAL] = "invalid_int"
+            intervals: dict[str, int] = {}
+            for key, current, low, high in (
+                (CONF_SCAN_INTERVAL, current_scan, 10, 300),
+                (CONF_FAST_SCAN_INTERVAL, current_fast, 10, 300),
+                (CONF_QUIET_SCAN_INTERVAL, current_quiet, 10, 3600),
+            ):
+                try:
+                    value = int(user_input.get(key, current))
+                except (TypeError, ValueError):
+                    errors[key] = "invalid_int"
+                    continue
+                if value < low or value > high:
+                    errors[key] = "range_error"
+                intervals[key] = value
+            if not errors:
+                new_options = {
+                    **options,
+                    **intervals,
+                    CONF_VEHICLE_NAME_MODE: user_input.get(
+                        CONF_VEHICLE_NAME_MODE, current_mode
+                    ),
+                    CONF_ALARMS_V2_ON_CHANGE: user_input.get(
+                        CONF_ALARMS_V2_ON_CHANGE, current_alarms_v2_on_change
+                    ),
+                    CONF_ADAPTIVE_POLLING: user_input.get(
+                        CONF_ADAPTIVE_POLLING, current_adaptive
+                    ),
+                    CONF_QUIET_HOURS_START: user_input.get(CONF_QUIET_HOURS_START),
+                    CONF_QUIET_HOURS_END: user_input.get(CONF_QUIET_HOURS_END),
+                    CONF_PUSH_ENABLED: user_input.get(CONF_PUSH_ENABLED, current_push),
+                    CONF_WEBHOOK_ID: self._webhook_id,
+                    CONF_STATUS_SENSORS: user_input.get(
+                        CONF_STATUS_SENSORS, current_status
+                    ),
+                    CONF_TELEMETRY: user_input.get(CONF_TELEMETRY, current_telemetry),
+                    CONF_RECORD_RESPONSES: user_input.get(
+                        CONF_RECORD_RESPONSES, current_record
+                    ),
+                    CONF_HISTORY: user_input.get(CONF_HISTORY, current_history),
+                }
+                # Persist options. The entry's update listener
+                # (async_update_listener) applies them to the running
+                # coordinators and entities without a reload (toggling the
+                # status or telemetry sensors, the recording or the history
+                # reloads the entry).
+                return self.async_create_entry(title="Divera Options", data=new_options)
 
         schema = Schema(
             {
@@ -598,6 +664,37 @@ class DiveraOptionsFlowHandler(OptionsFlow):
                         translation_key="vehicle_name_mode",
                     )
                 ),
+                Required(
+                    CONF_ALARMS_V2_ON_CHANGE, default=current_alarms_v2_on_change
+                ): bool,
+                Required(CONF_ADAPTIVE_POLLING, default=current_adaptive): bool,
+                Required(CONF_FAST_SCAN_INTERVAL, default=str(current_fast)): str,
+                Required(CONF_QUIET_SCAN_INTERVAL, default=str(current_quiet)): str,
+                # Optional without default so the quiet hours can be cleared again
+                Optional(
+                    CONF_QUIET_HOURS_START,
+                    description={
+                        "suggested_value": options.get(CONF_QUIET_HOURS_START)
+                    },
+                ): TimeSelector(),
+                Optional(
+                    CONF_QUIET_HOURS_END,
+                    description={"suggested_value": options.get(CONF_QUIET_HOURS_END)},
+                ): TimeSelector(),
+                Required(CONF_PUSH_ENABLED, default=current_push): bool,
+                Required(CONF_STATUS_SENSORS, default=current_status): bool,
+                Required(CONF_TELEMETRY, default=current_telemetry): bool,
+                Required(CONF_RECORD_RESPONSES, default=current_record): bool,
+                Required(CONF_HISTORY, default=current_history): bool,
             }
         )
-        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+        try:
+            webhook_url = webhook.async_generate_url(self.hass, self._webhook_id)
+        except NoURLAvailableError:
+            webhook_url = webhook.async_generate_path(self._webhook_id)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"webhook_url": webhook_url},
+        )
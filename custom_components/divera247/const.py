@@ -35,6 +35,9 @@ DIVERA_BASE_URL: str = "https://app.divera247.com"
 DIVERA_API_PULL_PATH: str = "/api/v2/pull/all"
 """API path for pulling data."""
 
+DIVERA_API_ALARMS_PATH: str = "/api/v2/alarms"
+"""API path for the alarm details (vehicles of an alarm)."""
+
 DIVERA_API_STATUS_PATH: str = "/api/v2/statusgeber/set-status"
 """API path for setting status."""
 
@@ -65,6 +68,226 @@ CONF_SCAN_INTERVAL: str = "scan_interval"
 CONF_VEHICLE_NAME_MODE: str = "vehicle_name_mode"
 """Configuration key for vehicle name display mode."""
 
+CONF_ALARMS_V2_ON_CHANGE: str = "alarms_v2_on_change"
+"""Configuration key to fetch /api/v2/alarms only when the alarm section changed."""
+
+DEFAULT_ALARMS_V2_ON_CHANGE: bool = False
+"""Default for fetching /api/v2/alarms only on alarm changes."""
+
+CONF_ADAPTIVE_POLLING: str = "adaptive_polling"
+"""Configuration key to enable adaptive polling."""
+
+CONF_FAST_SCAN_INTERVAL: str = "fast_scan_interval"
+"""Configuration key for the scan interval while alarms are open."""
+
+CONF_QUIET_SCAN_INTERVAL: str = "quiet_scan_interval"
+"""Configuration key for the scan interval during quiet hours."""
+
+CONF_QUIET_HOURS_START: str = "quiet_hours_start"
+"""Configuration key for the start of the quiet hours (HH:MM:SS)."""
+
+CONF_QUIET_HOURS_END: str = "quiet_hours_end"
+"""Configuration key for the end of the quiet hours (HH:MM:SS)."""
+
+DEFAULT_ADAPTIVE_POLLING: bool = False
+"""Default for adaptive polling."""
+
+DEFAULT_FAST_SCAN_INTERVAL: int = 15
+"""Default scan interval in seconds while alarms are open."""
+
+DEFAULT_QUIET_SCAN_INTERVAL: int = 300
+"""Default scan interval in seconds during quiet hours."""
+
+FAST_POLL_HOLD: int = 300
+"""Seconds to keep the fast scan interval after the alarms changed."""
+
+PULL_BATCH_WINDOW: int = 5
+"""Seconds within which UCRs of one access key are pulled in one batch."""
+
+SLICE_ALARM: str = "alarm"
+"""Data slice of the entities showing the last alarm."""
+
+SLICE_NEWS: str = "news"
+"""Data slice of the entities showing the news."""
+
+SLICE_EVENTS: str = "events"
+"""Data slice of the entities showing the events."""
+
+SLICE_USER_STATUS: str = "user_status"
+"""Data slice of the entities showing the user's status."""
+
+SLICE_HELPERS: str = "helpers"
+"""Data slice of the entities aggregating all helpers."""
+
+SLICE_HELPER: str = "helper"
+"""Data slice of one helper, keyed as (SLICE_HELPER, helper key)."""
+
+SLICE_VEHICLE: str = "vehicle"
+"""Data slice of one vehicle, keyed as (SLICE_VEHICLE, vehicle id)."""
+
+EVENT_ALARM_NEW: str = f"{DOMAIN}_alarm_new"
+"""Event fired when a pull contains a new alarm."""
+
+EVENT_ALARM_UPDATED: str = f"{DOMAIN}_alarm_updated"
+"""Event fired when the ts_update of an open alarm changed."""
+
+EVENT_ALARM_CLOSED: str = f"{DOMAIN}_alarm_closed"
+"""Event fired when an alarm was closed."""
+
+EVENT_ALARM_REOPENED: str = f"{DOMAIN}_alarm_reopened"
+"""Event fired when a closed alarm was opened again."""
+
+EVENT_NEWS_NEW: str = f"{DOMAIN}_news_new"
+"""Event fired when a pull contains a new news item."""
+
+EVENT_CALENDAR_EVENT_NEW: str = f"{DOMAIN}_event_new"
+"""Event fired when a pull contains a new calendar event."""
+
+EVENT_VEHICLE_STATUS_CHANGED: str = f"{DOMAIN}_vehicle_status_changed"
+"""Event fired when the FMS status of a vehicle changed."""
+
+EVENT_HELPER_STATUS_CHANGED: str = f"{DOMAIN}_helper_status_changed"
+"""Event fired when the status of a helper changed."""
+
+EVENT_USER_STATUS_CHANGED: str = f"{DOMAIN}_user_status_changed"
+"""Event fired when the status of the user changed."""
+
+DATA_SCHEDULER: str = "scheduler"
+"""Key of the integration-wide poll scheduler in hass.data[DOMAIN]."""
+
+POLL_BUDGET_RATE: float = 1.0
+"""Requests per second all Divera entries together may start on average."""
+
+POLL_BUDGET_BURST: int = 20
+"""Requests all Divera entries together may start at once."""
+
+POLL_ALIGN_TOLERANCE: float = 1.0
+"""Seconds a poll may run ahead of its phase and still count as on it."""
+
+POLL_PRIORITY_OPEN_ALARM: int = 0
+"""Scheduler priority of UCRs with open alarms (served first)."""
+
+POLL_PRIORITY_ACTIVE_UCR: int = 1
+"""Scheduler priority of the active UCR of a user."""
+
+POLL_PRIORITY_DEFAULT: int = 2
+"""Scheduler priority of all other UCRs."""
+
+SETUP_RETRY_BASE: int = 15
+"""Seconds before the first retry of a UCR whose first refresh failed."""
+
+SETUP_RETRY_MAX: int = 900
+"""Upper limit in seconds of the doubling retry delay of a UCR without data."""
+
+SETUP_RETRY_JITTER: float = 0.5
+"""Fraction of the retry delay that is randomized."""
+
+STORE_VERSION: int = 1
+"""Version of the stored snapshots."""
+
+STORE_SAVE_DELAY: int = 60
+"""Seconds to collect changes before the stored snapshots are written."""
+
+STORE_REDACT_KEYS: tuple[str, ...] = ("accesskey", "jwt", "token", "password")
+"""Keys of the user section containing these words are not stored."""
+
+SIGNAL_OPTIONS_UPDATED: str = f"{DOMAIN}_options_updated_{{}}"
+"""Dispatcher signal (formatted with the entry id) for options applied without reload."""
+
+DATA_HISTORY: str = "history"
+"""Key of the integration-wide alarm, news and event history in hass.data[DOMAIN]."""
+
+HISTORY_DB_FILE: str = f"{DOMAIN}_history.db"
+"""SQLite file of the history, in the Home Assistant config directory."""
+
+CONF_HISTORY: str = "history"
+"""Configuration key to keep the alarms, news and events in the history."""
+
+DEFAULT_HISTORY: bool = False
+"""Default for keeping the history."""
+
+HISTORY_RETENTION_DAYS: int = 365
+"""Days after which items are purged from the history."""
+
+HISTORY_QUERY_LIMIT: int = 1000
+"""Maximum number of items one history query returns."""
+
+HISTORY_KIND_ALARM: str = "alarm"
+"""History kind of alarms."""
+
+HISTORY_KIND_NEWS: str = "news"
+"""History kind of news."""
+
+HISTORY_KIND_EVENT: str = "event"
+"""History kind of calendar events."""
+
+SERVICE_GET_HISTORY: str = "get_history"
+"""Service returning alarms, news or events from the history."""
+
+ATTR_STALE: str = "stale"
+"""Attribute set while an entity shows stored data of a previous run."""
+
+CONF_PUSH_ENABLED: str = "push_enabled"
+"""Configuration key to enable the push webhook."""
+
+DEFAULT_PUSH_ENABLED: bool = False
+"""Default for the push webhook."""
+
+CONF_STATUS_SENSORS: str = "status_sensors"
+"""Configuration key to add the helper status count and overview sensors."""
+
+DEFAULT_STATUS_SENSORS: bool = False
+"""Default for the helper status count and overview sensors."""
+
+CONF_TELEMETRY: str = "telemetry"
+"""Configuration key to enable the performance telemetry sensors."""
+
+DEFAULT_TELEMETRY: bool = False
+"""Default for the performance telemetry."""
+
+TELEMETRY_WINDOW: int = 100
+"""Samples per metric the telemetry percentiles are computed over."""
+
+ALARM_LATENCY_BUCKETS: tuple[int, ...] = (5, 10, 15, 30, 60, 120, 300)
+"""Upper bounds in seconds of the alarm detection latency histogram."""
+
+CONF_RECORD_RESPONSES: str = "record_responses"
+"""Configuration key to record the API responses for offline analysis."""
+
+DEFAULT_RECORD_RESPONSES: bool = False
+"""Default for recording the API responses."""
+
+RECORDING_DIR: str = f"{DOMAIN}_recordings"
+"""Directory of the recordings, in the Home Assistant config directory."""
+
+RECORDING_MAX_SIZE: int = 50 * 1024 * 1024
+"""Bytes after which a recording stops growing."""
+
+RECORDING_REDACT_KEYS: frozenset[str] = frozenset(
+    {
+        "accesskey",
+        "address",
+        "author",
+        "caller",
+        "email",
+        "firstname",
+        "fmsstatus_note",
+        "lastname",
+        "mobile",
+        "note",
+        "phone",
+        "phonenumber",
+        "report",
+        "stdformat_name",
+        "text",
+        "title",
+    }
+)
+"""Keys whose string values are redacted in recordings, at any depth."""
+
+RECORDING_COORDINATE_KEYS: frozenset[str] = frozenset({"lat", "lng"})
+"""Keys whose numbers are zeroed in recordings, at any depth."""
+
 VEHICLE_NAME_MODE_AUTO: str = "auto"
 VEHICLE_NAME_MODE_SHORT: str = "shortname"
 VEHICLE_NAME_MODE_NAME: str = "name"
@@ -116,7 +339,7 @@ VERSION_UNKNOWN: str = "Unknown"
 CONF_FLOW_VERSION: int = 3
 """Configuration flow version."""
 
-CONF_FLOW_MINOR_VERSION: int = 1
+CONF_FLOW_MINOR_VERSION: int = 2
 """Configuration flow minor version."""
 
 CONF_FLOW_NAME_UCR: str = "user_cluster_relation"
@@ -1,17 +1,98 @@
 """Coordinator Module for Divera 24/7 Integration."""
 
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import time, timedelta
+import random
+from time import monotonic, time as unix_time
 
 from aiohttp import ClientSession
 
-from custom_components.divera247.const import DEFAULT_SCAN_INTERVAL, LOGGER
+from custom_components.divera247.const import (
+    DEFAULT_ALARMS_V2_ON_CHANGE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_QUIET_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    EVENT_ALARM_NEW,
+    FAST_POLL_HOLD,
+    LOGGER,
+    POLL_PRIORITY_ACTIVE_UCR,
+    POLL_PRIORITY_DEFAULT,
+    POLL_PRIORITY_OPEN_ALARM,
+    SETUP_RETRY_BASE,
+    SETUP_RETRY_JITTER,
+    SETUP_RETRY_MAX,
+)
 from custom_components.divera247.divera247 import (
     DiveraAuthError,
-    DiveraClient,
     DiveraConnectionError,
 )
+from custom_components.divera247.events import diff_snapshots
+from custom_components.divera247.fetcher import DiveraFetcher
+from custom_components.divera247.history import DiveraHistory
+from custom_components.divera247.recorder import DiveraRecorder
+from custom_components.divera247.scheduler import DiveraPollScheduler
+from custom_components.divera247.snapshot import DiveraSnapshot, changed_slices
+from custom_components.divera247.store import DiveraSnapshotStore
+from custom_components.divera247.telemetry import METRIC_UPDATE_TIME, DiveraTelemetry
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+
+@dataclass(frozen=True, slots=True)
+class AdaptivePolling:
+    """
+    Adaptive polling settings of a DiveraCoordinator.
+
+    Attributes:
+        fast_interval (int): Seconds between polls while alarms are open or
+            within FAST_POLL_HOLD seconds after the alarms changed.
+        quiet_interval (int): Seconds between polls during the quiet hours.
+        quiet_start (time | None): Start of the quiet hours (local time).
+        quiet_end (time | None): End of the quiet hours (local time), may be
+            before quiet_start to span midnight.
+    """
+
+    fast_interval: int = DEFAULT_FAST_SCAN_INTERVAL
+    quiet_interval: int = DEFAULT_QUIET_SCAN_INTERVAL
+    quiet_start: time | None = None
+    quiet_end: time | None = None
+
+    def is_quiet(self, now: time) -> bool:
+        """
+        Check whether a local time lies within the quiet hours.
+
+        Args:
+            now (time): The local time of day.
+
+        Returns:
+            bool: True within the quiet hours, False if none are configured.
+        """
+        start, end = self.quiet_start, self.quiet_end
+        if start is None or end is None or start == end:
+            return False
+        if start < end:
+            return start <= now < end
+        return now >= start or now < end
+
+    def interval(self, idle_interval: int, active: bool, now: time) -> int:
+        """
+        Return the seconds until the next poll.
+
+        Args:
+            idle_interval (int): The regular scan interval.
+            active (bool): Whether alarms are open or changed recently.
+            now (time): The local time of day.
+
+        Returns:
+            int: The interval to poll at.
+        """
+        if active:
+            return min(self.fast_interval, idle_interval)
+        if self.is_quiet(now):
+            return max(self.quiet_interval, idle_interval)
+        return idle_interval
 
 
 class DiveraCoordinator(DataUpdateCoordinator):
@@ -22,6 +103,15 @@ class DiveraCoordinator(DataUpdateCoordinator):
 
     Parameters:
         DataUpdateCoordinator: The base class for data update coordinators.
+
+    Attributes:
+        changed_slices (frozenset | None): Keys of the data slices (see
+            DiveraSnapshot.slices) changed by the refresh the listeners are
+            notified of, None if all entities have to be updated.
+        stale (bool): True while the data is restored from the store and no
+            refresh succeeded yet.
+        telemetry (DiveraTelemetry | None): Performance metrics of the UCR,
+            None while telemetry is disabled.
     """
 
     def __init__(
@@ -32,6 +122,15 @@ class DiveraCoordinator(DataUpdateCoordinator):
         base_url: str,
         ucr_id: str,
         update_interval: int = DEFAULT_SCAN_INTERVAL,
+        alarms_v2_on_change: bool = DEFAULT_ALARMS_V2_ON_CHANGE,
+        adaptive_polling: AdaptivePolling | None = None,
+        fetcher: DiveraFetcher | None = None,
+        scheduler: DiveraPollScheduler | None = None,
+        poll_group: str | None = None,
+        store: DiveraSnapshotStore | None = None,
+        history: DiveraHistory | None = None,
+        telemetry: DiveraTelemetry | None = None,
+        recorder: DiveraRecorder | None = None,
     ) -> None:
         """
         Initialize DiveraCoordinator.
@@ -43,6 +142,15 @@ class DiveraCoordinator(DataUpdateCoordinator):
             base_url (str): Base URL for Divera API.
             ucr_id (str): Unique identifier for the organization.
             update_interval (int | None, optional): Interval in seconds for updating data. Defaults to DEFAULT_SCAN_INTERVAL.
+            alarms_v2_on_change (bool, optional): Only request /api/v2/alarms when the alarm section changed. Defaults to DEFAULT_ALARMS_V2_ON_CHANGE.
+            adaptive_polling (AdaptivePolling | None, optional): Adapt the interval to the alarm state and quiet hours; update_interval is then the idle interval. Defaults to None (fixed interval).
+            fetcher (DiveraFetcher | None, optional): Fetcher shared with the other UCRs of the access key. Defaults to None (a fetcher of its own).
+            scheduler (DiveraPollScheduler | None, optional): Integration-wide scheduler spreading the polls and budgeting their requests. Defaults to None (unscheduled).
+            poll_group (str | None, optional): Group of the coordinator in the scheduler, e.g. the config entry id. Defaults to None.
+            store (DiveraSnapshotStore | None, optional): Store keeping the data for the next start. Defaults to None (not stored).
+            history (DiveraHistory | None, optional): History the alarms, news and events are recorded in. Defaults to None (not recorded).
+            telemetry (DiveraTelemetry | None, optional): Records the request and update metrics of the UCR. Defaults to None (not measured).
+            recorder (DiveraRecorder | None, optional): Recorder of the config entry the API responses are written to. Defaults to None (not recorded).
         """
         super().__init__(
             hass,
@@ -50,9 +158,48 @@ class DiveraCoordinator(DataUpdateCoordinator):
             name=f"DIVERA Coordinator {ucr_id}",
             update_interval=timedelta(seconds=update_interval),
         )
-        self.divera_client = DiveraClient(
-            session, accesskey=accesskey, base_url=base_url, ucr_id=ucr_id
-        )
+        if fetcher is None:
+            fetcher = DiveraFetcher(
+                session,
+                accesskey=accesskey,
+                base_url=base_url,
+                alarms_v2_on_change=alarms_v2_on_change,
+            )
+        self._fetcher = fetcher
+        self._ucr_id = ucr_id
+        self.divera_client = fetcher.register(ucr_id, self._seconds_until_refresh)
+        # monotonic() of the last refresh, None before the first one
+        self._last_refresh: float | None = None
+        # False after a refresh that returned unchanged data
+        self._notify_listeners = True
+        # True while a requested refresh has to skip results of sibling batches
+        self._force_pull = False
+        self._idle_interval = update_interval
+        self._adaptive_polling = adaptive_polling
+        self._alarm_signature: tuple | None = None
+        # monotonic() until which the fast interval is kept after an alarm change
+        self._fast_until = 0.0
+        self._scheduler = scheduler
+        self._poll_group = poll_group
+        if scheduler is not None:
+            # Charged per request, including the ones of sibling batches
+            self.divera_client.set_request_gate(self._async_acquire_request)
+        self._base_interval = update_interval
+        # Snapshot and slices the last change events were computed from
+        self._snapshot: DiveraSnapshot | None = None
+        self._slices: dict | None = None
+        self.changed_slices: frozenset | None = None
+        self._store = store
+        if store is not None:
+            store.register(ucr_id, self.divera_client)
+        self.history = history
+        self.telemetry = telemetry
+        self.divera_client.set_telemetry(telemetry)
+        self._recorder = recorder
+        self.divera_client.set_recorder(recorder)
+        self.stale = False
+        # Consecutive failed refreshes before the first data arrived
+        self._setup_retries = 0
 
     async def _async_update_data(self):
         """
@@ -67,11 +214,217 @@ class DiveraCoordinator(DataUpdateCoordinator):
         Returns:
             DiveraClient: The Divera client with the latest data.
         """
+        # Failed refreshes change the availability of all entities
+        self.changed_slices = None
+        force, self._force_pull = self._force_pull, False
         try:
-            await self.divera_client.pull_data()
+            changed = await self._fetcher.async_pull(self._ucr_id, force=force)
         except DiveraAuthError as err:
             raise ConfigEntryAuthFailed from err
         except DiveraConnectionError as err:
+            self._schedule_setup_retry()
             raise UpdateFailed(f"Error communicating with API: {err}") from None
         else:
+            self._setup_retries = 0
+            # Listeners must still run when recovering from a failed refresh
+            # or replacing stored data
+            recovered = not self.last_update_success or self.stale
+            self.stale = False
+            self._notify_listeners = changed or recovered
+            if changed:
+                self._track_slices(recovered)
+                if self._store is not None:
+                    self._store.async_schedule_save()
+            self._schedule_next_refresh(changed)
             return self.divera_client
+        finally:
+            self._last_refresh = monotonic()
+            if self._recorder is not None:
+                self.hass.async_create_task(self._recorder.async_flush())
+
+    async def async_request_refresh(self) -> None:
+        """
+        Request a debounced refresh that sends a new request.
+
+        Pushes and manual updates ask for data newer than the request, so the
+        refresh does not reuse a result a sibling's batch pulled before.
+        """
+        self._force_pull = True
+        await super().async_request_refresh()
+
+    @callback
+    def async_restore(self) -> bool:
+        """
+        Set the data stored by a previous run as the coordinator's data.
+
+        The data is marked stale until the first refresh succeeds. Changes
+        found by that refresh fire their change events.
+
+        Returns:
+            bool: True if stored data was restored.
+        """
+        if self._store is None or not self._store.restore(self._ucr_id):
+            return False
+        self.stale = True
+        self._track_slices(True)
+        self.async_set_updated_data(self.divera_client)
+        LOGGER.debug("%s: restored stored data", self.name)
+        return True
+
+    @callback
+    def async_set_polling(
+        self, update_interval: int, adaptive_polling: AdaptivePolling | None
+    ) -> None:
+        """
+        Apply a new scan interval and adaptive polling settings in place.
+
+        The next refresh is rescheduled with the new interval; a UCR still
+        waiting for its first data keeps its retry delay.
+
+        Args:
+            update_interval (int): Interval in seconds for updating data.
+            adaptive_polling (AdaptivePolling | None): The adaptive polling
+                settings, None for a fixed interval.
+        """
+        self._idle_interval = update_interval
+        self._adaptive_polling = adaptive_polling
+        if adaptive_polling is None:
+            self._alarm_signature = None
+            self._fast_until = 0.0
+        if self.data is None:
+            return
+        self._schedule_next_refresh(False)
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _track_slices(self, update_all: bool) -> None:
+        """
+        Find the data slices changed by the pull and fire their change events.
+
+        Args:
+            update_all (bool): Leave changed_slices None, so every entity is updated.
+        """
+        snapshot = self.divera_client.get_snapshot()
+        slices = snapshot.slices()
+        if self._slices is not None:
+            changed = frozenset(changed_slices(self._slices, slices))
+            LOGGER.debug(
+                "%s: %d of %d data slices changed",
+                self.name,
+                len(changed),
+                len(slices),
+            )
+            # Before the listeners run, so automations see the change first
+            for event_type, data in diff_snapshots(self._snapshot, snapshot, changed):
+                if event_type == EVENT_ALARM_NEW and self.telemetry is not None:
+                    self._record_alarm_latency(data.get("date"))
+                self.hass.bus.async_fire(event_type, {"ucr_id": self._ucr_id, **data})
+            if not update_all:
+                self.changed_slices = changed
+        if self.history is not None:
+            self.history.async_record(self._ucr_id, self._snapshot, snapshot)
+        self._slices = slices
+        self._snapshot = snapshot
+
+    def _record_alarm_latency(self, date) -> None:
+        """Record how long a new alarm took from its date until now."""
+        timing = self.divera_client.get_pull_timing()
+        if timing is None or not isinstance(date, (int, float)):
+            return
+        self.telemetry.record_alarm(date, *timing, unix_time())
+
+    def _schedule_setup_retry(self) -> None:
+        """
+        Back off while the UCR has no data at all.
+
+        The delay doubles from SETUP_RETRY_BASE up to SETUP_RETRY_MAX seconds,
+        reduced by a random share of up to SETUP_RETRY_JITTER, so units that
+        failed together do not retry together. UCRs with data keep polling at
+        their regular interval.
+        """
+        if self.data is not None:
+            return
+        delay = min(SETUP_RETRY_MAX, SETUP_RETRY_BASE * 2**self._setup_retries)
+        delay *= 1 - random.uniform(0, SETUP_RETRY_JITTER)
+        self._setup_retries += 1
+        LOGGER.debug("%s: no data yet, retrying in %.0f seconds", self.name, delay)
+        self.update_interval = timedelta(seconds=delay)
+
+    async def _async_acquire_request(self) -> None:
+        """Wait until the request budget of the scheduler allows a request."""
+        await self._scheduler.async_acquire(
+            self._poll_group, self._ucr_id, self._poll_priority()
+        )
+
+    def _poll_priority(self) -> int:
+        """Return the scheduler priority of the next poll of this UCR."""
+        client = self.divera_client
+        if client.get_snapshot() is None:
+            return POLL_PRIORITY_DEFAULT
+        if client.has_open_alarms():
+            return POLL_PRIORITY_OPEN_ALARM
+        if str(client.get_active_ucr()) == str(self._ucr_id):
+            return POLL_PRIORITY_ACTIVE_UCR
+        return POLL_PRIORITY_DEFAULT
+
+    def _seconds_until_refresh(self) -> float:
+        """Return the seconds until the next scheduled refresh (0 if overdue)."""
+        if self._last_refresh is None or self.update_interval is None:
+            return 0.0
+        elapsed = monotonic() - self._last_refresh
+        return max(0.0, self.update_interval.total_seconds() - elapsed)
+
+    def _schedule_next_refresh(self, changed: bool) -> None:
+        """
+        Choose the delay until the next poll.
+
+        Adaptive polling picks the interval from the alarm state, the
+        scheduler then moves the poll to the phase of this coordinator's group
+        unless alarms are open. Runs before DataUpdateCoordinator schedules
+        the next refresh, so the delay already applies to it.
+
+        Args:
+            changed (bool): Whether the last pull changed the data.
+        """
+        now = monotonic()
+        open_alarms = self.divera_client.has_open_alarms()
+        seconds = self._idle_interval
+        if self._adaptive_polling is not None:
+            if changed:
+                signature = self.divera_client.get_snapshot().alarm_signature()
+                if (
+                    self._alarm_signature is not None
+                    and signature != self._alarm_signature
+                ):
+                    self._fast_until = now + FAST_POLL_HOLD
+                self._alarm_signature = signature
+            seconds = self._adaptive_polling.interval(
+                self._idle_interval,
+                open_alarms or now < self._fast_until,
+                dt_util.now().time(),
+            )
+        if seconds != self._base_interval:
+            LOGGER.debug("%s: polling every %d seconds", self.name, seconds)
+            self._base_interval = seconds
+        delay = float(seconds)
+        if self._scheduler is not None and not open_alarms:
+            delay = self._scheduler.align(self._poll_group, delay)
+        self.update_interval = timedelta(seconds=delay)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Update all registered listeners.
+
+        Skipped once after a refresh whose data did not change, so an idle
+        poll does not rewrite the state of every entity.
+        """
+        if not self._notify_listeners:
+            self._notify_listeners = True
+            return
+        if self.telemetry is None:
+            super().async_update_listeners()
+            return
+        started = monotonic()
+        super().async_update_listeners()
+        self.telemetry.record(METRIC_UPDATE_TIME, (monotonic() - started) * 1000)
@@ -1,8 +1,11 @@
 """Module contains the data structures used in the Divera 24/7 custom component."""
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 from custom_components.divera247 import DiveraCoordinator
+from custom_components.divera247.fetcher import DiveraFetcher
 
 
 @dataclass
@@ -13,6 +16,15 @@ class DiveraRuntimeData:
     Attributes:
         coordinators (dict[str, DiveraCoordinator]): A dictionary mapping
         coordinator IDs to their respective DiveraCoordinator instances.
+        fetcher (DiveraFetcher | None): The fetcher shared by the coordinators.
+        data (dict[str, Any]): The config entry data the entry was set up with.
+        options (dict[str, Any]): The config entry options currently applied.
+        push_unregister (Callable[[], None] | None): Unregisters the push
+            webhook, None while push is disabled.
     """
 
     coordinators: dict[str, DiveraCoordinator]
+    fetcher: DiveraFetcher | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
+    push_unregister: Callable[[], None] | None = None
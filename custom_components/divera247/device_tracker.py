@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.components.device_tracker import SourceType, TrackerEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import DiveraConfigEntry
 from .coordinator import DiveraCoordinator
 from .divera247 import DiveraClient
-from .entity import DiveraEntity, DiveraEntityDescription
+from .entity import DiveraEntity, DiveraEntityDescription, async_track_divera_entities
 from .const import (
     CONF_VEHICLE_NAME_MODE,
+    SIGNAL_OPTIONS_UPDATED,
+    SLICE_VEHICLE,
     VEHICLE_NAME_MODE_AUTO,
     VEHICLE_NAME_MODE_NAME,
     VEHICLE_NAME_MODE_SHORT,
@@ -42,6 +46,7 @@ class DiveraVehicleTrackerEntity(DiveraEntity, TrackerEntity):
             DiveraEntityDescription(
                 key=f"vehicle_{vehicle_id}_tracker",
                 attribute_fn=lambda client: {},
+                data_slice=(SLICE_VEHICLE, vehicle_id),
             ),
         )
         self._latitude: float | None = None
@@ -84,6 +89,27 @@ class DiveraVehicleTrackerEntity(DiveraEntity, TrackerEntity):
     def source_type(self) -> SourceType:
         return SourceType.GPS
 
+    async def async_added_to_hass(self) -> None:
+        """Follow vehicle name mode changes applied without reload."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self.platform.config_entry.entry_id),
+                self._async_options_updated,
+            )
+        )
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Rename the tracker and its device with the current vehicle name mode."""
+        self._name_mode = self.platform.config_entry.options.get(
+            CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODE_AUTO
+        )
+        self._assign_name()
+        self._async_update_device_name(self._vehicle_display_name)
+        self.async_write_ha_state()
+
     def _assign_name(self) -> None:
         client = self.coordinator.data
         display = self._compute_display_name(client)
@@ -99,7 +125,7 @@ class DiveraVehicleTrackerEntity(DiveraEntity, TrackerEntity):
             return
         self._assign_name()
         try:
-            attrs: dict[str, Any] = client.get_vehicle_attributes(self._vehicle_id)
+            attrs: Mapping[str, Any] = client.get_vehicle_attributes(self._vehicle_id)
             lat = attrs.get("latitude")
             lon = attrs.get("longitude")
             # Convert to float when possible
@@ -122,20 +148,19 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Divera vehicle trackers based on a config entry."""
-    entities: list[DiveraVehicleTrackerEntity] = []
-    coordinators = entry.runtime_data.coordinators
-
-    name_mode = entry.options.get(CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODE_AUTO)
-
-    for _ucr, coordinator in coordinators.items():
-        client: DiveraClient | None = coordinator.data
-        if client is None:
-            continue
-        try:
-            for vid in client.get_vehicle_id_list():
-                entities.append(DiveraVehicleTrackerEntity(coordinator, vid, name_mode))
-        except Exception:
-            continue
 
-    if entities:
-        async_add_entities(entities, False)
+    # Vehicles come and go with the pulled data
+    async_track_divera_entities(
+        entry,
+        async_add_entities,
+        SLICE_VEHICLE,
+        lambda client: client.get_vehicle_id_list(),
+        lambda coordinator, vid: [
+            DiveraVehicleTrackerEntity(
+                coordinator,
+                vid,
+                # Current name mode: options may change without reload
+                entry.options.get(CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODE_AUTO),
+            )
+        ],
+    )
@@ -0,0 +1,55 @@
+"""Diagnostics Module for Divera 24/7 Integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from . import DiveraConfigEntry
+from .const import DATA_ACCESSKEY
+from .scheduler import async_get_scheduler
+
+TO_REDACT = {DATA_ACCESSKEY, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: DiveraConfigEntry
+) -> dict[str, Any]:
+    """
+    Return the diagnostics of a config entry.
+
+    Besides the redacted entry, the state of every UCR and, with the
+    telemetry option, its performance metrics are included.
+
+    Args:
+        hass (HomeAssistant): Home Assistant instance.
+        entry (DiveraConfigEntry): Configuration entry for the integration.
+
+    Returns:
+        dict[str, Any]: The diagnostics data.
+    """
+    ucrs: dict[str, Any] = {}
+    for ucr_id, coordinator in entry.runtime_data.coordinators.items():
+        update_interval = coordinator.update_interval
+        ucrs[str(ucr_id)] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": update_interval.total_seconds()
+            if update_interval is not None
+            else None,
+            "stale": coordinator.stale,
+            "has_data": coordinator.data is not None,
+            "telemetry": coordinator.telemetry.as_dict()
+            if coordinator.telemetry is not None
+            else None,
+        }
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "ucrs": ucrs,
+        "scheduler": async_get_scheduler(hass).queue_state(),
+    }
@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from datetime import datetime
-from http.client import UNAUTHORIZED
+import hashlib
+from http.client import NOT_MODIFIED, UNAUTHORIZED
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
 
-from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout, hdrs
 
 from homeassistant.components.calendar import CalendarEvent
 from homeassistant.const import STATE_UNKNOWN
 from homeassistant.util.dt import get_default_time_zone
+from homeassistant.util.json import json_loads
 
+from .calendar_index import DiveraEventIndex
 from .const import (
+    DEFAULT_ALARMS_V2_ON_CHANGE,
+    DIVERA_API_ALARMS_PATH,
     DIVERA_API_PULL_PATH,
     DIVERA_API_STATUS_PATH,
     DIVERA_BASE_URL,
@@ -26,8 +35,18 @@ from .const import (
     VERSION_PRO,
     VERSION_UNKNOWN,
 )
+from .snapshot import DiveraSection, DiveraSnapshot, HelperCounts, alarm_signature
+from .telemetry import (
+    METRIC_DECODE_TIME,
+    METRIC_REQUEST_TIME,
+    METRIC_RESPONSE_SIZE,
+    DiveraTelemetry,
+)
 from .utils import remove_params_from_url
 
+if TYPE_CHECKING:
+    from .recorder import DiveraRecorder
+
 # Security: Set reasonable timeouts to prevent DoS/hanging requests
 DEFAULT_TIMEOUT = ClientTimeout(total=30, connect=10, sock_connect=10, sock_read=20)
 
@@ -36,7 +55,12 @@ class DiveraClient:
     """Represents a client for interacting with the Divera API."""
 
     def __init__(
-        self, session: ClientSession, accesskey, base_url=DIVERA_BASE_URL, ucr_id=None
+        self,
+        session: ClientSession,
+        accesskey,
+        base_url=DIVERA_BASE_URL,
+        ucr_id=None,
+        alarms_v2_on_change: bool = DEFAULT_ALARMS_V2_ON_CHANGE,
     ) -> None:
         """
         Initialize DiveraClient.
@@ -46,26 +70,252 @@ class DiveraClient:
             accesskey (str): Access key for accessing Divera data.
             base_url (str, optional): Base URL for Divera API. Defaults to DIVERA_BASE_URL.
             ucr_id (str, optional): Unique identifier for the organization. Defaults to None.
+            alarms_v2_on_change (bool, optional): Only request /api/v2/alarms when the
+                alarm section of pull/all changed. Defaults to DEFAULT_ALARMS_V2_ON_CHANGE.
         """
         self.__session = session
-        self.__data = None
+        self.__snapshot: DiveraSnapshot | None = None
+        # The decoded pull/all body the snapshot was built from
+        self.__payload: dict | None = None
         self.__accesskey = accesskey
         self.__base_url = base_url
         self.__ucr_id = ucr_id
         # Optional cache for /api/v2/alarms payload
         self.__alarms_v2: dict | None = None
-
-    async def pull_data(self):
+        self.__alarms_v2_on_change = alarms_v2_on_change
+        # Alarm signature (ids, ts_update, closed) the cached alarms-v2 data belongs to
+        self.__alarms_v2_signature: tuple | None = None
+        # Validators (etag, last_modified, body_digest) of the last applied response per path
+        self.__validators: dict[str, tuple] = {}
+        # Events section and its calendar index, rebuilt when the section changes
+        self.__event_index: tuple[DiveraSection, DiveraEventIndex] | None = None
+        # The running pull, shared by concurrent pull_data callers
+        self.__pull_task: asyncio.Task | None = None
+        # Request metrics, None while telemetry is disabled
+        self.__telemetry: DiveraTelemetry | None = None
+        # Unix time the last pull/all request started and its body was read
+        # (telemetry only)
+        self.__pull_timing: tuple[float, float] | None = None
+        # Queues the responses for a recording, None unless recording
+        self.__recorder: DiveraRecorder | None = None
+        # Awaited before each pull request, e.g. for the request budget
+        self.__request_gate: Callable[[], Awaitable[None]] | None = None
+
+    async def pull_data(self) -> bool:
         """
         Pull data from the Divera API.
 
+        Callers that arrive while a pull is running await that pull instead of
+        starting their own, and get its result. Cancelling one caller does not
+        cancel the pull for the others.
+
+        Returns:
+            bool: True if the snapshot was rebuilt, False if nothing changed.
+
+        Raises:
+            DiveraConnectionError: If an error occurs while connecting to the Divera API.
+            DiveraAuthError: If authentication fails while connecting to the Divera API.
+        """
+        task = self.__pull_task
+        if task is None:
+            task = self.__pull_task = asyncio.create_task(self._pull_data())
+            task.add_done_callback(self._pull_done)
+        return await asyncio.shield(task)
+
+    def _pull_done(self, task: asyncio.Task) -> None:
+        """Forget a finished pull so the next caller starts a new one."""
+        if self.__pull_task is task:
+            self.__pull_task = None
+        if not task.cancelled():
+            # Retrieve it here in case every caller was cancelled meanwhile
+            task.exception()
+
+    async def _pull_data(self) -> bool:
+        """
+        Pull data from the Divera API (see pull_data).
+
         Retrieves data from the Divera API and updates the internal data store.
+        The /api/v2/alarms enrichment is requested concurrently with pull/all,
+        so a pull costs one round trip instead of two; both responses are merged
+        into a single snapshot. With alarms_v2_on_change the enrichment is only
+        requested after pull/all when the alarm section changed.
+
+        Both requests are conditional (see _get_json_if_modified): when neither
+        response changed, nothing is decoded and the snapshot is kept as is.
+
+        Returns:
+            bool: True if the snapshot was rebuilt, False if nothing changed.
+
+        Raises:
+            DiveraConnectionError: If an error occurs while connecting to the Divera API.
+            DiveraAuthError: If authentication fails while connecting to the Divera API.
+        """
+        if self.__alarms_v2_on_change:
+            payload, validators = await self._fetch_pull_all()
+            if payload is None:
+                return False
+            signature = alarm_signature(payload)
+            if self.__alarms_v2 is None or signature != self.__alarms_v2_signature:
+                try:
+                    self._apply_alarms_v2(*await self._fetch_alarms_v2())
+                    self.__alarms_v2_signature = signature
+                except Exception as exc:  # pragma: no cover (non-fatal enrichment)
+                    LOGGER.debug(
+                        "Failed to fetch /api/v2/alarms: %s", type(exc).__name__
+                    )
+            self.__payload = payload
+            self.__snapshot = DiveraSnapshot.from_payload(payload, self.__alarms_v2)
+            self.__validators[DIVERA_API_PULL_PATH] = validators
+            return True
+
+        alarms_task = asyncio.create_task(self._fetch_alarms_v2())
+        try:
+            payload, validators = await self._fetch_pull_all()
+        except BaseException:
+            alarms_task.cancel()
+            await asyncio.gather(alarms_task, return_exceptions=True)
+            raise
+        # Best-effort enrichment: on failure keep the previous /api/v2/alarms data
+        alarms_v2_changed = False
+        try:
+            alarms_v2_changed = self._apply_alarms_v2(*await alarms_task)
+        except Exception as exc:  # pragma: no cover (non-fatal enrichment)
+            LOGGER.debug("Failed to fetch /api/v2/alarms: %s", type(exc).__name__)
+        if payload is None:
+            if not alarms_v2_changed:
+                return False
+            self.__snapshot = self.__snapshot.with_alarms_v2(self.__alarms_v2)
+            return True
+        self.__payload = payload
+        self.__snapshot = DiveraSnapshot.from_payload(payload, self.__alarms_v2)
+        self.__validators[DIVERA_API_PULL_PATH] = validators
+        return True
+
+    def _apply_alarms_v2(self, alarms_v2: dict | None, validators: tuple) -> bool:
+        """
+        Store a /api/v2/alarms response returned by _fetch_alarms_v2.
+
+        Args:
+            alarms_v2 (dict | None): The decoded body, None if unchanged.
+            validators (tuple): The validators of the response.
+
+        Returns:
+            bool: True if the cached alarms changed.
+        """
+        if alarms_v2 is None:
+            return False
+        self.__alarms_v2 = alarms_v2
+        self.__validators[DIVERA_API_ALARMS_PATH] = validators
+        return True
+
+    async def _get_json_if_modified(self, path: str, params: dict) -> tuple:
+        """
+        Request a JSON endpoint conditionally.
+
+        The validators of the last applied response of the endpoint are sent as
+        If-None-Match/If-Modified-Since. A 304 response, or a body whose hash
+        equals the last applied one, is reported as unchanged without decoding
+        it. The request gate, if set, is awaited before the request is sent.
+        The caller stores the returned validators once it has applied the
+        body, so an aborted pull never hides a change from the next one. A 304
+        to an unconditional request has no body to fall back to and fails like
+        any other error response. With
+        telemetry set, the request time, body size and decode time are recorded;
+        with a recorder set, every response is queued for the recording.
+
+        Args:
+            path (str): The API path, also the key of the stored validators.
+            params (dict): The query parameters of the request.
+
+        Returns:
+            tuple: The decoded body (None if unchanged) and the validators
+            ``(etag, last_modified, body_digest)`` of the response.
+
+        Raises:
+            ClientError: If the request fails or is answered with 304 although
+                no validators were sent.
+        """
+        previous = self.__validators.get(path)
+        headers = {}
+        if previous is not None:
+            etag, last_modified, _ = previous
+            if etag:
+                headers[hdrs.IF_NONE_MATCH] = etag
+            if last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        if self.__request_gate is not None:
+            await self.__request_gate()
+        telemetry = self.__telemetry
+        recorder = self.__recorder
+        started = monotonic() if telemetry is not None else 0.0
+        started_at = time() if telemetry is not None or recorder is not None else 0.0
+        async with self.__session.get(
+            url="".join([self.__base_url, path]),
+            params=params,
+            headers=headers,
+            timeout=DEFAULT_TIMEOUT,
+        ) as response:
+            if response.status == NOT_MODIFIED:
+                if previous is None:
+                    # No validators were sent, so there is no body to keep
+                    if recorder is not None:
+                        recorder.record(path, params, started_at, NOT_MODIFIED, None)
+                    raise ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=NOT_MODIFIED,
+                        message="Not Modified without a previous response",
+                        headers=response.headers,
+                    )
+                if telemetry is not None:
+                    telemetry.record(
+                        METRIC_REQUEST_TIME, (monotonic() - started) * 1000
+                    )
+                    telemetry.record(METRIC_RESPONSE_SIZE, 0)
+                if recorder is not None:
+                    recorder.record(path, params, started_at, NOT_MODIFIED, None)
+                return None, previous
+            if recorder is not None and not response.ok:
+                recorder.record(path, params, started_at, response.status, None)
+            response.raise_for_status()
+            status = response.status
+            body = await response.read()
+            validators = (
+                response.headers.get(hdrs.ETAG),
+                response.headers.get(hdrs.LAST_MODIFIED),
+                hashlib.blake2b(body, digest_size=16).digest(),
+            )
+        if telemetry is not None:
+            telemetry.record(METRIC_REQUEST_TIME, (monotonic() - started) * 1000)
+            telemetry.record(METRIC_RESPONSE_SIZE, len(body))
+            if path == DIVERA_API_PULL_PATH:
+                self.__pull_timing = (started_at, time())
+        if previous is not None and previous[2] == validators[2]:
+            if recorder is not None:
+                recorder.record(path, params, started_at, status, None)
+            return None, validators
+        if telemetry is None:
+            payload = json_loads(body)
+        else:
+            started = monotonic()
+            payload = json_loads(body)
+            telemetry.record(METRIC_DECODE_TIME, (monotonic() - started) * 1000)
+        if recorder is not None:
+            recorder.record(path, params, started_at, status, payload)
+        return payload, validators
+
+    async def _fetch_pull_all(self) -> tuple:
+        """
+        Fetch the pull/all payload from the Divera API.
+
+        Returns:
+            tuple: The decoded JSON body of /api/v2/pull/all (None if unchanged
+            since the last applied one) and its validators.
 
         Raises:
             DiveraConnectionError: If an error occurs while connecting to the Divera API.
             DiveraAuthError: If authentication fails while connecting to the Divera API.
         """
-        url = "".join([self.__base_url, DIVERA_API_PULL_PATH])
         time = int(datetime.now().timestamp())
         params = {
             PARAM_ACCESSKEY: self.__accesskey,
@@ -76,36 +326,9 @@ class DiveraClient:
         if self.__ucr_id is not None:
             params[PARAM_UCR] = self.__ucr_id
         try:
-            async with self.__session.get(
-                url=url, params=params, timeout=DEFAULT_TIMEOUT
-            ) as response:
-                response.raise_for_status()
-                self.__data = await response.json()
-                # Debug preview of monitor/statusplan structures
-                if LOGGER.isEnabledFor(10):  # DEBUG level
-                    try:
-                        data_root = self.__data.get("data", {})
-                        monitor = data_root.get("monitor") or data_root.get(
-                            "localmonitor"
-                        )
-                        statusplan = data_root.get("statusplan")
-                        LOGGER.debug(
-                            "Divera data top-level keys: %s", list(data_root.keys())
-                        )
-                        if statusplan:
-                            LOGGER.debug(
-                                "statusplan sample: %s",
-                                str(statusplan)[:500],
-                            )
-                        if monitor:
-                            LOGGER.debug(
-                                "monitor sample: %s",
-                                str(monitor)[:500],
-                            )
-                    except Exception as exc:  # pragma: no cover (best effort logging)
-                        LOGGER.debug(
-                            "Failed to log monitor/statusplan preview: %s", exc
-                        )
+            payload, validators = await self._get_json_if_modified(
+                DIVERA_API_PULL_PATH, params
+            )
         except ClientResponseError as exc:
             # TODO Exception Tests
             url = remove_params_from_url(exc.request_info.url)
@@ -121,26 +344,124 @@ class DiveraClient:
                 "An error occurred while requesting %r: %s", url, type(exc).__name__
             )
             raise DiveraConnectionError from None
-        # Best-effort: also fetch /api/v2/alarms to enrich alarm attributes with vehicles
-        try:
-            await self._fetch_alarms_v2()
-        except Exception as exc:  # pragma: no cover (non-fatal enrichment)
-            LOGGER.debug("Failed to fetch /api/v2/alarms: %s", type(exc).__name__)
-
-    async def _fetch_alarms_v2(self):
+        # Debug preview of monitor/statusplan structures
+        if payload is not None and LOGGER.isEnabledFor(10):  # DEBUG level
+            try:
+                data_root = payload.get("data", {})
+                monitor = data_root.get("monitor") or data_root.get("localmonitor")
+                statusplan = data_root.get("statusplan")
+                LOGGER.debug("Divera data top-level keys: %s", list(data_root.keys()))
+                if statusplan:
+                    LOGGER.debug("statusplan sample: %s", str(statusplan)[:500])
+                if monitor:
+                    LOGGER.debug("monitor sample: %s", str(monitor)[:500])
+            except Exception as exc:  # pragma: no cover (best effort logging)
+                LOGGER.debug("Failed to log monitor/statusplan preview: %s", exc)
+        return payload, validators
+
+    async def _fetch_alarms_v2(self) -> tuple:
         """Fetch alarms from v2 API to access vehicle lists for alarms.
 
-        Non-fatal helper; failures are ignored. Result cached in self.__alarms_v2.
+        Non-fatal helper; pull_data ignores failures and caches the result in
+        self.__alarms_v2 through _apply_alarms_v2.
         """
-        url = f"{self.__base_url}/api/v2/alarms"
         params = {PARAM_ACCESSKEY: self.__accesskey}
         if self.__ucr_id is not None:
             params[PARAM_UCR] = self.__ucr_id
-        async with self.__session.get(
-            url=url, params=params, timeout=DEFAULT_TIMEOUT
-        ) as response:
-            response.raise_for_status()
-            self.__alarms_v2 = await response.json()
+        return await self._get_json_if_modified(DIVERA_API_ALARMS_PATH, params)
+
+    def get_snapshot(self) -> DiveraSnapshot | None:
+        """
+        Return the snapshot of the last successful pull.
+
+        Returns:
+            DiveraSnapshot | None: The snapshot, or None if no data was pulled yet.
+        """
+        return self.__snapshot
+
+    def set_telemetry(self, telemetry: DiveraTelemetry | None) -> None:
+        """
+        Record the metrics of the requests in a telemetry object.
+
+        Args:
+            telemetry (DiveraTelemetry | None): The telemetry of the UCR, None
+                to stop measuring.
+        """
+        self.__telemetry = telemetry
+
+    def set_recorder(self, recorder: DiveraRecorder | None) -> None:
+        """
+        Queue the responses of the client for a recording.
+
+        Args:
+            recorder (DiveraRecorder | None): The recorder of the config
+                entry, None to stop recording.
+        """
+        self.__recorder = recorder
+
+    def set_request_gate(self, gate: Callable[[], Awaitable[None]] | None) -> None:
+        """
+        Await a gate before each request of a pull.
+
+        Args:
+            gate (Callable[[], Awaitable[None]] | None): Returns once the
+                request may be sent, None to send requests right away.
+        """
+        self.__request_gate = gate
+
+    def get_pull_timing(self) -> tuple[float, float] | None:
+        """
+        Return when the last pull/all request with a body started and ended.
+
+        Returns:
+            tuple[float, float] | None: Unix times the request started and its
+                body was read, None without telemetry or before the first pull.
+        """
+        return self.__pull_timing
+
+    def set_alarms_v2_on_change(self, alarms_v2_on_change: bool) -> None:
+        """
+        Change when /api/v2/alarms is requested, starting with the next pull.
+
+        Args:
+            alarms_v2_on_change (bool): Only request /api/v2/alarms when the
+                alarm section of pull/all changed.
+        """
+        self.__alarms_v2_on_change = alarms_v2_on_change
+
+    def get_raw_data(self) -> tuple[dict | None, dict | None]:
+        """
+        Return the decoded responses the snapshot was built from.
+
+        Returns:
+            tuple[dict | None, dict | None]: The pull/all and /api/v2/alarms
+                bodies, None if not pulled yet.
+        """
+        return self.__payload, self.__alarms_v2
+
+    def restore_data(self, payload: dict, alarms_v2: dict | None = None) -> None:
+        """
+        Build the snapshot from previously stored responses.
+
+        No validators are restored, so the next pull fetches everything.
+
+        Args:
+            payload (dict): A decoded pull/all body.
+            alarms_v2 (dict | None, optional): A decoded /api/v2/alarms body.
+        """
+        self.__payload = payload
+        self.__alarms_v2 = alarms_v2
+        self.__snapshot = DiveraSnapshot.from_payload(payload, alarms_v2)
+
+    def share_snapshot_sections(self, other: DiveraSnapshot) -> None:
+        """
+        Share the user sections of the snapshot with another UCR's snapshot.
+
+        Args:
+            other (DiveraSnapshot): The snapshot of another UCR of the same user.
+        """
+        if self.__snapshot is not None and self.__snapshot is not other:
+            self.__snapshot = self.__snapshot.shared_with(other)
 
     def get_base_url(self) -> str:
         """
@@ -161,9 +482,8 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        firstname = self.__data["data"]["user"]["firstname"]
-        lastname = self.__data["data"]["user"]["lastname"]
-        return firstname + " " + lastname
+        user = self.__snapshot.user
+        return user["firstname"] + " " + user["lastname"]
 
     def get_user(self) -> dict:
         """
@@ -177,8 +497,8 @@ class DiveraClient:
             KeyError: If the required keys are not found in the data dictionary.
         """
         data = {}
-        data["firstname"] = self.__data["data"]["user"]["firstname"]
-        data["lastname"] = self.__data["data"]["user"]["lastname"]
+        data["firstname"] = self.__snapshot.user["firstname"]
+        data["lastname"] = self.__snapshot.user["lastname"]
         data["fullname"] = self.get_full_name()
         data["email"] = self.get_email()
         return data
@@ -197,13 +517,25 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        status = self.__data["data"]["cluster"]["status"]
-        status_sorting = self.__data["data"]["cluster"]["statussorting"]
+        try:
+            return self.__snapshot.state_id_by_name[name]
+        except KeyError:
+            raise ValueError(f"State name '{name}' not found.") from None
+
+    def find_state_name(self, name: str) -> str | None:
+        """
+        Return the exact state name matching the given name case-insensitively.
 
-        for state_id in status_sorting:
-            if status.get(str(state_id), {}).get("name") == name:
-                return state_id
-        raise ValueError(f"State name '{name}' not found.")
+        Args:
+            name (str): The state name as entered by the user.
+
+        Returns:
+            str | None: The state name as known by Divera, or None if no state matches.
+        """
+        state_id = self.__snapshot.state_id_by_casefold.get(name.casefold())
+        if state_id is None:
+            return None
+        return self.get_state_name_by_id(state_id)
 
     def get_all_state_name(self) -> list:
         """
@@ -215,11 +547,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        states = []
-        for state_id in self.__data["data"]["cluster"]["statussorting"]:
-            state_name = self.__data["data"]["cluster"]["status"][str(state_id)]["name"]
-            states.append(state_name)
-        return states
+        return list(self.__snapshot.state_names)
 
     def get_user_state(self) -> str:
         """
@@ -231,7 +559,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        status_id = self.__data["data"]["status"]["status_id"]
+        status_id = self.__snapshot.user_status["status_id"]
         return self.get_state_name_by_id(status_id)
 
     def get_state_name_by_id(self, status_id) -> str:
@@ -247,7 +575,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["cluster"]["status"][str(status_id)]["name"]
+        return self.__snapshot.statuses[str(status_id)]["name"]
 
     def get_user_state_attributes(self) -> dict:
         """
@@ -260,12 +588,13 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
+        user_status = self.__snapshot.user_status
         data = {}
-        timestamp = self.__data["data"]["status"]["status_set_date"]
+        timestamp = user_status["status_set_date"]
         data["timestamp"] = datetime.fromtimestamp(
             timestamp, tz=get_default_time_zone()
         )
-        data["id"] = self.__data["data"]["status"]["status_id"]
+        data["id"] = user_status["status_id"]
         return data
 
     def get_last_event(self) -> CalendarEvent | None:
@@ -279,19 +608,17 @@ class DiveraClient:
             CalendarEvent | None: The last event as a CalendarEvent object if available,
             otherwise None.
         """
-        sorting_list = self.__data["data"]["events"]["sorting"]
-        if sorting_list:
-            last_event_id = sorting_list[0]
-            event = self.__data["data"]["events"]["items"].get(str(last_event_id), {})
-            return self.__map_event_to_calendar(event)
+        event = self.__snapshot.events.first()
+        if event is not None:
+            return self.map_event_to_calendar(event)
         return None
 
     @staticmethod
-    def __map_event_to_calendar(event) -> CalendarEvent:
+    def map_event_to_calendar(event) -> CalendarEvent:
         """
         Map a raw event from Divera data to a CalendarEvent.
 
-        This private method converts a raw event dictionary from the Divera data
+        This method converts a raw event dictionary from the Divera data
         into a CalendarEvent object. It extracts the start and end times, title,
         location, description, and unique identifier.
 
@@ -319,26 +646,44 @@ class DiveraClient:
         """
         Retrieve all events within a specified date range.
 
-        This method fetches all events from the Divera data that fall within the
-        specified start and end dates. It uses the sorting order to iterate through
-        events and maps them to CalendarEvent objects.
+        This method returns all events from the Divera data that overlap the
+        specified start and end dates, including events spanning either date.
+        The events are mapped to CalendarEvent objects and sorted by start
+        once per pull (see DiveraEventIndex), so each query is a bisect.
 
         Args:
             start_date (datetime): The start date for filtering events.
             end_date (datetime): The end date for filtering events.
 
         Returns:
-            list[CalendarEvent]: A list of CalendarEvent objects that fall within
-            the specified date range.
-        """
-        sorting_list = self.__data["data"]["events"]["sorting"]
-        events = []
-        for event_id in sorting_list:
-            event = self.__data["data"]["events"]["items"].get(str(event_id), {})
-            cal_event = self.__map_event_to_calendar(event)
-            if cal_event.start >= start_date and cal_event.end <= end_date:
-                events.append(cal_event)
-        return events
+            list[CalendarEvent]: A list of CalendarEvent objects overlapping
+            the specified date range, ordered by start.
+        """
+        return self._get_event_index().between(start_date, end_date)
+
+    def get_first_event_start(self) -> datetime | None:
+        """
+        Return the start of the earliest event the API still returns.
+
+        Returns:
+            datetime | None: The start, None if there are no events.
+        """
+        start = self._get_event_index().first_start
+        if start is None:
+            return None
+        return datetime.fromtimestamp(start, tz=get_default_time_zone())
+
+    def _get_event_index(self) -> DiveraEventIndex[CalendarEvent]:
+        """Return the index of the events, built once per event section."""
+        events = self.__snapshot.events
+        index = self.__event_index
+        if index is None or index[0] is not events:
+            # Converted once per event section, not per query
+            index = self.__event_index = (
+                events,
+                DiveraEventIndex(events, self.map_event_to_calendar),
+            )
+        return index[1]
 
     def has_open_alarms(self) -> bool:
         """
@@ -350,11 +695,7 @@ class DiveraClient:
         Returns:
             bool: True if there is at least one open alarm; False otherwise.
         """
-        sorting_list = self.__data["data"]["alarm"]["sorting"]
-        items = self.__data["data"]["alarm"]["items"]
-        return any(
-            not items.get(str(alarm_id), {}).get("closed") for alarm_id in sorting_list
-        )
+        return any(not alarm.get("closed") for alarm in self.__snapshot.alarms)
 
     def get_last_alarm_attributes(self) -> dict:
         """
@@ -370,13 +711,10 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        sorting_list = self.__data["data"]["alarm"]["sorting"]
-        if not sorting_list:
+        alarm = self.__snapshot.alarms.first()
+        if alarm is None:
             return {}
 
-        last_alarm_id = sorting_list[0]
-        alarm = self.__data["data"]["alarm"]["items"].get(str(last_alarm_id), {})
-
         cross_unit_meta = alarm.get("cross_unit_meta", {})
         cross_unit_groups = cross_unit_meta.get("groups", {})
         cross_unit_clusters = cross_unit_meta.get("clusters", {})
@@ -422,16 +760,13 @@ class DiveraClient:
         # human-readable name via the cluster vehicle data (see issue #121).
         try:
             veh_block = None
-            if isinstance(self.__alarms_v2, dict):
-                items = self.__alarms_v2.get("data", {}).get("items")
-                if isinstance(items, dict):
-                    v2_alarm = items.get(str(attributes.get("id")))
-                    if isinstance(v2_alarm, dict):
-                        veh_block = (
-                            v2_alarm.get("vehicle")
-                            or v2_alarm.get("vehicles")
-                            or v2_alarm.get("vehicle_list")
-                        )
+            v2_alarm = self.__snapshot.alarms_v2.get(str(attributes.get("id")))
+            if isinstance(v2_alarm, dict):
+                veh_block = (
+                    v2_alarm.get("vehicle")
+                    or v2_alarm.get("vehicles")
+                    or v2_alarm.get("vehicle_list")
+                )
             if veh_block is None:
                 veh_block = alarm.get("vehicle") or alarm.get("vehicles")
 
@@ -463,10 +798,9 @@ class DiveraClient:
             str | None: The shortname/name/fullname of the vehicle, or None if the
             vehicle id is not found in the cluster data.
         """
-        try:
-            vehicle = self.__data["data"]["cluster"]["vehicle"][str(vehicle_id)]
-        except (KeyError, TypeError):
+        if self.__snapshot is None:
             return None
+        vehicle = self.__snapshot.vehicles.get(str(vehicle_id))
         if not isinstance(vehicle, dict):
             return None
         return (
@@ -528,10 +862,8 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        sorting_list = self.__data["data"]["alarm"]["sorting"]
-        if sorting_list:
-            last_alarm_id = sorting_list[0]
-            alarm = self.__data["data"]["alarm"]["items"].get(str(last_alarm_id), {})
+        alarm = self.__snapshot.alarms.first()
+        if alarm is not None:
             return alarm.get("title", STATE_UNKNOWN)
         return STATE_UNKNOWN
 
@@ -545,10 +877,8 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        sorting_list = self.__data["data"]["news"]["sorting"]
-        if sorting_list:
-            last_news_id = sorting_list[0]
-            news = self.__data["data"]["news"]["items"].get(str(last_news_id), {})
+        news = self.__snapshot.news.first()
+        if news is not None:
             return news.get("title", STATE_UNKNOWN)
         return STATE_UNKNOWN
 
@@ -566,13 +896,10 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        sorting_list = self.__data["data"]["news"]["sorting"]
-        if not sorting_list:
+        news = self.__snapshot.news.first()
+        if news is None:
             return {}
 
-        last_news_id = sorting_list[0]
-        news = self.__data["data"]["news"]["items"].get(str(last_news_id), {})
-
         groups = [
             self.get_group_name_by_id(group_id) for group_id in news.get("group", [])
         ]
@@ -598,7 +925,7 @@ class DiveraClient:
         Returns:
             list[int]: A list containing all the vehicle IDs.
         """
-        return list(self.__data["data"]["cluster"]["vehicle"].keys())
+        return list(self.__snapshot.vehicles)
 
     def get_vehicle_state(self, vehicle_id: str) -> dict:
         """
@@ -614,7 +941,7 @@ class DiveraClient:
             KeyError: If the vehicle ID or key 'fmsstatus_id' is not found in the data dictionary.
         """
         try:
-            vehicle = self.__data["data"]["cluster"]["vehicle"][vehicle_id]
+            vehicle = self.__snapshot.vehicles[vehicle_id]
             return vehicle.get("fmsstatus_id", STATE_UNKNOWN)
         except KeyError:
             LOGGER.error(
@@ -622,56 +949,27 @@ class DiveraClient:
             )
             return {}
 
-    def get_vehicle_attributes(self, vehicle_id: str) -> dict:
+    def get_vehicle_attributes(self, vehicle_id: str) -> Mapping[str, Any]:
         """
         Retrieve the status attributes of a vehicle by its ID.
 
+        The read-only mapping is built once per pull and shared by all
+        entities of the vehicle (see DiveraSnapshot.vehicle_view).
+
         Args:
             vehicle_id (str): The ID of the vehicle.
 
         Returns:
-            dict: A dictionary containing the status attributes of the vehicle, including
+            Mapping[str, Any]: The status attributes of the vehicle, including
                   fullname, shortname, name, fmsstatus_note, fmsstatus_ts, latitude, longitude,
-                  opta, issi, and number. If the vehicle or required keys are not found, an
-                  empty dictionary is returned.
-
-        Raises:
-            KeyError: If the required keys are not found in the data dictionary.
+                  opta, issi, and number. If the vehicle is not found, an empty
+                  dictionary is returned.
         """
-        try:
-            vehicle_status = self.__data["data"]["cluster"]["vehicle"][vehicle_id]
-            fmsstatus_timestamp = datetime.fromtimestamp(
-                vehicle_status.get("fmsstatus_ts"), tz=get_default_time_zone()
-            )
-            # Normalize coordinates: API may expose lat/lng or latitude/longitude
-            lat_val = (
-                vehicle_status.get("lat")
-                or vehicle_status.get("latitude")
-                or vehicle_status.get("lat_deg")
-            )
-            lng_val = (
-                vehicle_status.get("lng")
-                or vehicle_status.get("lon")
-                or vehicle_status.get("longitude")
-                or vehicle_status.get("lon_deg")
-            )
-            return {
-                "fullname": vehicle_status.get("fullname"),
-                "shortname": vehicle_status.get("shortname"),
-                "name": vehicle_status.get("name"),
-                "fmsstatus_note": vehicle_status.get("fmsstatus_note"),
-                "fmsstatus_ts": fmsstatus_timestamp,
-                "latitude": lat_val,
-                "longitude": lng_val,
-                "opta": vehicle_status.get("opta"),
-                "issi": vehicle_status.get("issi"),
-                "number": vehicle_status.get("number"),
-            }
-        except KeyError:
-            LOGGER.error(
-                f"Vehicle with ID {vehicle_id} or one of the required keys not found."
-            )
+        view = self.__snapshot.vehicle_view(vehicle_id, get_default_time_zone())
+        if view is None:
+            LOGGER.error(f"Vehicle with ID {vehicle_id} not found.")
             return {}
+        return view
 
     def get_organization_name(self) -> str | None:
         """Get organization name from cluster data (e.g., 'THW', 'Feuerwehr').
@@ -679,10 +977,9 @@ class DiveraClient:
         Returns:
             str | None: Organization name or None if not found.
         """
-        try:
-            return self.__data["data"]["cluster"].get("organisation")
-        except (KeyError, TypeError):
+        if self.__snapshot is None:
             return None
+        return self.__snapshot.cluster.get("organisation")
 
     def get_group_name_by_id(self, group_id):
         """
@@ -698,11 +995,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        try:
-            group = self.__data["data"]["cluster"]["group"][str(group_id)]
-            return group["name"]
-        except KeyError:
-            return None
+        return self.__snapshot.group_names.get(str(group_id))
 
     def get_default_ucr(self) -> int:
         """
@@ -714,7 +1007,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["ucr_default"]
+        return self.__snapshot.ucr_default
 
     def get_active_ucr(self) -> int:
         """
@@ -726,7 +1019,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["ucr_active"]
+        return self.__snapshot.ucr_active
 
     def get_default_cluster_name(self) -> str:
         """
@@ -763,12 +1056,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        ucr_ids = list(self.__data["data"]["ucr"])
-        cluster_names = []
-        for ucr_id in ucr_ids:
-            ucr_name = self.get_cluster_name_from_ucr(ucr_id)
-            cluster_names.append(ucr_name)
-        return cluster_names
+        return list(self.__snapshot.cluster_name_by_ucr.values())
 
     def get_all_ucrs(self) -> list:
         """
@@ -780,7 +1068,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return list(self.__data["data"]["ucr"])
+        return list(self.__snapshot.ucrs)
 
     def get_cluster_names_from_ucrs(self, ucr_ids: list[int]) -> list[str]:
         """
@@ -792,7 +1080,8 @@ class DiveraClient:
         Returns:
             List[str]: List of cluster names corresponding to the given UCR IDs.
         """
-        return [self.get_cluster_name_from_ucr(id) for id in ucr_ids]
+        cluster_name_by_ucr = self.__snapshot.cluster_name_by_ucr
+        return [cluster_name_by_ucr[str(ucr_id)] for ucr_id in ucr_ids]
 
     def get_cluster_name_from_ucr(self, ucr_id) -> str:
         """
@@ -807,7 +1096,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["ucr"][str(ucr_id)]["name"]
+        return self.__snapshot.cluster_name_by_ucr[str(ucr_id)]
 
     def get_cluster_id_from_ucr(self, ucr_id) -> int:
         """
@@ -822,7 +1111,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["ucr"][str(ucr_id)]["cluster_id"]
+        return self.__snapshot.ucrs[str(ucr_id)]["cluster_id"]
 
     def get_ucr_ids(self, ucr_names) -> list:
         """
@@ -837,13 +1126,12 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        ucr_ids = list(self.__data["data"]["ucr"])
-        ucr_name_ids = []
-        for ucr_id in ucr_ids:
-            ucr_name = self.get_cluster_name_from_ucr(ucr_id)
-            if ucr_name in ucr_names:
-                ucr_name_ids.append(ucr_id)
-        return ucr_name_ids
+        ucr_names = set(ucr_names)
+        return [
+            ucr_id
+            for ucr_id, ucr_name in self.__snapshot.cluster_name_by_ucr.items()
+            if ucr_name in ucr_names
+        ]
 
     def get_accesskey(self) -> str:
         """
@@ -855,7 +1143,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["user"]["accesskey"]
+        return self.__snapshot.user["accesskey"]
 
     def get_email(self) -> str:
         """
@@ -867,7 +1155,7 @@ class DiveraClient:
         Raises:
             KeyError: If the required keys are not found in the data dictionary.
         """
-        return self.__data["data"]["user"]["email"]
+        return self.__snapshot.user["email"]
 
     async def set_user_state_by_id(self, state_id: str):
         """
@@ -894,7 +1182,9 @@ class DiveraClient:
                 response.raise_for_status()
         except ClientResponseError as exc:
             url_clean = remove_params_from_url(exc.request_info.url)
-            LOGGER.error("Error response %s while requesting %r.", exc.status, url_clean)
+            LOGGER.error(
+                "Error response %s while requesting %r.", exc.status, url_clean
+            )
             if exc.status == UNAUTHORIZED:
                 raise DiveraAuthError from None
             raise DiveraConnectionError from None
@@ -919,7 +1209,7 @@ class DiveraClient:
             The version_id is extracted from the 'data' dictionary attribute of the instance.
         """
         try:
-            version = self.__data["data"]["cluster"]["version_id"]
+            version = self.__snapshot.cluster["version_id"]
             match version:
                 case 1:
                     return VERSION_FREE
@@ -936,38 +1226,40 @@ class DiveraClient:
         """Return configured UCR id even if data not loaded yet."""
         return self.__ucr_id
 
-    def get_helpers(self) -> list[dict]:
-        """Return helper list extracted from raw data if available.
+    def get_helpers(self) -> Sequence[dict]:
+        """Return helper records of the last snapshot if available.
 
-        Falls back to empty list when structure is absent or not yet loaded.
+        Falls back to an empty sequence when the structure is absent or not yet loaded.
         """
-        if self.__data is None:
-            return []
-        try:
-            # Attempt common keys that might store helpers
-            data_root = self.__data.get("data", {})
-            helpers = data_root.get("helpers") or data_root.get("helper")
-            if helpers is None:
-                return []
-            if isinstance(helpers, list):
-                return helpers
-            if isinstance(helpers, dict):
-                return list(helpers.values())
-            return []
-        except Exception:
-            return []
+        if self.__snapshot is None:
+            return ()
+        return self.__snapshot.helpers
+
+    def get_helper_counts(self) -> HelperCounts:
+        """
+        Return the helper counts (status, group, qualification) of the last snapshot.
+
+        Counted on first use per snapshot; only the status count and overview
+        sensors of the status sensors option read them.
+        """
+        if self.__snapshot is None:
+            return HelperCounts()
+        return self.__snapshot.helper_counts
+
+    def get_helper(self, key: str) -> dict | None:
+        """Return the helper record with the given helper_key(), None if it is gone."""
+        if self.__snapshot is None:
+            return None
+        return self.__snapshot.helpers_by_key.get(key)
 
     def get_statusplan_raw(self):
         """Return raw statusplan section (future status / forecast) if present.
 
         Returns empty dict when not available or data not loaded yet.
         """
-        if self.__data is None:
-            return {}
-        try:
-            return self.__data.get("data", {}).get("statusplan", {}) or {}
-        except Exception:
+        if self.__snapshot is None:
             return {}
+        return self.__snapshot.statusplan
 
     def get_monitor_raw(self):
         """Return raw monitor/localmonitor section if present.
@@ -975,13 +1267,9 @@ class DiveraClient:
         Some installations might expose either 'monitor' or 'localmonitor'.
         Returns empty dict when not available.
         """
-        if self.__data is None:
-            return {}
-        try:
-            data_root = self.__data.get("data", {})
-            return data_root.get("monitor") or data_root.get("localmonitor") or {}
-        except Exception:
+        if self.__snapshot is None:
             return {}
+        return self.__snapshot.monitor
 
     async def set_user_state_by_name(self, option: str):
         """
@@ -1006,7 +1294,7 @@ class DiveraClient:
         """
         # normal users only have group id 8 or 4
         ucr_id = self.get_default_ucr()
-        usergroup_id = self.__data["data"]["ucr"][str(ucr_id)]["usergroup_id"]
+        usergroup_id = self.__snapshot.ucrs[str(ucr_id)]["usergroup_id"]
         if usergroup_id in {8, 4}:
             return True
 
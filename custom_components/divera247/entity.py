@@ -2,20 +2,199 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, Hashable, Iterable, Mapping, MutableMapping
 from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.core import callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DIVERA_BASE_URL, DIVERA_GMBH, DOMAIN
+from .const import ATTR_STALE, DIVERA_BASE_URL, DIVERA_GMBH, DOMAIN
 from .coordinator import DiveraCoordinator
 from .divera247 import DiveraClient
 
 
+@callback
+def async_add_divera_entities(
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    entities_fn: Callable[[DiveraCoordinator], Iterable[Entity]],
+) -> None:
+    """
+    Add the entities of every UCR of a config entry.
+
+    UCRs whose first refresh failed are set up later: their entities are
+    added as soon as their coordinator has data.
+
+    Args:
+        entry (ConfigEntry): Configuration entry for the integration.
+        async_add_entities (AddEntitiesCallback): Function to add entities.
+        entities_fn (Callable[[DiveraCoordinator], Iterable[Entity]]):
+            Function that returns the entities of one coordinator with data.
+    """
+    entities: list[Entity] = []
+    for coordinator in entry.runtime_data.coordinators.values():
+        if coordinator.data is not None:
+            entities.extend(entities_fn(coordinator))
+        else:
+            _async_add_when_ready(entry, coordinator, async_add_entities, entities_fn)
+    if entities:
+        async_add_entities(entities, False)
+
+
+@callback
+def _async_add_when_ready(
+    entry: ConfigEntry,
+    coordinator: DiveraCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    entities_fn: Callable[[DiveraCoordinator], Iterable[Entity]],
+) -> None:
+    """Add the entities of a coordinator after its first successful refresh."""
+    unsubscribe: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_ready() -> None:
+        nonlocal unsubscribe
+        if coordinator.data is None or unsubscribe is None:
+            return
+        unsubscribe()
+        unsubscribe = None
+        async_add_entities(list(entities_fn(coordinator)), False)
+
+    @callback
+    def _async_unload() -> None:
+        if unsubscribe is not None:
+            unsubscribe()
+
+    # Also keeps the coordinator retrying until the entities take over
+    unsubscribe = coordinator.async_add_listener(_async_ready)
+    entry.async_on_unload(_async_unload)
+
+
+@callback
+def async_track_divera_entities(
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    slice_name: str,
+    keys_fn: Callable[[DiveraClient], Iterable[Hashable]],
+    entities_fn: Callable[[DiveraCoordinator, Hashable], Iterable[DiveraEntity]],
+) -> None:
+    """
+    Keep one group of entities per vehicle or helper of every UCR in sync.
+
+    The entities of the keys present in the first data are added at once.
+    After every refresh that added or removed a (slice_name, key) slice, the
+    entities of new keys are added and those of vanished keys are removed
+    from the entity registry, together with devices left without entities.
+    Entities of unchanged keys are left alone, so no reload is needed.
+
+    Args:
+        entry (ConfigEntry): Configuration entry for the integration.
+        async_add_entities (AddEntitiesCallback): Function to add entities.
+        slice_name (str): SLICE_VEHICLE or SLICE_HELPER.
+        keys_fn (Callable[[DiveraClient], Iterable[Hashable]]): Function that
+            returns the current keys (vehicle ids, helper keys) of a client.
+        entities_fn (Callable[[DiveraCoordinator, Hashable], Iterable[DiveraEntity]]):
+            Function that returns the entities of one key.
+    """
+    entities: list[Entity] = []
+    for coordinator in entry.runtime_data.coordinators.values():
+        reconcile = _DiveraEntityReconciler(
+            entry, coordinator, async_add_entities, slice_name, keys_fn, entities_fn
+        )
+        if coordinator.data is not None:
+            entities.extend(reconcile.async_added_entities())
+        entry.async_on_unload(coordinator.async_add_listener(reconcile))
+    if entities:
+        async_add_entities(entities, False)
+
+
+class _DiveraEntityReconciler:
+    """Coordinator listener adding and removing the entities of keyed slices."""
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        coordinator: DiveraCoordinator,
+        async_add_entities: AddEntitiesCallback,
+        slice_name: str,
+        keys_fn: Callable[[DiveraClient], Iterable[Hashable]],
+        entities_fn: Callable[[DiveraCoordinator, Hashable], Iterable[DiveraEntity]],
+    ) -> None:
+        """Initialize the listener; no entities are created before a refresh."""
+        self._entry = entry
+        self._coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        self._slice_name = slice_name
+        self._keys_fn = keys_fn
+        self._entities_fn = entities_fn
+        self._entities: dict[Hashable, list[DiveraEntity]] = {}
+        self._started = False
+
+    @callback
+    def __call__(self) -> None:
+        """Reconcile the entities with the data of the coordinator."""
+        changed = self._coordinator.changed_slices
+        if (
+            self._started
+            and changed is not None
+            and not any(
+                isinstance(key, tuple) and key[0] == self._slice_name for key in changed
+            )
+        ):
+            return
+        if self._coordinator.data is None:
+            return
+        if entities := self.async_added_entities():
+            self._async_add_entities(entities, False)
+
+    @callback
+    def async_added_entities(self) -> list[DiveraEntity]:
+        """Remove the entities of vanished keys; return those of new keys."""
+        self._started = True
+        try:
+            keys = set(self._keys_fn(self._coordinator.data))
+        except Exception:
+            return []
+        for key in self._entities.keys() - keys:
+            self._async_remove(self._entities.pop(key))
+        entities: list[DiveraEntity] = []
+        for key in keys - self._entities.keys():
+            self._entities[key] = list(self._entities_fn(self._coordinator, key))
+            entities.extend(self._entities[key])
+        return entities
+
+    @callback
+    def _async_remove(self, entities: list[DiveraEntity]) -> None:
+        """Remove entities and the devices they leave empty."""
+        hass: HomeAssistant = self._coordinator.hass
+        entity_registry = er.async_get(hass)
+        device_ids: set[str] = set()
+        for entity in entities:
+            # Entity listeners run after this one: skip the update of a gone key
+            entity._divera_removed = True
+            if entity.registry_entry is not None:
+                if entity.registry_entry.device_id is not None:
+                    device_ids.add(entity.registry_entry.device_id)
+                # Also removes the entity from its platform
+                entity_registry.async_remove(entity.entity_id)
+            elif entity.hass is not None:
+                hass.async_create_task(entity.async_remove())
+        device_registry = dr.async_get(hass)
+        for device_id in device_ids:
+            if not er.async_entries_for_device(
+                entity_registry, device_id, include_disabled_entities=True
+            ):
+                device_registry.async_update_device(
+                    device_id, remove_config_entry_id=self._entry.entry_id
+                )
+
+
 @dataclass(frozen=True, kw_only=True)
 class DiveraEntityDescription(EntityDescription):
     """
@@ -25,9 +204,12 @@ class DiveraEntityDescription(EntityDescription):
         attribute_fn (Callable[[DiveraClient], MutableMapping[str, Any]]):
             Function that returns a mapping of attributes for the entity,
             based on a DiveraClient instance.
+        data_slice (Any): Key of the data slice the entity is built from
+            (see SLICE_* in const), None to update on every change.
     """
 
     attribute_fn: Callable[[DiveraClient], MutableMapping[str, Any]]
+    data_slice: Any = None
 
 
 class DiveraEntity(CoordinatorEntity[DiveraCoordinator]):
@@ -40,10 +222,14 @@ class DiveraEntity(CoordinatorEntity[DiveraCoordinator]):
     """
 
     _attr_has_entity_name = True
+    _divera_removed = False
     entity_description: DiveraEntityDescription
 
     def __init__(
-        self, coordinator: DiveraCoordinator, description: DiveraEntityDescription
+        self,
+        coordinator: DiveraCoordinator,
+        description: DiveraEntityDescription,
+        data_slice: Any = None,
     ) -> None:
         """
         Initialize DiveraEntity.
@@ -51,8 +237,12 @@ class DiveraEntity(CoordinatorEntity[DiveraCoordinator]):
         Args:
             coordinator (DiveraCoordinator): The coordinator managing this entity.
             description (DiveraEntityDescription): Description of the entity.
+            data_slice (Any, optional): Key of the data slice the entity is built
+                from. Defaults to the data_slice of the description.
         """
-        super().__init__(coordinator)
+        if data_slice is None:
+            data_slice = description.data_slice
+        super().__init__(coordinator, data_slice)
         self.entity_description = description
 
         client = self.coordinator.data
@@ -85,8 +275,19 @@ class DiveraEntity(CoordinatorEntity[DiveraCoordinator]):
         """
         Handle updates from the coordinator.
 
-        This method is called when the coordinator has new data.
+        This method is called when the coordinator has new data. Entities
+        bound to a data slice skip updates that did not change their slice,
+        and removed entities skip all updates.
         """
+        if self._divera_removed:
+            return
+        changed = self.coordinator.changed_slices
+        if (
+            changed is not None
+            and self.coordinator_context is not None
+            and self.coordinator_context not in changed
+        ):
+            return
         self._divera_update()
         self.async_write_ha_state()
 
@@ -98,6 +299,46 @@ class DiveraEntity(CoordinatorEntity[DiveraCoordinator]):
         """
         raise NotImplementedError
 
+    @callback
+    def _async_update_device_name(self, name: str) -> None:
+        """
+        Rename the device of the entity, e.g. after the vehicle name mode changed.
+
+        Args:
+            name (str): The new default name of the device.
+        """
+        if self.registry_entry is None or self.registry_entry.device_id is None:
+            return
+        dr.async_get(self.hass).async_update_device(
+            self.registry_entry.device_id, name=name
+        )
+
+    @property
+    def available(self) -> bool:
+        """
+        Return if the entity is available.
+
+        Stored data of a previous run stays available until a refresh succeeds.
+
+        Returns:
+            bool: True if the last refresh succeeded or stored data is shown.
+        """
+        return super().available or self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """
+        Return the state attributes of the entity.
+
+        Returns:
+            Mapping[str, Any] | None: The attributes, with ATTR_STALE while
+                stored data of a previous run is shown.
+        """
+        attributes = super().extra_state_attributes
+        if not self.coordinator.stale:
+            return attributes
+        return {**(attributes or {}), ATTR_STALE: True}
+
     @property
     def device_info(self) -> DeviceInfo:
         """
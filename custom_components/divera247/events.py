@@ -0,0 +1,192 @@
+"""Change Events Module for Divera 24/7 Integration.
+
+Compares two successive snapshots of a UCR and describes what changed as
+typed Home Assistant events, so automations can react to new alarms or
+status changes without diffing entity states.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterator, Mapping
+from typing import Any
+
+from .const import (
+    EVENT_ALARM_CLOSED,
+    EVENT_ALARM_NEW,
+    EVENT_ALARM_REOPENED,
+    EVENT_ALARM_UPDATED,
+    EVENT_CALENDAR_EVENT_NEW,
+    EVENT_HELPER_STATUS_CHANGED,
+    EVENT_NEWS_NEW,
+    EVENT_USER_STATUS_CHANGED,
+    EVENT_VEHICLE_STATUS_CHANGED,
+    SLICE_ALARM,
+    SLICE_EVENTS,
+    SLICE_HELPER,
+    SLICE_NEWS,
+    SLICE_USER_STATUS,
+    SLICE_VEHICLE,
+)
+from .snapshot import DiveraSection, DiveraSnapshot
+
+ChangeEvent = tuple[str, dict[str, Any]]
+"""An event type and its event data."""
+
+
+def diff_snapshots(
+    old: DiveraSnapshot, new: DiveraSnapshot, changed: Collection
+) -> list[ChangeEvent]:
+    """
+    Return the change events between two snapshots of the same UCR.
+
+    Only the slices listed in changed are compared (see
+    DiveraSnapshot.slices), so the cost grows with the number of changes,
+    not with the number of vehicles or helpers.
+
+    Args:
+        old (DiveraSnapshot): The previous snapshot.
+        new (DiveraSnapshot): The current snapshot.
+        changed (Collection): Keys of the slices that differ between them.
+
+    Returns:
+        list[ChangeEvent]: The events in a stable order: alarms (API order),
+            news, calendar events, user, vehicles and helpers.
+    """
+    events: list[ChangeEvent] = []
+    if SLICE_ALARM in changed:
+        events.extend(_alarm_events(old.alarms, new.alarms))
+    if SLICE_NEWS in changed:
+        events.extend(_new_items(EVENT_NEWS_NEW, old.news, new.news))
+    if SLICE_EVENTS in changed:
+        events.extend(_new_items(EVENT_CALENDAR_EVENT_NEW, old.events, new.events))
+    if SLICE_USER_STATUS in changed:
+        old_id = old.user_status.get("status_id")
+        new_id = new.user_status.get("status_id")
+        if old_id != new_id:
+            events.append(
+                (
+                    EVENT_USER_STATUS_CHANGED,
+                    {
+                        "old_status_id": old_id,
+                        "new_status_id": new_id,
+                        "new_status": (new.statuses.get(str(new_id)) or {}).get("name"),
+                    },
+                )
+            )
+
+    vehicle_ids = []
+    helper_keys = []
+    for key in changed:
+        if isinstance(key, tuple):
+            if key[0] == SLICE_VEHICLE:
+                vehicle_ids.append(key[1])
+            elif key[0] == SLICE_HELPER:
+                helper_keys.append(key[1])
+    for vehicle_id in sorted(vehicle_ids):
+        event = _vehicle_event(
+            vehicle_id, old.vehicles.get(vehicle_id), new.vehicles.get(vehicle_id)
+        )
+        if event is not None:
+            events.append(event)
+    for key in sorted(helper_keys):
+        event = _helper_event(
+            key, old.helpers_by_key.get(key), new.helpers_by_key.get(key)
+        )
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def _alarm_data(alarm: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the event data describing an alarm."""
+    return {
+        "alarm_id": alarm.get("id"),
+        "foreign_id": alarm.get("foreign_id"),
+        "title": alarm.get("title"),
+        "text": alarm.get("text"),
+        "address": alarm.get("address"),
+        "priority": alarm.get("priority"),
+        "closed": alarm.get("closed"),
+        "date": alarm.get("date"),
+        "ts_update": alarm.get("ts_update"),
+    }
+
+
+def _alarm_events(old: DiveraSection, new: DiveraSection) -> Iterator[ChangeEvent]:
+    """
+    Yield new, closed, reopened and updated alarms by id and ts_update.
+
+    Closing or reopening an alarm is reported as such, whether or not its
+    ts_update changed; changes of closed alarms are not reported.
+    """
+    old_items = old.items
+    for alarm_id in new.sorting:
+        alarm = new.items.get(alarm_id) or {}
+        previous = old_items.get(alarm_id)
+        if previous is None:
+            yield EVENT_ALARM_NEW, _alarm_data(alarm)
+        elif alarm.get("closed"):
+            if not previous.get("closed"):
+                yield EVENT_ALARM_CLOSED, _alarm_data(alarm)
+        elif previous.get("closed"):
+            yield EVENT_ALARM_REOPENED, _alarm_data(alarm)
+        elif alarm.get("ts_update") != previous.get("ts_update"):
+            yield EVENT_ALARM_UPDATED, _alarm_data(alarm)
+
+
+def _new_items(
+    event_type: str, old: DiveraSection, new: DiveraSection
+) -> Iterator[ChangeEvent]:
+    """Yield the items of a news or event section that are not in old."""
+    for item_id in new.sorting:
+        if item_id not in old.items:
+            item = new.items.get(item_id) or {}
+            yield (
+                event_type,
+                {"item_id": item.get("id", item_id), "title": item.get("title")},
+            )
+
+
+def _vehicle_event(
+    vehicle_id: str, old: Mapping | None, new: Mapping | None
+) -> ChangeEvent | None:
+    """Return the status change of a vehicle, None if its FMS status is unchanged."""
+    if not isinstance(old, Mapping) or not isinstance(new, Mapping):
+        return None
+    old_status = old.get("fmsstatus_id")
+    new_status = new.get("fmsstatus_id")
+    if old_status == new_status:
+        return None
+    return (
+        EVENT_VEHICLE_STATUS_CHANGED,
+        {
+            "vehicle_id": vehicle_id,
+            "name": new.get("shortname") or new.get("name") or new.get("fullname"),
+            "old_status": old_status,
+            "new_status": new_status,
+            "note": new.get("fmsstatus_note"),
+            "ts": new.get("fmsstatus_ts"),
+        },
+    )
+
+
+def _helper_event(
+    key: str, old: Mapping | None, new: Mapping | None
+) -> ChangeEvent | None:
+    """Return the status change of a helper, None if the status is unchanged."""
+    if not isinstance(old, Mapping) or not isinstance(new, Mapping):
+        return None
+    old_status = old.get("status")
+    new_status = new.get("status")
+    if old_status == new_status:
+        return None
+    name = f"{new.get('firstname', '')} {new.get('lastname', '')}".strip()
+    return (
+        EVENT_HELPER_STATUS_CHANGED,
+        {
+            "helper": key,
+            "name": name,
+            "old_status": old_status,
+            "new_status": new_status,
+        },
+    )
@@ -0,0 +1,166 @@
+"""Shared Fetcher Module for Divera 24/7 Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientSession
+
+from .const import DEFAULT_ALARMS_V2_ON_CHANGE, DIVERA_BASE_URL, PULL_BATCH_WINDOW
+from .divera247 import DiveraClient
+
+
+class DiveraFetcher:
+    """
+    Pulls the UCRs of one access key together.
+
+    pull/all returns one cluster per request, so every UCR still needs its
+    own request. The fetcher pulls the UCRs that are due within
+    PULL_BATCH_WINDOW seconds in one batch, hands each coordinator the result
+    of its UCR when its own timer fires, and lets the snapshots of all UCRs
+    share one copy of the user sections. A change pulled for a UCR is kept
+    until that UCR's coordinator collects it, however late it comes.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        accesskey: str,
+        base_url: str = DIVERA_BASE_URL,
+        alarms_v2_on_change: bool = DEFAULT_ALARMS_V2_ON_CHANGE,
+    ) -> None:
+        """
+        Initialize DiveraFetcher.
+
+        Args:
+            session (ClientSession): Client session for making HTTP requests.
+            accesskey (str): Access key for accessing Divera data.
+            base_url (str, optional): Base URL for Divera API. Defaults to DIVERA_BASE_URL.
+            alarms_v2_on_change (bool, optional): Passed on to the clients. Defaults to DEFAULT_ALARMS_V2_ON_CHANGE.
+        """
+        self._session = session
+        self._accesskey = accesskey
+        self._base_url = base_url
+        self._alarms_v2_on_change = alarms_v2_on_change
+        self._clients: dict[Any, DiveraClient] = {}
+        # Seconds until the next scheduled refresh, per UCR
+        self._due: dict[Any, Callable[[], float]] = {}
+        # Results of batches not yet collected by their UCR:
+        # (monotonic() the batch started, result)
+        self._results: dict[Any, tuple[float, bool | BaseException]] = {}
+        # UCRs whose snapshot changed since their coordinator last collected
+        # a result; cleared only by that coordinator, never on a timer
+        self._changed: set[Any] = set()
+        self._batch: asyncio.Task | None = None
+
+    def register(
+        self, ucr_id: Any, due: Callable[[], float] | None = None
+    ) -> DiveraClient:
+        """
+        Register a UCR and return its client.
+
+        Args:
+            ucr_id (Any): The UCR to pull.
+            due (Callable[[], float] | None, optional): Returns the seconds until
+                the UCR's next scheduled refresh. UCRs without it are only
+                pulled when they ask for it.
+
+        Returns:
+            DiveraClient: The client holding the data of the UCR.
+        """
+        client = self._clients.get(ucr_id)
+        if client is None:
+            client = self._clients[ucr_id] = DiveraClient(
+                self._session,
+                accesskey=self._accesskey,
+                base_url=self._base_url,
+                ucr_id=ucr_id,
+                alarms_v2_on_change=self._alarms_v2_on_change,
+            )
+        if due is not None:
+            self._due[ucr_id] = due
+        return client
+
+    def set_alarms_v2_on_change(self, alarms_v2_on_change: bool) -> None:
+        """
+        Change alarms_v2_on_change of all clients, registered or not.
+
+        Args:
+            alarms_v2_on_change (bool): Passed on to the clients.
+        """
+        self._alarms_v2_on_change = alarms_v2_on_change
+        for client in self._clients.values():
+            client.set_alarms_v2_on_change(alarms_v2_on_change)
+
+    async def async_pull(self, ucr_id: Any, force: bool = False) -> bool:
+        """
+        Pull the data of a UCR, together with the siblings that are due.
+
+        A result pulled for the UCR by a batch started within the last
+        PULL_BATCH_WINDOW seconds is returned without a new request. Older
+        results are pulled again; changes any batch applied to the client
+        since the UCR last collected a result are reported either way.
+
+        Args:
+            ucr_id (Any): A registered UCR.
+            force (bool, optional): Only use results of batches started after
+                this call, e.g. for a push. Defaults to False.
+
+        Returns:
+            bool: True if the snapshot of the UCR changed since the last call
+            for it returned.
+
+        Raises:
+            DiveraConnectionError: If an error occurs while connecting to the Divera API.
+            DiveraAuthError: If authentication fails while connecting to the Divera API.
+        """
+        called = monotonic()
+        while True:
+            pulled = self._results.pop(ucr_id, None)
+            if pulled is not None and (
+                pulled[0] >= called
+                or (not force and called - pulled[0] <= PULL_BATCH_WINDOW)
+            ):
+                if isinstance(pulled[1], BaseException):
+                    raise pulled[1]
+                changed = ucr_id in self._changed
+                self._changed.discard(ucr_id)
+                return changed
+            batch = self._batch
+            if batch is None:
+                batch = self._batch = asyncio.create_task(self._pull_batch(ucr_id))
+                batch.add_done_callback(self._batch_done)
+            # Joining a batch that did not include this UCR, or started before
+            # a forced call, loops once more and starts a batch of its own.
+            await asyncio.shield(batch)
+
+    def _batch_done(self, batch: asyncio.Task) -> None:
+        """Forget a finished batch so the next caller starts a new one."""
+        if self._batch is batch:
+            self._batch = None
+
+    async def _pull_batch(self, ucr_id: Any) -> None:
+        """Pull ucr_id and every sibling due within PULL_BATCH_WINDOW seconds."""
+        targets = [ucr_id] + [
+            other
+            for other, due in self._due.items()
+            if other != ucr_id and due() <= PULL_BATCH_WINDOW
+        ]
+        started = monotonic()
+        results = await asyncio.gather(
+            *(self._clients[target].pull_data() for target in targets),
+            return_exceptions=True,
+        )
+        reference = None
+        for target, result in zip(targets, results):
+            self._results[target] = (started, result)
+            if result is True:
+                self._changed.add(target)
+            client = self._clients[target]
+            if reference is None:
+                reference = client.get_snapshot()
+            elif result is True:
+                client.share_snapshot_sections(reference)
@@ -0,0 +1,361 @@
+"""History Module for Divera 24/7 Integration.
+
+The API only returns the current window of alarms, news and events. If
+enabled in the options, the history keeps every item seen in a snapshot in a SQLite file in the config
+directory, indexed by date, unit and group, so older items can still be
+queried by the get_history service and shown in the calendar.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime, timedelta
+import json
+import os
+import sqlite3
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_HISTORY,
+    DOMAIN,
+    HISTORY_DB_FILE,
+    HISTORY_KIND_ALARM,
+    HISTORY_KIND_EVENT,
+    HISTORY_KIND_NEWS,
+    HISTORY_QUERY_LIMIT,
+    HISTORY_RETENTION_DAYS,
+    LOGGER,
+)
+from .snapshot import DiveraSection, DiveraSnapshot
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS items (
+        kind TEXT NOT NULL,
+        ucr_id TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        date REAL,
+        end REAL,
+        title TEXT,
+        text TEXT,
+        address TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (kind, ucr_id, item_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS items_date ON items (kind, date)",
+    "CREATE INDEX IF NOT EXISTS items_ucr ON items (ucr_id, kind, date)",
+    """CREATE TABLE IF NOT EXISTS item_groups (
+        kind TEXT NOT NULL,
+        ucr_id TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        group_id TEXT NOT NULL,
+        PRIMARY KEY (kind, ucr_id, item_id, group_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS item_groups_group ON item_groups (group_id, kind)",
+)
+
+# Row of the items table and the group ids of the item
+_Row = tuple[tuple[Any, ...], tuple[str, ...]]
+
+
+@callback
+def async_get_history(hass: HomeAssistant) -> DiveraHistory:
+    """
+    Return the integration-wide history, creating it on first use.
+
+    Args:
+        hass (HomeAssistant): Home Assistant instance.
+
+    Returns:
+        DiveraHistory: The history shared by all config entries.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    history = domain_data.get(DATA_HISTORY)
+    if history is None:
+        history = domain_data[DATA_HISTORY] = DiveraHistory(
+            hass, hass.config.path(HISTORY_DB_FILE)
+        )
+    return history
+
+
+class DiveraHistory:
+    """
+    Alarms, news and events of all units, stored in SQLite.
+
+    The database is opened on first use. All access runs in the executor,
+    serialized by a lock; the event loop only diffs the snapshots.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """
+        Initialize DiveraHistory.
+
+        Args:
+            hass (HomeAssistant): Home Assistant instance.
+            path (str): Path of the SQLite file.
+        """
+        self._hass = hass
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+        @callback
+        def _async_stop(event: Event) -> None:
+            hass.async_add_executor_job(self.close)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+
+    @callback
+    def async_record(
+        self, ucr_id: Any, old: DiveraSnapshot | None, new: DiveraSnapshot
+    ) -> None:
+        """
+        Store the alarms, news and events of a snapshot that are new or changed.
+
+        Args:
+            ucr_id (Any): The UCR of the snapshots.
+            old (DiveraSnapshot | None): The previous snapshot, None to store all items.
+            new (DiveraSnapshot): The current snapshot.
+        """
+        rows = [
+            *_rows(HISTORY_KIND_ALARM, ucr_id, old and old.alarms, new.alarms),
+            *_rows(HISTORY_KIND_NEWS, ucr_id, old and old.news, new.news),
+            *_rows(HISTORY_KIND_EVENT, ucr_id, old and old.events, new.events),
+        ]
+        if rows:
+            self._hass.async_add_executor_job(self._write, rows)
+
+    async def async_query(
+        self,
+        kind: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        keyword: str | None = None,
+        ucr_id: Any = None,
+        group: Any = None,
+        limit: int = HISTORY_QUERY_LIMIT,
+    ) -> list[dict[str, Any]]:
+        """
+        Return stored items, newest first.
+
+        Alarms and news match if their date lies in the range; events match
+        if they overlap it.
+
+        Args:
+            kind (str): HISTORY_KIND_ALARM, HISTORY_KIND_NEWS or HISTORY_KIND_EVENT.
+            start (datetime | None, optional): Start of the range. Defaults to None (open).
+            end (datetime | None, optional): End of the range (exclusive). Defaults to None (open).
+            keyword (str | None, optional): Text the title, text or address must contain.
+            ucr_id (Any, optional): Only items of this UCR.
+            group (Any, optional): Only items addressed to this group id.
+            limit (int, optional): Maximum number of items, capped at HISTORY_QUERY_LIMIT.
+
+        Returns:
+            list[dict[str, Any]]: The raw items as pulled, with their ucr_id added.
+        """
+        return await self._hass.async_add_executor_job(
+            self._query,
+            kind,
+            start.timestamp() if start is not None else None,
+            end.timestamp() if end is not None else None,
+            keyword,
+            None if ucr_id is None else str(ucr_id),
+            None if group is None else str(group),
+            max(1, min(limit, HISTORY_QUERY_LIMIT)),
+        )
+
+    async def async_remove(self, ucr_ids: Iterable[Any]) -> None:
+        """
+        Delete the stored items of UCRs, e.g. of a removed config entry.
+
+        Args:
+            ucr_ids (Iterable[Any]): The UCRs whose items are deleted.
+        """
+        ucr_ids = [(str(ucr_id),) for ucr_id in ucr_ids]
+        if ucr_ids:
+            await self._hass.async_add_executor_job(self._delete, ucr_ids)
+
+    def close(self) -> None:
+        """Close the database (it is reopened on next use)."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, create the schema and purge expired items."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            purge_before = (
+                dt_util.utcnow() - timedelta(days=HISTORY_RETENTION_DAYS)
+            ).timestamp()
+            with connection:
+                connection.execute(
+                    "DELETE FROM item_groups WHERE (kind, ucr_id, item_id) IN"
+                    " (SELECT kind, ucr_id, item_id FROM items"
+                    " WHERE COALESCE(end, date) < ?)",
+                    (purge_before,),
+                )
+                connection.execute(
+                    "DELETE FROM items WHERE COALESCE(end, date) < ?", (purge_before,)
+                )
+            self._connection = connection
+        return self._connection
+
+    def _write(self, rows: list[_Row]) -> None:
+        """Insert or replace items and their groups in one transaction."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO items"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [row for row, _ in rows],
+                    )
+                    connection.executemany(
+                        "DELETE FROM item_groups"
+                        " WHERE kind = ? AND ucr_id = ? AND item_id = ?",
+                        [row[:3] for row, _ in rows],
+                    )
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO item_groups VALUES (?, ?, ?, ?)",
+                        [
+                            (*row[:3], group_id)
+                            for row, group_ids in rows
+                            for group_id in group_ids
+                        ],
+                    )
+            except sqlite3.Error as err:
+                LOGGER.error("Writing the Divera history failed: %s", err)
+
+    def _delete(self, ucr_ids: list[tuple[str]]) -> None:
+        """Delete the items and groups of UCRs in one transaction."""
+        with self._lock:
+            # Nothing to delete if the history was never used
+            if self._connection is None and not os.path.exists(self._path):
+                return
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "DELETE FROM item_groups WHERE ucr_id = ?", ucr_ids
+                    )
+                    connection.executemany(
+                        "DELETE FROM items WHERE ucr_id = ?", ucr_ids
+                    )
+            except sqlite3.Error as err:
+                LOGGER.error("Deleting from the Divera history failed: %s", err)
+
+    def _query(
+        self,
+        kind: str,
+        start: float | None,
+        end: float | None,
+        keyword: str | None,
+        ucr_id: str | None,
+        group: str | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Run a query of async_query in the executor."""
+        clauses = ["items.kind = ?"]
+        params: list[Any] = [kind]
+        if kind == HISTORY_KIND_EVENT:
+            if start is not None:
+                # Overlap, as in DiveraEventIndex.between
+                clauses.append(
+                    "(COALESCE(items.end, items.date) > ? OR items.date >= ?)"
+                )
+                params.extend((start, start))
+            if end is not None:
+                clauses.append("items.date < ?")
+                params.append(end)
+        else:
+            if start is not None:
+                clauses.append("items.date >= ?")
+                params.append(start)
+            if end is not None:
+                clauses.append("items.date < ?")
+                params.append(end)
+        if ucr_id is not None:
+            clauses.append("items.ucr_id = ?")
+            params.append(ucr_id)
+        if keyword:
+            pattern = "%{}%".format(
+                keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            clauses.append(
+                "(items.title LIKE ? ESCAPE '\\' OR items.text LIKE ? ESCAPE '\\'"
+                " OR items.address LIKE ? ESCAPE '\\')"
+            )
+            params.extend((pattern, pattern, pattern))
+        join = ""
+        if group is not None:
+            join = (
+                " JOIN item_groups ON item_groups.kind = items.kind"
+                " AND item_groups.ucr_id = items.ucr_id"
+                " AND item_groups.item_id = items.item_id"
+                " AND item_groups.group_id = ?"
+            )
+            params.insert(0, group)
+        sql = (
+            f"SELECT items.ucr_id, items.data FROM items{join}"
+            f" WHERE {' AND '.join(clauses)}"
+            " ORDER BY items.date DESC LIMIT ?"
+        )
+        params.append(limit)
+        with self._lock:
+            try:
+                cursor = self._connect().execute(sql, params)
+                return [
+                    {**json.loads(data), "ucr_id": row_ucr_id}
+                    for row_ucr_id, data in cursor.fetchall()
+                ]
+            except sqlite3.Error as err:
+                LOGGER.error("Querying the Divera history failed: %s", err)
+                return []
+
+
+def _rows(
+    kind: str, ucr_id: Any, old: DiveraSection | None, new: DiveraSection
+) -> Iterator[_Row]:
+    """Yield the rows of the items of new that are not in old or differ."""
+    old_items: Mapping[str, dict] = old.items if old is not None else {}
+    for item_id, item in new.items.items():
+        if not isinstance(item, dict) or old_items.get(item_id) == item:
+            continue
+        if kind == HISTORY_KIND_EVENT:
+            date, end = item.get("start"), item.get("end")
+        else:
+            date, end = item.get("date"), None
+        yield (
+            (
+                kind,
+                str(ucr_id),
+                str(item_id),
+                date,
+                end,
+                item.get("title"),
+                item.get("text"),
+                item.get("address"),
+                json.dumps(item),
+            ),
+            _group_ids(item.get("group")),
+        )
+
+
+def _group_ids(value: Any) -> tuple[str, ...]:
+    """Return the group ids of an item (list, dict keyed by id, or one id)."""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, Mapping):
+        value = value.keys()
+    elif not isinstance(value, (list, tuple)):
+        value = (value,)
+    return tuple(str(group_id) for group_id in value)
@@ -0,0 +1,131 @@
+"""Push Ingestion Module for Divera 24/7 Integration.
+
+Divera can call a webhook when an alarm is created or updated. The webhook
+registered here does not trust or parse the pushed alarm beyond finding out
+which unit it belongs to: it triggers an immediate refresh of the affected
+coordinators, so pushed and polled data take the same path.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from aiohttp.web import Request
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, INTEGRATION_FULL_NAME, LOGGER, PARAM_UCR
+from .coordinator import DiveraCoordinator
+
+
+def async_register_push(
+    hass: HomeAssistant, entry: ConfigEntry, webhook_id: str
+) -> CALLBACK_TYPE:
+    """
+    Register the push webhook of a config entry.
+
+    The webhook is unregistered again when the entry is unloaded.
+
+    Args:
+        hass (HomeAssistant): Home Assistant instance.
+        entry (ConfigEntry): The config entry whose coordinators are refreshed.
+        webhook_id (str): The secret id of the webhook.
+
+    Returns:
+        CALLBACK_TYPE: Unregisters the webhook before the entry is unloaded.
+    """
+
+    async def _async_handle_push(
+        hass: HomeAssistant, webhook_id: str, request: Request
+    ) -> None:
+        """Refresh the coordinators of the units a push belongs to."""
+        try:
+            payload = await request.json() if request.can_read_body else None
+        except ValueError:  # not JSON, refresh all units
+            payload = None
+        coordinators: Mapping[Any, DiveraCoordinator] = entry.runtime_data.coordinators
+        ucr_ids = push_targets(coordinators, request.query.get(PARAM_UCR), payload)
+        LOGGER.debug("Push received, refreshing UCR(s) %s", ucr_ids)
+        for ucr_id in ucr_ids:
+            # Debounced: a burst of pushes costs one immediate pull per unit
+            hass.async_create_task(coordinators[ucr_id].async_request_refresh())
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        INTEGRATION_FULL_NAME,
+        webhook_id,
+        _async_handle_push,
+        allowed_methods=("POST", "PUT"),
+    )
+
+    @callback
+    def _async_unregister() -> None:
+        webhook.async_unregister(hass, webhook_id)
+
+    entry.async_on_unload(_async_unregister)
+    return _async_unregister
+
+
+def push_targets(
+    coordinators: Mapping[Any, DiveraCoordinator],
+    ucr_param: str | None,
+    payload: Any,
+) -> list:
+    """
+    Select the coordinators a push has to refresh.
+
+    A ``ucr`` query parameter in the webhook URL wins; otherwise the
+    ``cluster_id`` of the pushed alarm is matched against the UCRs of the
+    entry. If neither identifies a unit, all units are refreshed.
+
+    Args:
+        coordinators (Mapping[Any, DiveraCoordinator]): Coordinators by UCR id.
+        ucr_param (str | None): The ``ucr`` query parameter of the push.
+        payload (Any): The decoded push body, if any.
+
+    Returns:
+        list: The UCR ids (keys of coordinators) to refresh.
+    """
+    by_str = {str(ucr_id): ucr_id for ucr_id in coordinators}
+    if ucr_param is not None and ucr_param in by_str:
+        return [by_str[ucr_param]]
+
+    cluster_id = _cluster_id(payload)
+    if cluster_id is not None:
+        matches = [
+            ucr_id
+            for ucr_id, coordinator in coordinators.items()
+            if _cluster_of(coordinator, ucr_id) == cluster_id
+        ]
+        if matches:
+            return matches
+    return list(coordinators)
+
+
+def _cluster_id(payload: Any) -> str | None:
+    """Return the cluster id of a pushed alarm (top level or under data)."""
+    for candidate in _candidates(payload):
+        cluster_id = candidate.get("cluster_id")
+        if cluster_id is not None:
+            return str(cluster_id)
+    return None
+
+
+def _candidates(payload: Any) -> Iterable[Mapping]:
+    """Yield the payload and its data section if they are objects."""
+    if isinstance(payload, dict):
+        yield payload
+        if isinstance(payload.get("data"), dict):
+            yield payload["data"]
+
+
+def _cluster_of(coordinator: DiveraCoordinator, ucr_id: Any) -> str | None:
+    """Return the cluster id of a UCR as str, None if not known yet."""
+    try:
+        return str(coordinator.divera_client.get_cluster_id_from_ucr(ucr_id))
+    except (AttributeError, KeyError, TypeError):
+        return None
@@ -0,0 +1,190 @@
+"""Recorder Module for Divera 24/7 Integration.
+
+Records the pull/all and /api/v2/alarms responses of a config entry, so the
+data shape and change sequence of a real unit can be replayed offline (see
+benchmarks/replay.py). The access key is removed from the recorded URLs, and
+secrets, personal data and coordinates are redacted from the bodies; the
+structure and sizes are kept.
+
+A recording is a gzip-compressed file of JSON lines: a header, then one line
+per response with the Unix time its request started, the URL without the
+access key, the status and the redacted body (null for 304 Not Modified,
+errors, and bodies equal to the previous one).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import gzip
+import json
+import os
+from typing import Any
+
+from yarl import URL
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    LOGGER,
+    RECORDING_COORDINATE_KEYS,
+    RECORDING_MAX_SIZE,
+    RECORDING_REDACT_KEYS,
+    STORE_REDACT_KEYS,
+)
+from .store import REDACTED
+from .utils import remove_accesskey_from_url
+
+RECORDING_VERSION = 1
+"""Version of the recording format, in the header line."""
+
+
+def redact_payload(value: Any) -> Any:
+    """
+    Return a copy of a response body with the recorded data redacted.
+
+    Strings under RECORDING_REDACT_KEYS and under keys containing one of
+    STORE_REDACT_KEYS are replaced by REDACTED, numbers under
+    RECORDING_COORDINATE_KEYS by 0. Other values keep their type.
+
+    Args:
+        value (Any): A decoded JSON body or a part of it.
+
+    Returns:
+        Any: The redacted copy.
+    """
+    if isinstance(value, Mapping):
+        redacted = {}
+        for key, item in value.items():
+            if isinstance(item, str) and item and _is_redacted(key):
+                redacted[key] = REDACTED
+            elif isinstance(item, (int, float)) and key in RECORDING_COORDINATE_KEYS:
+                redacted[key] = 0
+            else:
+                redacted[key] = redact_payload(item)
+        return redacted
+    if isinstance(value, list):
+        return [redact_payload(item) for item in value]
+    return value
+
+
+def _is_redacted(key: str) -> bool:
+    """Check whether the string value of a key is redacted."""
+    key = key.lower()
+    return key in RECORDING_REDACT_KEYS or any(
+        word in key for word in STORE_REDACT_KEYS
+    )
+
+
+def read_recording(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Read a recording (blocking).
+
+    Args:
+        path (str): The recording file.
+
+    Returns:
+        tuple[dict[str, Any], list[dict[str, Any]]]: The header and the
+            recorded responses in order.
+
+    Raises:
+        ValueError: If the file is no recording of a supported version.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("version") != RECORDING_VERSION:
+        raise ValueError(f"{path}: not a recording of version {RECORDING_VERSION}")
+    return lines[0], lines[1:]
+
+
+class DiveraRecorder:
+    """
+    Records the responses of the clients of a config entry to a file.
+
+    record() only queues a response; async_flush() redacts and writes the
+    queue in the executor, in order. The file stops growing once it exceeds
+    RECORDING_MAX_SIZE.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, path: str, max_size: int = RECORDING_MAX_SIZE
+    ) -> None:
+        """
+        Initialize DiveraRecorder.
+
+        Args:
+            hass (HomeAssistant): Home Assistant instance.
+            path (str): The recording file, appended to if it exists.
+            max_size (int, optional): Bytes after which recording stops. Defaults to RECORDING_MAX_SIZE.
+        """
+        self._hass = hass
+        self.path = path
+        self._max_size = max_size
+        self._pending: list[tuple[float, str, int, dict | None]] = []
+        self._lock = asyncio.Lock()
+        self.full = False
+
+    def record(
+        self,
+        path: str,
+        params: Mapping[str, Any],
+        requested: float,
+        status: int,
+        payload: dict | None,
+    ) -> None:
+        """
+        Queue a response for the next flush.
+
+        Args:
+            path (str): The API path of the request.
+            params (Mapping[str, Any]): Its query parameters; the access key
+                is removed.
+            requested (float): Unix time the request started.
+            status (int): The status of the response.
+            payload (dict | None): The decoded body, None if it was not
+                decoded (unchanged or an error).
+        """
+        if self.full:
+            return
+        url = remove_accesskey_from_url(URL(path).with_query(params))
+        self._pending.append((requested, url, status, payload))
+
+    async def async_flush(self) -> None:
+        """Write the queued responses in the executor."""
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            await self._hass.async_add_executor_job(self._write, pending)
+
+    def _write(self, pending: list[tuple[float, str, int, dict | None]]) -> None:
+        """Redact and append responses to the file (blocking)."""
+        lines = []
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            header = {"version": RECORDING_VERSION, "created": dt_util.utcnow()}
+            lines.append(json_dumps(header))
+        for requested, url, status, payload in pending:
+            body = None if payload is None else redact_payload(payload)
+            lines.append(
+                json_dumps(
+                    {
+                        "time": round(requested, 3),
+                        "url": url,
+                        "status": status,
+                        "body": body,
+                    }
+                )
+            )
+        # Every flush appends a gzip member; readers see one stream
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        if os.path.getsize(self.path) >= self._max_size:
+            self.full = True
+            LOGGER.warning(
+                "Recording %s reached %d bytes, no more responses are recorded",
+                self.path,
+                self._max_size,
+            )
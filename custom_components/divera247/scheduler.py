@@ -0,0 +1,216 @@
+"""Poll Scheduler Module for Divera 24/7 Integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import heapq
+from itertools import count
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_SCHEDULER,
+    DOMAIN,
+    LOGGER,
+    POLL_ALIGN_TOLERANCE,
+    POLL_BUDGET_BURST,
+    POLL_BUDGET_RATE,
+)
+
+
+def async_get_scheduler(hass: HomeAssistant) -> DiveraPollScheduler:
+    """
+    Return the integration-wide poll scheduler, creating it on first use.
+
+    Args:
+        hass (HomeAssistant): Home Assistant instance.
+
+    Returns:
+        DiveraPollScheduler: The scheduler shared by all config entries.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_SCHEDULER] = DiveraPollScheduler()
+    return scheduler
+
+
+@dataclass(order=True, slots=True)
+class _Waiter:
+    """A request waiting for budget, ordered by priority, then arrival."""
+
+    priority: int
+    seq: int
+    group: str = field(compare=False)
+    ucr_id: Any = field(compare=False)
+    since: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class DiveraPollScheduler:
+    """
+    Integration-wide gate for the polls of all config entries.
+
+    Polls of different groups (config entries) are spread evenly across the
+    interval: every group gets a phase, and coordinators schedule their next
+    refresh at the next occurrence of it (see align), which also keeps them
+    from drifting by the duration of each refresh. Every request of a poll
+    draws one token from a bucket of POLL_BUDGET_RATE requests per second
+    (bursts up to POLL_BUDGET_BURST), so a batch pulling several units, or
+    pull/all together with /api/v2/alarms, costs one token per request;
+    when the budget is exhausted, waiting requests are served by priority.
+    """
+
+    def __init__(
+        self, rate: float = POLL_BUDGET_RATE, burst: int = POLL_BUDGET_BURST
+    ) -> None:
+        """
+        Initialize DiveraPollScheduler.
+
+        Args:
+            rate (float, optional): Tokens added per second. Defaults to POLL_BUDGET_RATE.
+            burst (int, optional): Capacity of the bucket. Defaults to POLL_BUDGET_BURST.
+        """
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled = monotonic()
+        self._epoch = self._refilled
+        self._groups: list[str] = []
+        self._waiters: list[_Waiter] = []
+        self._seq = count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def register(self, group: str) -> None:
+        """
+        Register a group of polls (a config entry).
+
+        The phases are spread over all registered groups, so they shift when
+        groups come and go.
+
+        Args:
+            group (str): The group, e.g. the config entry id.
+        """
+        if group not in self._groups:
+            self._groups.append(group)
+
+    def unregister(self, group: str) -> None:
+        """
+        Remove a group.
+
+        Args:
+            group (str): The group passed to register.
+        """
+        if group in self._groups:
+            self._groups.remove(group)
+
+    def align(self, group: str, interval: float) -> float:
+        """
+        Return the delay until the next poll of a group that polls every interval.
+
+        The delay ends at the next occurrence of the group's phase, i.e. at
+        ``index / len(groups) * interval`` within each interval, so it never
+        exceeds the interval; the first poll after setup or an options change
+        may come sooner. A phase closer than POLL_ALIGN_TOLERANCE is the one
+        just polled for, and the poll waits one interval instead.
+
+        Args:
+            group (str): The group of the poll.
+            interval (float): The interval the group polls at.
+
+        Returns:
+            float: The delay in seconds, interval if the group is unknown.
+        """
+        if group not in self._groups:
+            return interval
+        phase = self._groups.index(group) / len(self._groups) * interval
+        delay = (phase - (monotonic() - self._epoch)) % interval
+        if delay < min(POLL_ALIGN_TOLERANCE, interval / 2):
+            return interval
+        return delay
+
+    async def async_acquire(self, group: str, ucr_id: Any, priority: int) -> None:
+        """
+        Wait until the request budget allows a request.
+
+        Args:
+            group (str): The group of the request.
+            ucr_id (Any): The UCR of the request (for the queue state only).
+            priority (int): Lower is served first, see POLL_PRIORITY_*.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        waiter = _Waiter(
+            priority,
+            next(self._seq),
+            group,
+            ucr_id,
+            monotonic(),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        LOGGER.debug("Request budget exhausted, queued: %s", self.queue_state())
+        self._dispatch()
+        await waiter.future
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._refilled) * self._rate
+        )
+        self._refilled = now
+
+    def _on_timer(self) -> None:
+        """Dispatch once the next token is due."""
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Release waiting requests while tokens are available."""
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():  # cancelled while waiting
+                continue
+            self._tokens -= 1
+            waiter.future.set_result(None)
+        if self._waiters and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                (1 - self._tokens) / self._rate, self._on_timer
+            )
+
+    def queue_state(self) -> dict[str, Any]:
+        """
+        Return the state of the scheduler for debugging and diagnostics.
+
+        Returns:
+            dict[str, Any]: Budget, the phase of each group and the waiting requests.
+        """
+        self._refill()
+        now = monotonic()
+        return {
+            "tokens": round(self._tokens, 2),
+            "rate": self._rate,
+            "burst": self._burst,
+            "groups": {
+                # Phase as a fraction of the interval
+                group: round(index / len(self._groups), 3)
+                for index, group in enumerate(self._groups)
+            },
+            "waiting": [
+                {
+                    "group": waiter.group,
+                    "ucr_id": waiter.ucr_id,
+                    "priority": waiter.priority,
+                    "waiting_for": round(now - waiter.since, 1),
+                }
+                for waiter in sorted(self._waiters)
+                if not waiter.future.done()
+            ],
+        }
@@ -13,9 +13,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import DiveraConfigEntry, DiveraCoordinator
-from .const import DOMAIN
+from .const import DOMAIN, SLICE_USER_STATUS
 from .divera247 import DiveraClient, DiveraError
-from .entity import DiveraEntity, DiveraEntityDescription
+from .entity import DiveraEntity, DiveraEntityDescription, async_add_divera_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -48,6 +48,7 @@ SENSORS: tuple[DiveraSelectEntityDescription, ...] = (
         options_fn=lambda divera: divera.get_all_state_name(),
         attribute_fn=lambda divera: divera.get_user_state_attributes(),
         select_option_fn=lambda divera, option: divera.set_user_state_by_name(option),
+        data_slice=SLICE_USER_STATUS,
     ),
 )
 
@@ -65,13 +66,13 @@ async def async_setup_entry(
         entry (DiveraConfigEntry): Configuration entry for the integration.
         async_add_entities (AddEntitiesCallback): Function to add entities.
     """
-    coordinators = entry.runtime_data.coordinators
-    entities: list[DiveraSelectEntity] = [
-        DiveraSelectEntity(coordinators[ucr_id], description)
-        for ucr_id in coordinators
-        for description in SENSORS
-    ]
-    async_add_entities(entities, False)
+    async_add_divera_entities(
+        entry,
+        async_add_entities,
+        lambda coordinator: [
+            DiveraSelectEntity(coordinator, description) for description in SENSORS
+        ],
+    )
 
 
 class DiveraSelectEntity(DiveraEntity, SelectEntity):
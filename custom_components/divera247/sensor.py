@@ -6,8 +6,15 @@ from dataclasses import dataclass
 from typing import Any
 import html
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
@@ -16,7 +23,10 @@ from . import DiveraConfigEntry
 from .coordinator import DiveraCoordinator
 from .divera247 import DiveraClient
 from .const import (
+    ALARM_LATENCY_BUCKETS,
+    CONF_STATUS_SENSORS,
     CONF_VEHICLE_NAME_MODE,
+    DEFAULT_STATUS_SENSORS,
     VEHICLE_NAME_MODE_AUTO,
     VEHICLE_NAME_MODE_SHORT,
     VEHICLE_NAME_MODE_NAME,
@@ -24,8 +34,29 @@ from .const import (
     DOMAIN,
     DIVERA_BASE_URL,
     DIVERA_GMBH,
+    SLICE_ALARM,
+    SLICE_HELPER,
+    SLICE_HELPERS,
+    SLICE_VEHICLE,
+    SIGNAL_OPTIONS_UPDATED,
+)
+from .entity import (
+    DiveraEntity,
+    DiveraEntityDescription,
+    async_add_divera_entities,
+    async_track_divera_entities,
+)
+from .snapshot import helper_key
+from .telemetry import (
+    METRIC_ALARM_LATENCY,
+    METRIC_ALARM_NETWORK_TIME,
+    METRIC_ALARM_POLL_WAIT,
+    METRIC_ALARM_PROCESSING_TIME,
+    METRIC_DECODE_TIME,
+    METRIC_REQUEST_TIME,
+    METRIC_RESPONSE_SIZE,
+    METRIC_UPDATE_TIME,
 )
-from .entity import DiveraEntity, DiveraEntityDescription
 
 
 def _safe_string(value: Any) -> str:
@@ -142,6 +173,27 @@ class DiveraVehicleSensorEntity(DiveraEntity, SensorEntity):
                 name = None
         return name
 
+    async def async_added_to_hass(self) -> None:
+        """Follow vehicle name mode changes applied without reload."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self.platform.config_entry.entry_id),
+                self._async_options_updated,
+            )
+        )
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Recompute the device name with the current vehicle name mode."""
+        self._name_mode = self.platform.config_entry.options.get(
+            CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODE_AUTO
+        )
+        self._update_vehicle_display_name()
+        self._async_update_device_name(self._vehicle_display_name)
+        self.async_write_ha_state()
+
     def _update_vehicle_display_name(self):
         client = self.coordinator.data
         name = self._compute_display_name(client)
@@ -210,7 +262,7 @@ class DiveraHelperSensorEntity(DiveraEntity, SensorEntity):
 
     Attributes:
         entity_description (DiveraHelperEntityDescription): Description of the sensor.
-        _helper (dict): A dictionary with the helper's data.
+        _helper (dict): A dictionary with the helper's data, as of the last pull.
     """
 
     entity_description: DiveraHelperEntityDescription
@@ -229,8 +281,15 @@ class DiveraHelperSensorEntity(DiveraEntity, SensorEntity):
             helper (dict): A dictionary with the helper's data.
             description (DiveraHelperEntityDescription): Description of the sensor.
         """
-        super().__init__(coordinator, description)
+        # Set before base __init__, which triggers _divera_update
         self._helper = helper
+        self._helper_key = helper_key(helper)
+        super().__init__(
+            coordinator, description, data_slice=(SLICE_HELPER, self._helper_key)
+        )
+        self._attr_unique_id = "_".join(
+            [DOMAIN, str(self._ucr_id), f"helper_{self._helper_key}", description.key]
+        )
 
     def _divera_update(self) -> None:
         """
@@ -238,6 +297,10 @@ class DiveraHelperSensorEntity(DiveraEntity, SensorEntity):
 
         This method is called to update the state of the entity based on the latest data from the coordinator.
         """
+        client = self.coordinator.data
+        helper = client.get_helper(self._helper_key) if client else None
+        if helper is not None:
+            self._helper = helper
         self._attr_native_value = self.entity_description.value_fn(
             self.coordinator.data, self._helper
         )
@@ -269,6 +332,7 @@ STATUS_SENSORS: tuple[DiveraStatusCountEntityDescription, ...] = (
         translation_key="status_active",
         icon="mdi:check-circle",
         attribute_fn=lambda divera: {},
+        data_slice=SLICE_HELPERS,
         status="active",
     ),
     DiveraStatusCountEntityDescription(
@@ -276,6 +340,7 @@ STATUS_SENSORS: tuple[DiveraStatusCountEntityDescription, ...] = (
         translation_key="status_inactive",
         icon="mdi:close-circle",
         attribute_fn=lambda divera: {},
+        data_slice=SLICE_HELPERS,
         status="inactive",
     ),
     DiveraStatusCountEntityDescription(
@@ -283,6 +348,7 @@ STATUS_SENSORS: tuple[DiveraStatusCountEntityDescription, ...] = (
         translation_key="status_on_duty",
         icon="mdi:briefcase",
         attribute_fn=lambda divera: {},
+        data_slice=SLICE_HELPERS,
         status="on_duty",
     ),
 )
@@ -311,8 +377,9 @@ class DiveraStatusCountSensorEntity(DiveraEntity, SensorEntity):
             coordinator (DiveraCoordinator): The coordinator for the integration.
             description (DiveraStatusCountEntityDescription): Description of the sensor.
         """
-        super().__init__(coordinator, description)
+        # Set before base __init__, which triggers _divera_update
         self._status = description.status
+        super().__init__(coordinator, description)
 
     def _divera_update(self) -> None:
         """
@@ -321,9 +388,25 @@ class DiveraStatusCountSensorEntity(DiveraEntity, SensorEntity):
         This method is called to update the state of the entity based on the latest data from the coordinator.
         """
         client = self.coordinator.data
-        helpers = client.get_helpers() if client else []
-        count = sum(1 for helper in helpers if helper.get("status") == self._status)
-        self._attr_native_value = count
+        if client is None:
+            self._attr_native_value = 0
+            self._attr_extra_state_attributes = {}
+            return
+        # Counted once per pull for all status sensors
+        counts = client.get_helper_counts()
+        self._attr_native_value = counts.count(self._status)
+        self._attr_extra_state_attributes = {
+            "groups": {
+                client.get_group_name_by_id(group_id) or group_id: group[self._status]
+                for group_id, group in counts.by_group.items()
+                if self._status in group
+            },
+            "qualifications": {
+                qualification_id: qualification[self._status]
+                for qualification_id, qualification in counts.by_qualification.items()
+                if self._status in qualification
+            },
+        }
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -335,6 +418,16 @@ class DiveraStatusOverviewEntityDescription(
     value_fn: Callable[[DiveraClient], Any]
 
 
+STATUS_OVERVIEW_SENSOR = DiveraStatusOverviewEntityDescription(
+    key="status_overview",
+    translation_key="status_overview",
+    icon="mdi:account-group",
+    attribute_fn=lambda divera: {},
+    value_fn=lambda divera: divera.get_helper_counts().total,
+    data_slice=SLICE_HELPERS,
+)
+
+
 class DiveraStatusOverviewSensorEntity(DiveraEntity, SensorEntity):
     """Aggregated sensor with helper status counts as attributes."""
 
@@ -346,14 +439,10 @@ class DiveraStatusOverviewSensorEntity(DiveraEntity, SensorEntity):
             self._attr_native_value = None
             self._attr_extra_state_attributes = {}
             return
-        helpers = client.get_helpers()
-        counts: dict[str, int] = {}
-        for helper in helpers:
-            status = helper.get("status", "unknown")
-            counts[status] = counts.get(status, 0) + 1
+        counts = client.get_helper_counts()
         # Native value = total helpers; attributes per status
-        self._attr_native_value = len(helpers)
-        self._attr_extra_state_attributes = counts
+        self._attr_native_value = self.entity_description.value_fn(client)
+        self._attr_extra_state_attributes = dict(counts.by_status)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -397,6 +486,119 @@ class DiveraAlarmAddressSensorEntity(DiveraEntity, SensorEntity):
             self._attr_extra_state_attributes = {}
 
 
+@dataclass(frozen=True, kw_only=True)
+class DiveraTelemetryEntityDescription(
+    DiveraEntityDescription, SensorEntityDescription
+):
+    """
+    Description of a telemetry sensor.
+
+    Attributes:
+        metric (str): The telemetry metric (see METRICS in telemetry).
+    """
+
+    metric: str
+
+
+TELEMETRY_SENSORS: tuple[DiveraTelemetryEntityDescription, ...] = tuple(
+    DiveraTelemetryEntityDescription(
+        key=f"telemetry_{metric}",
+        translation_key=f"telemetry_{metric}",
+        icon=icon,
+        attribute_fn=lambda divera: {},
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=unit,
+        suggested_display_precision=precision,
+        metric=metric,
+    )
+    for metric, icon, device_class, unit, precision in (
+        (
+            METRIC_REQUEST_TIME,
+            "mdi:timer-outline",
+            SensorDeviceClass.DURATION,
+            UnitOfTime.MILLISECONDS,
+            0,
+        ),
+        (
+            METRIC_RESPONSE_SIZE,
+            "mdi:file-download-outline",
+            SensorDeviceClass.DATA_SIZE,
+            UnitOfInformation.BYTES,
+            0,
+        ),
+        (
+            METRIC_DECODE_TIME,
+            "mdi:code-json",
+            SensorDeviceClass.DURATION,
+            UnitOfTime.MILLISECONDS,
+            1,
+        ),
+        (
+            METRIC_UPDATE_TIME,
+            "mdi:update",
+            SensorDeviceClass.DURATION,
+            UnitOfTime.MILLISECONDS,
+            1,
+        ),
+        (
+            METRIC_ALARM_LATENCY,
+            "mdi:timer-alert-outline",
+            SensorDeviceClass.DURATION,
+            UnitOfTime.SECONDS,
+            0,
+        ),
+    )
+)
+
+# Breakdown of the alarm latency shown by its sensor
+ALARM_LATENCY_PARTS: dict[str, str] = {
+    "poll_wait": METRIC_ALARM_POLL_WAIT,
+    "network_time": METRIC_ALARM_NETWORK_TIME,
+    "processing_time": METRIC_ALARM_PROCESSING_TIME,
+}
+
+
+class DiveraTelemetrySensorEntity(DiveraEntity, SensorEntity):
+    """
+    Diagnostic sensor showing the p95 of a telemetry metric of one UCR.
+
+    The window statistics (count, last, p50, p95, p99, max) are attributes;
+    the alarm latency adds its histogram and the poll wait, network and
+    processing time it is made of.
+    The sensor polls the telemetry itself, since unchanged pulls do not
+    update the coordinator listeners.
+    """
+
+    entity_description: DiveraTelemetryEntityDescription
+
+    @property
+    def should_poll(self) -> bool:
+        """Poll the telemetry (it changes with every request)."""
+        return True
+
+    async def async_update(self) -> None:
+        """Read the telemetry; unlike CoordinatorEntity, no refresh is requested."""
+        self._divera_update()
+
+    def _divera_update(self) -> None:  # noqa: D401
+        telemetry = self.coordinator.telemetry
+        if telemetry is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        metric = self.entity_description.metric
+        stats = telemetry.stats(metric)
+        self._attr_native_value = stats["p95"]
+        if metric == METRIC_ALARM_LATENCY:
+            stats["histogram"] = telemetry.histogram(metric, ALARM_LATENCY_BUCKETS)
+            for name, part in ALARM_LATENCY_PARTS.items():
+                part_stats = telemetry.stats(part)
+                stats[name] = {key: part_stats[key] for key in ("last", "p50", "p95")}
+        self._attr_extra_state_attributes = stats
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: DiveraConfigEntry,
@@ -410,101 +612,126 @@ async def async_setup_entry(
         entry (DiveraConfigEntry): Configuration entry for the integration.
         async_add_entities (AddEntitiesCallback): Function to add entities.
     """
-    coordinators = entry.runtime_data.coordinators
-    entities: list[SensorEntity] = []
 
-    # Create individual sensors for each helper (name and status)
-    for ucr_id, coordinator in coordinators.items():
-        client = coordinator.data
-        if client is None:
-            continue
-        helpers = client.get_helpers()
-        for helper in helpers:
-            for description in HELPER_SENSORS:
-                entities.append(
-                    DiveraHelperSensorEntity(coordinator, helper, description)
-                )
-
-        # Vehicle sensors
-        try:
-            vehicle_ids = client.get_vehicle_id_list()
-        except Exception:
-            vehicle_ids = []
-        # Determine name mode once per entry
+    def _helper_entities(
+        coordinator: DiveraCoordinator, key: str
+    ) -> list[SensorEntity]:
+        # Create individual sensors for each helper (name and status)
+        helper = coordinator.data.get_helper(key) or {}
+        return [
+            DiveraHelperSensorEntity(coordinator, helper, description)
+            for description in HELPER_SENSORS
+        ]
+
+    def _vehicle_entities(
+        coordinator: DiveraCoordinator, vid: str
+    ) -> list[SensorEntity]:
+        # Current name mode: options may change without reload
         mode = entry.options.get(CONF_VEHICLE_NAME_MODE, VEHICLE_NAME_MODE_AUTO)
-        for vid in vehicle_ids:
-            # Main vehicle status sensor
-            description = DiveraVehicleEntityDescription(
-                key=f"vehicle_{vid}_state",
-                translation_key="vehicle",  # uses sensor.vehicle translation
-                icon="mdi:truck-outline",
-                attribute_fn=(
-                    lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid)
-                ),
-                value_fn=(lambda divera, _vid=vid: divera.get_vehicle_state(_vid)),
-                name_mode=mode,
-            )
-            entities.append(DiveraVehicleSensorEntity(coordinator, vid, description))
-
-            # Additional attribute sensors for each vehicle
-            # Location sensor removed to avoid duplicate with device_tracker
-
-            # OPTA sensor
-            opta_desc = DiveraVehicleEntityDescription(
-                key=f"vehicle_{vid}_opta",
-                translation_key="vehicle_opta",
-                icon="mdi:radio-tower",
-                attribute_fn=(lambda divera, _vid=vid: {}),
-                value_fn=(
-                    lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get(
-                        "opta"
-                    )
-                ),
-                name_mode=mode,
-            )
-            entities.append(DiveraVehicleSensorEntity(coordinator, vid, opta_desc))
-
-            # ISSI sensor
-            issi_desc = DiveraVehicleEntityDescription(
-                key=f"vehicle_{vid}_issi",
-                translation_key="vehicle_issi",
-                icon="mdi:identifier",
-                attribute_fn=(lambda divera, _vid=vid: {}),
-                value_fn=(
-                    lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get(
-                        "issi"
-                    )
-                ),
-                name_mode=mode,
-            )
-            entities.append(DiveraVehicleSensorEntity(coordinator, vid, issi_desc))
-
-            # Vehicle number sensor
-            number_desc = DiveraVehicleEntityDescription(
-                key=f"vehicle_{vid}_number",
-                translation_key="vehicle_number",
-                icon="mdi:train-car-box",
-                attribute_fn=(lambda divera, _vid=vid: {}),
-                value_fn=(
-                    lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get(
-                        "number"
-                    )
-                ),
-                name_mode=mode,
-            )
-            entities.append(DiveraVehicleSensorEntity(coordinator, vid, number_desc))
-
-    # Intentionally omit helper count sensors and overview per user request
+        entities: list[SensorEntity] = []
+        # Main vehicle status sensor
+        description = DiveraVehicleEntityDescription(
+            key=f"vehicle_{vid}_state",
+            translation_key="vehicle",  # uses sensor.vehicle translation
+            icon="mdi:truck-outline",
+            attribute_fn=(lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid)),
+            value_fn=(lambda divera, _vid=vid: divera.get_vehicle_state(_vid)),
+            name_mode=mode,
+            data_slice=(SLICE_VEHICLE, vid),
+        )
+        entities.append(DiveraVehicleSensorEntity(coordinator, vid, description))
+
+        # Additional attribute sensors for each vehicle
+        # Location sensor removed to avoid duplicate with device_tracker
+
+        # OPTA sensor
+        opta_desc = DiveraVehicleEntityDescription(
+            key=f"vehicle_{vid}_opta",
+            translation_key="vehicle_opta",
+            icon="mdi:radio-tower",
+            attribute_fn=(lambda divera, _vid=vid: {}),
+            value_fn=(
+                lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get("opta")
+            ),
+            name_mode=mode,
+            data_slice=(SLICE_VEHICLE, vid),
+        )
+        entities.append(DiveraVehicleSensorEntity(coordinator, vid, opta_desc))
+
+        # ISSI sensor
+        issi_desc = DiveraVehicleEntityDescription(
+            key=f"vehicle_{vid}_issi",
+            translation_key="vehicle_issi",
+            icon="mdi:identifier",
+            attribute_fn=(lambda divera, _vid=vid: {}),
+            value_fn=(
+                lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get("issi")
+            ),
+            name_mode=mode,
+            data_slice=(SLICE_VEHICLE, vid),
+        )
+        entities.append(DiveraVehicleSensorEntity(coordinator, vid, issi_desc))
+
+        # Vehicle number sensor
+        number_desc = DiveraVehicleEntityDescription(
+            key=f"vehicle_{vid}_number",
+            translation_key="vehicle_number",
+            icon="mdi:train-car-box",
+            attribute_fn=(lambda divera, _vid=vid: {}),
+            value_fn=(
+                lambda divera, _vid=vid: divera.get_vehicle_attributes(_vid).get(
+                    "number"
+                )
+            ),
+            name_mode=mode,
+            data_slice=(SLICE_VEHICLE, vid),
+        )
+        entities.append(DiveraVehicleSensorEntity(coordinator, vid, number_desc))
+        return entities
 
-    # Add last alarm address sensor per coordinator
-    for ucr_id, coordinator in coordinators.items():
+    def _entities(coordinator: DiveraCoordinator) -> list[SensorEntity]:
+        # Last alarm address sensor
         description = DiveraAlarmAddressEntityDescription(
             key="last_alarm_address",
             translation_key="alarm_address",
             icon="mdi:map-marker",
             attribute_fn=lambda divera: divera.get_last_alarm_attributes(),
             value_fn=lambda divera: divera.get_last_alarm_attributes().get("address"),
+            data_slice=SLICE_ALARM,
         )
-        entities.append(DiveraAlarmAddressSensorEntity(coordinator, description))
-
-    async_add_entities(entities, False)
+        entities: list[SensorEntity] = [
+            DiveraAlarmAddressSensorEntity(coordinator, description)
+        ]
+        # Only with the status sensors option: large units have many helpers
+        if entry.options.get(CONF_STATUS_SENSORS, DEFAULT_STATUS_SENSORS):
+            entities.extend(
+                DiveraStatusCountSensorEntity(coordinator, description)
+                for description in STATUS_SENSORS
+            )
+            entities.append(
+                DiveraStatusOverviewSensorEntity(coordinator, STATUS_OVERVIEW_SENSOR)
+            )
+        # Only with the telemetry option: coordinators without it measure nothing
+        if coordinator.telemetry is not None:
+            entities.extend(
+                DiveraTelemetrySensorEntity(coordinator, description)
+                for description in TELEMETRY_SENSORS
+            )
+        return entities
+
+    # Helpers and vehicles come and go with the pulled data
+    async_track_divera_entities(
+        entry,
+        async_add_entities,
+        SLICE_HELPER,
+        lambda client: (helper_key(helper) for helper in client.get_helpers()),
+        _helper_entities,
+    )
+    async_track_divera_entities(
+        entry,
+        async_add_entities,
+        SLICE_VEHICLE,
+        lambda client: client.get_vehicle_id_list(),
+        _vehicle_entities,
+    )
+    async_add_divera_entities(entry, async_add_entities, _entities)
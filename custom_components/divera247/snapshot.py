@@ -0,0 +1,545 @@
+"""Snapshot Module for Divera 24/7 Integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import datetime, tzinfo
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    SLICE_ALARM,
+    SLICE_EVENTS,
+    SLICE_HELPER,
+    SLICE_HELPERS,
+    SLICE_NEWS,
+    SLICE_USER_STATUS,
+    SLICE_VEHICLE,
+)
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Sections of pull/all that are the same for every UCR of a user
+_USER_FIELDS = (
+    "user",
+    "user_status",
+    "ucrs",
+    "ucr_default",
+    "ucr_active",
+    "cluster_name_by_ucr",
+)
+
+
+def _mapping(value: Any) -> Mapping[str, Any]:
+    """Return a read-only view of a payload dict (empty view for anything else)."""
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    return _EMPTY
+
+
+@dataclass(frozen=True, slots=True)
+class DiveraSection:
+    """
+    Ordered section of the pull/all payload (alarms, news or events).
+
+    Attributes:
+        sorting (tuple[str, ...]): Item ids in API order (newest first), as strings.
+        items (Mapping[str, dict]): Raw items keyed by their id.
+    """
+
+    sorting: tuple[str, ...]
+    items: Mapping[str, dict]
+
+    @classmethod
+    def from_payload(cls, section: Any) -> DiveraSection:
+        """
+        Build a section from a raw ``{"sorting": [...], "items": {...}}`` block.
+
+        Args:
+            section (Any): The raw section of the pull/all payload.
+
+        Returns:
+            DiveraSection: The section, empty when the block is missing.
+        """
+        if not isinstance(section, dict):
+            return cls((), _EMPTY)
+        sorting = section.get("sorting") or ()
+        return cls(
+            tuple(str(item_id) for item_id in sorting),
+            _mapping(section.get("items")),
+        )
+
+    def first(self) -> dict | None:
+        """Return the first (most recent) item, or None if the section is empty."""
+        if not self.sorting:
+            return None
+        return self.items.get(self.sorting[0], {})
+
+    def __iter__(self):
+        """Iterate over the items in API order."""
+        items = self.items
+        for item_id in self.sorting:
+            yield items.get(item_id, {})
+
+
+@dataclass(frozen=True, slots=True)
+class HelperCounts:
+    """
+    Helper counts by status, built in one pass over the helpers of a snapshot.
+
+    Statuses, groups and qualifications are keyed as strings; helpers
+    without a status count as "unknown".
+
+    Attributes:
+        total (int): Number of helpers.
+        by_status (Mapping[str, int]): Helpers per status.
+        by_group (Mapping[str, Mapping[str, int]]): Helpers per status, by group id.
+        by_qualification (Mapping[str, Mapping[str, int]]): Helpers per status,
+            by qualification id.
+    """
+
+    total: int = 0
+    by_status: Mapping[str, int] = _EMPTY
+    by_group: Mapping[str, Mapping[str, int]] = _EMPTY
+    by_qualification: Mapping[str, Mapping[str, int]] = _EMPTY
+
+    def count(
+        self, status: str, group: str | None = None, qualification: str | None = None
+    ) -> int:
+        """
+        Return the number of helpers with a status.
+
+        Args:
+            status (str): The status.
+            group (str | None, optional): Only count helpers of this group id.
+            qualification (str | None, optional): Only count helpers with this
+                qualification id. Ignored if group is given.
+
+        Returns:
+            int: The number of helpers.
+        """
+        if group is not None:
+            return self.by_group.get(str(group), _EMPTY).get(status, 0)
+        if qualification is not None:
+            return self.by_qualification.get(str(qualification), _EMPTY).get(status, 0)
+        return self.by_status.get(status, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class DiveraSnapshot:
+    """
+    Immutable view of one pull/all response.
+
+    Built once per pull in DiveraClient.pull_data so the getters read
+    pre-extracted sections instead of re-walking the nested payload on every
+    entity update.
+
+    Attributes:
+        user (Mapping[str, Any]): The user section (name, email, accesskey).
+        user_status (Mapping[str, Any]): The user's current status.
+        statuses (Mapping[str, dict]): Status definitions of the cluster by id.
+        status_sorting (tuple): Status ids in display order.
+        vehicles (Mapping[str, dict]): Vehicles of the cluster by id.
+        groups (Mapping[str, dict]): Groups of the cluster by id.
+        alarms (DiveraSection): The alarm section.
+        news (DiveraSection): The news section.
+        events (DiveraSection): The event section.
+        cluster (Mapping[str, Any]): The raw cluster section.
+        ucrs (Mapping[str, dict]): User cluster relations by id.
+        ucr_default (int | None): The default UCR of the user.
+        ucr_active (int | None): The active UCR of the user.
+        helpers (tuple[dict, ...]): Helper records, if the payload exposes them.
+        helpers_by_key (Mapping[str, dict]): Helper records by helper_key().
+        statusplan (Mapping[str, Any]): The raw statusplan section.
+        monitor (Mapping[str, Any]): The raw monitor/localmonitor section.
+        state_names (tuple[str, ...]): Status names in display order.
+        state_id_by_name (Mapping[str, Any]): Status name to status id.
+        state_id_by_casefold (Mapping[str, Any]): Casefolded status name to status id.
+        group_names (Mapping[str, str]): Group id to group name.
+        cluster_name_by_ucr (Mapping[str, str]): UCR id to cluster name.
+        alarms_v2 (Mapping[str, dict]): /api/v2/alarms items by alarm id.
+        _vehicle_views (dict[tuple[str, tzinfo], Mapping[str, Any]]): Vehicle
+            attributes built by vehicle_view(), by vehicle id and time zone.
+    """
+
+    user: Mapping[str, Any]
+    user_status: Mapping[str, Any]
+    statuses: Mapping[str, dict]
+    status_sorting: tuple
+    vehicles: Mapping[str, dict]
+    groups: Mapping[str, dict]
+    alarms: DiveraSection
+    news: DiveraSection
+    events: DiveraSection
+    cluster: Mapping[str, Any]
+    ucrs: Mapping[str, dict]
+    ucr_default: int | None
+    ucr_active: int | None
+    helpers: tuple[dict, ...]
+    helpers_by_key: Mapping[str, dict]
+    statusplan: Mapping[str, Any]
+    monitor: Mapping[str, Any]
+    state_names: tuple[str, ...]
+    state_id_by_name: Mapping[str, Any]
+    state_id_by_casefold: Mapping[str, Any]
+    group_names: Mapping[str, str]
+    cluster_name_by_ucr: Mapping[str, str]
+    alarms_v2: Mapping[str, dict]
+    _vehicle_views: dict[tuple[str, tzinfo], Mapping[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _helper_counts: HelperCounts | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_payload(cls, payload: Any, alarms_v2: Any = None) -> DiveraSnapshot:
+        """
+        Build a snapshot from a decoded pull/all response.
+
+        The raw dicts are referenced, not copied, so building a snapshot is
+        cheap compared to decoding the response.
+
+        Args:
+            payload (Any): The decoded JSON body of /api/v2/pull/all.
+            alarms_v2 (Any, optional): The decoded JSON body of /api/v2/alarms.
+
+        Returns:
+            DiveraSnapshot: The snapshot of the response.
+        """
+        root = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(root, dict):
+            root = {}
+        cluster = root.get("cluster")
+        if not isinstance(cluster, dict):
+            cluster = {}
+        statuses = _mapping(cluster.get("status"))
+        status_sorting = tuple(cluster.get("statussorting") or ())
+        groups = _mapping(cluster.get("group"))
+        ucrs = _mapping(root.get("ucr"))
+
+        # Lookup indexes for the select entity, the set_user_state service and
+        # the alarm/news group resolution, built once instead of per call.
+        state_id_by_name: dict[str, Any] = {}
+        state_id_by_casefold: dict[str, Any] = {}
+        for state_id in status_sorting:
+            name = (statuses.get(str(state_id)) or {}).get("name")
+            if name is None:
+                continue
+            state_id_by_name.setdefault(name, state_id)
+            state_id_by_casefold.setdefault(name.casefold(), state_id)
+        group_names = {
+            group_id: group["name"]
+            for group_id, group in groups.items()
+            if isinstance(group, dict) and "name" in group
+        }
+        helpers = _helpers(root)
+        cluster_name_by_ucr = {
+            ucr_id: ucr["name"]
+            for ucr_id, ucr in ucrs.items()
+            if isinstance(ucr, dict) and "name" in ucr
+        }
+
+        return cls(
+            user=_mapping(root.get("user")),
+            user_status=_mapping(root.get("status")),
+            statuses=statuses,
+            status_sorting=status_sorting,
+            vehicles=_mapping(cluster.get("vehicle")),
+            groups=groups,
+            alarms=DiveraSection.from_payload(root.get("alarm")),
+            news=DiveraSection.from_payload(root.get("news")),
+            events=DiveraSection.from_payload(root.get("events")),
+            cluster=_mapping(cluster),
+            ucrs=ucrs,
+            ucr_default=root.get("ucr_default"),
+            ucr_active=root.get("ucr_active"),
+            helpers=helpers,
+            helpers_by_key=MappingProxyType(
+                {
+                    helper_key(helper): helper
+                    for helper in helpers
+                    if isinstance(helper, dict)
+                }
+            ),
+            statusplan=_mapping(root.get("statusplan")),
+            monitor=_mapping(root.get("monitor") or root.get("localmonitor")),
+            state_names=tuple(state_id_by_name),
+            state_id_by_name=MappingProxyType(state_id_by_name),
+            state_id_by_casefold=MappingProxyType(state_id_by_casefold),
+            group_names=MappingProxyType(group_names),
+            cluster_name_by_ucr=MappingProxyType(cluster_name_by_ucr),
+            alarms_v2=_alarms_v2_items(alarms_v2),
+        )
+
+    @property
+    def helper_counts(self) -> HelperCounts:
+        """
+        Return the helper counts by status, group and qualification.
+
+        Counted in one pass on first access and kept for the lifetime of the
+        snapshot. Only the status count and overview sensors read them, so
+        without the status sensors option the helpers are never counted.
+
+        Returns:
+            HelperCounts: The counts.
+        """
+        counts = self._helper_counts
+        if counts is None:
+            counts = _count_helpers(self.helpers)
+            object.__setattr__(self, "_helper_counts", counts)
+        return counts
+
+    def alarm_signature(self) -> tuple:
+        """Return ``(id, ts_update, closed)`` of every alarm, see alarm_signature()."""
+        return _section_signature(self.alarms)
+
+    def vehicle_view(self, vehicle_id: str, tz: tzinfo) -> Mapping[str, Any] | None:
+        """
+        Return the normalized attributes of a vehicle.
+
+        Built on first use per time zone and kept for the lifetime of the
+        snapshot, so all entities of a vehicle share one read-only view per
+        pull.
+
+        Args:
+            vehicle_id (str): The ID of the vehicle.
+            tz (tzinfo): Time zone of the fmsstatus_ts datetime.
+
+        Returns:
+            Mapping[str, Any] | None: The attributes, None if the vehicle is missing.
+        """
+        key = (vehicle_id, tz)
+        view = self._vehicle_views.get(key)
+        if view is None:
+            vehicle = self.vehicles.get(vehicle_id)
+            if not isinstance(vehicle, dict):
+                return None
+            view = self._vehicle_views[key] = MappingProxyType(
+                _vehicle_view(vehicle, tz)
+            )
+        return view
+
+    def slices(self) -> dict[Any, Any]:
+        """
+        Return the data each group of entities is built from, by slice key.
+
+        Entities subscribe to one slice key (see SLICE_* in const); comparing
+        the slices of two snapshots tells which entities have to be updated.
+        The values are the snapshot's own objects, so building the slices
+        copies nothing.
+
+        Returns:
+            dict[Any, Any]: Slice key to a value comparable with ==.
+        """
+        vehicles = self.vehicles
+        slices: dict[Any, Any] = {
+            # The alarm attributes resolve groups, answers and vehicle names
+            SLICE_ALARM: (
+                self.alarms,
+                self.alarms_v2,
+                self.group_names,
+                self.statuses,
+                self.ucr_active,
+                {
+                    vehicle_id: (
+                        vehicle.get("shortname"),
+                        vehicle.get("name"),
+                        vehicle.get("fullname"),
+                    )
+                    for vehicle_id, vehicle in vehicles.items()
+                    if isinstance(vehicle, dict)
+                },
+            ),
+            SLICE_NEWS: (self.news, self.group_names),
+            SLICE_EVENTS: self.events,
+            SLICE_USER_STATUS: (self.user_status, self.statuses, self.state_names),
+            SLICE_HELPERS: self.helpers,
+        }
+        for vehicle_id, vehicle in vehicles.items():
+            slices[(SLICE_VEHICLE, vehicle_id)] = vehicle
+        for key, helper in self.helpers_by_key.items():
+            slices[(SLICE_HELPER, key)] = helper
+        return slices
+
+    def shared_with(self, other: DiveraSnapshot) -> DiveraSnapshot:
+        """
+        Return the snapshot reusing the user sections of another UCR's snapshot.
+
+        Sections that are equal to the ones of other are replaced by the
+        objects of other, so the snapshots of all UCRs of one access key keep
+        a single copy of them.
+
+        Args:
+            other (DiveraSnapshot): The snapshot of another UCR of the same user.
+
+        Returns:
+            DiveraSnapshot: The snapshot, self if nothing could be shared.
+        """
+        changes = {}
+        for name in _USER_FIELDS:
+            value, shared = getattr(self, name), getattr(other, name)
+            if value is not shared and value == shared:
+                changes[name] = shared
+        return replace(self, **changes) if changes else self
+
+    def with_alarms_v2(self, alarms_v2: Any) -> DiveraSnapshot:
+        """
+        Return a copy of the snapshot with new /api/v2/alarms data.
+
+        Used when only the alarm details changed, so the pull/all sections and
+        indexes are reused as they are.
+
+        Args:
+            alarms_v2 (Any): The decoded JSON body of /api/v2/alarms.
+
+        Returns:
+            DiveraSnapshot: The updated snapshot.
+        """
+        return replace(self, alarms_v2=_alarms_v2_items(alarms_v2))
+
+
+def _vehicle_view(vehicle: Mapping[str, Any], tz: tzinfo) -> dict[str, Any]:
+    """Build the attributes of a vehicle record, see DiveraSnapshot.vehicle_view."""
+    timestamp = vehicle.get("fmsstatus_ts")
+    # Normalize coordinates: API may expose lat/lng or latitude/longitude
+    return {
+        "fullname": vehicle.get("fullname"),
+        "shortname": vehicle.get("shortname"),
+        "name": vehicle.get("name"),
+        "fmsstatus_note": vehicle.get("fmsstatus_note"),
+        "fmsstatus_ts": (
+            datetime.fromtimestamp(timestamp, tz=tz) if timestamp is not None else None
+        ),
+        "latitude": (
+            vehicle.get("lat") or vehicle.get("latitude") or vehicle.get("lat_deg")
+        ),
+        "longitude": (
+            vehicle.get("lng")
+            or vehicle.get("lon")
+            or vehicle.get("longitude")
+            or vehicle.get("lon_deg")
+        ),
+        "opta": vehicle.get("opta"),
+        "issi": vehicle.get("issi"),
+        "number": vehicle.get("number"),
+    }
+
+
+def _helpers(root: dict) -> tuple[dict, ...]:
+    """Extract the helper records from the payload root (list or dict form)."""
+    helpers: Sequence | Mapping | None = root.get("helpers") or root.get("helper")
+    if isinstance(helpers, list):
+        return tuple(helpers)
+    if isinstance(helpers, dict):
+        return tuple(helpers.values())
+    return ()
+
+
+def _ids(value: Any) -> tuple[str, ...]:
+    """Return the group or qualification ids of a helper field (list, dict or id)."""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, Mapping):
+        value = value.keys()
+    elif not isinstance(value, (list, tuple)):
+        value = (value,)
+    return tuple(str(item) for item in value)
+
+
+def _count_helpers(helpers: Sequence[dict]) -> HelperCounts:
+    """Count the helpers by status, group and qualification, in one pass."""
+    by_status: dict[str, int] = {}
+    by_group: dict[str, dict[str, int]] = {}
+    by_qualification: dict[str, dict[str, int]] = {}
+    for helper in helpers:
+        if not isinstance(helper, dict):
+            continue
+        status = helper.get("status")
+        status = "unknown" if status is None else str(status)
+        by_status[status] = by_status.get(status, 0) + 1
+        for group_id in _ids(helper.get("group", helper.get("groups"))):
+            counts = by_group.setdefault(group_id, {})
+            counts[status] = counts.get(status, 0) + 1
+        for qualification_id in _ids(
+            helper.get("qualification", helper.get("qualifications"))
+        ):
+            counts = by_qualification.setdefault(qualification_id, {})
+            counts[status] = counts.get(status, 0) + 1
+    return HelperCounts(
+        total=sum(by_status.values()),
+        by_status=MappingProxyType(by_status),
+        by_group=MappingProxyType(by_group),
+        by_qualification=MappingProxyType(by_qualification),
+    )
+
+
+def helper_key(helper: Mapping[str, Any]) -> str:
+    """
+    Return the key identifying a helper record across pulls.
+
+    Args:
+        helper (Mapping[str, Any]): A helper record.
+
+    Returns:
+        str: The helper's id, or its name if the record has no id.
+    """
+    helper_id = helper.get("id")
+    if helper_id is not None:
+        return str(helper_id)
+    return f"{helper.get('firstname', '')} {helper.get('lastname', '')}".strip()
+
+
+def changed_slices(old: Mapping[Any, Any], new: Mapping[Any, Any]) -> set:
+    """
+    Return the keys of the slices that differ between two slices() results.
+
+    Args:
+        old (Mapping[Any, Any]): The slices of the previous snapshot.
+        new (Mapping[Any, Any]): The slices of the current snapshot.
+
+    Returns:
+        set: Keys that were added, removed or whose value changed.
+    """
+    changed = {key for key, value in new.items() if key not in old or old[key] != value}
+    changed.update(key for key in old if key not in new)
+    return changed
+
+
+def alarm_signature(payload: Any) -> tuple:
+    """
+    Return what identifies the state of the alarm section of a pull/all payload.
+
+    Args:
+        payload (Any): The decoded JSON body of /api/v2/pull/all.
+
+    Returns:
+        tuple: ``(id, ts_update, closed)`` of every alarm in API order.
+    """
+    root = payload.get("data") if isinstance(payload, dict) else None
+    return _section_signature(
+        DiveraSection.from_payload(
+            root.get("alarm") if isinstance(root, dict) else None
+        )
+    )
+
+
+def _section_signature(section: DiveraSection) -> tuple:
+    """Return ``(id, ts_update, closed)`` of every item of a section in API order."""
+    items = section.items
+    signature = []
+    for item_id in section.sorting:
+        item = items.get(item_id) or {}
+        signature.append((item_id, item.get("ts_update"), item.get("closed")))
+    return tuple(signature)
+
+
+def _alarms_v2_items(alarms_v2: Any) -> Mapping[str, dict]:
+    """Extract the alarm items from a /api/v2/alarms response."""
+    if not isinstance(alarms_v2, dict):
+        return _EMPTY
+    data = alarms_v2.get("data")
+    if not isinstance(data, dict):
+        return _EMPTY
+    return _mapping(data.get("items"))
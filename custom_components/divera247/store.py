@@ -0,0 +1,131 @@
+"""Snapshot Store Module for Divera 24/7 Integration.
+
+Keeps the last pulled data of every UCR of a config entry on disk, so the
+entities can be set up from it right away after a restart, while the
+network is still down or before the first pull returned.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STORE_REDACT_KEYS, STORE_SAVE_DELAY, STORE_VERSION
+from .divera247 import DiveraClient
+
+REDACTED = "**REDACTED**"
+
+
+class DiveraSnapshotStore:
+    """Stores the last pull/all and /api/v2/alarms responses per UCR."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """
+        Initialize DiveraSnapshotStore.
+
+        Args:
+            hass (HomeAssistant): Home Assistant instance.
+            entry_id (str): The config entry whose UCRs are stored.
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORE_VERSION,
+            f"{DOMAIN}.{entry_id}",
+            private=True,
+            atomic_writes=True,
+        )
+        self._stored: dict[str, Any] = {}
+        self._clients: dict[Any, DiveraClient] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored data (nothing is restored if the file is missing or invalid)."""
+        data = await self._store.async_load()
+        ucrs = data.get("ucrs") if isinstance(data, dict) else None
+        self._stored = ucrs if isinstance(ucrs, dict) else {}
+
+    def register(self, ucr_id: Any, client: DiveraClient) -> None:
+        """
+        Register the client whose data is stored for a UCR.
+
+        Args:
+            ucr_id (Any): The UCR.
+            client (DiveraClient): The client holding the data of the UCR.
+        """
+        self._clients[ucr_id] = client
+
+    def restore(self, ucr_id: Any) -> bool:
+        """
+        Restore the stored data of a UCR into its registered client.
+
+        Args:
+            ucr_id (Any): A registered UCR.
+
+        Returns:
+            bool: True if data was restored.
+        """
+        stored = self._stored.get(str(ucr_id))
+        client = self._clients.get(ucr_id)
+        if client is None or not isinstance(stored, dict):
+            return False
+        payload = stored.get("payload")
+        if not isinstance(payload, dict):
+            return False
+        alarms_v2 = stored.get("alarms_v2")
+        client.restore_data(payload, alarms_v2 if isinstance(alarms_v2, dict) else None)
+        return True
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Write the data of all registered clients after STORE_SAVE_DELAY seconds."""
+        self._store.async_delay_save(self._data_to_save, STORE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the stored data."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the redacted data of all registered clients."""
+        ucrs: dict[str, Any] = {}
+        for ucr_id, client in self._clients.items():
+            key = str(ucr_id)
+            payload, alarms_v2 = client.get_raw_data()
+            if payload is None:
+                # Neither pulled nor restored in this run: keep the stored data
+                if key in self._stored:
+                    ucrs[key] = self._stored[key]
+                continue
+            ucrs[key] = {
+                "saved": dt_util.utcnow().isoformat(),
+                "payload": redact_payload(payload),
+                "alarms_v2": alarms_v2,
+            }
+        return {"ucrs": ucrs}
+
+
+def redact_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Return a pull/all body without the secrets of the user section.
+
+    Only the user section is copied; all other sections are referenced.
+
+    Args:
+        payload (Mapping[str, Any]): A decoded pull/all body.
+
+    Returns:
+        dict[str, Any]: The body with the secret values replaced by REDACTED.
+    """
+    data = payload.get("data")
+    if not isinstance(data, dict) or not isinstance(data.get("user"), dict):
+        return dict(payload)
+    user = {
+        key: REDACTED
+        if any(word in key.lower() for word in STORE_REDACT_KEYS)
+        else value
+        for key, value in data["user"].items()
+    }
+    return {**payload, "data": {**data, "user": user}}
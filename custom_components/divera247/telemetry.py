@@ -0,0 +1,154 @@
+"""Telemetry Module for Divera 24/7 Integration.
+
+Keeps rolling windows of the request latency, response size, JSON decode
+time and entity update time of one UCR, and of the delay between the date
+of a new alarm and its detection. Telemetry is off unless enabled in
+the options: the client and coordinator then hold no telemetry object and
+skip the measurements entirely.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any
+
+from .const import TELEMETRY_WINDOW
+
+METRIC_REQUEST_TIME = "request_time"
+"""Round trip of one API request in milliseconds, until the body is read."""
+
+METRIC_RESPONSE_SIZE = "response_size"
+"""Bytes of one response body (0 for 304 Not Modified)."""
+
+METRIC_DECODE_TIME = "decode_time"
+"""JSON decode time of one response body in milliseconds."""
+
+METRIC_UPDATE_TIME = "update_time"
+"""Time the listeners (entity updates) of one refresh took in milliseconds."""
+
+METRIC_ALARM_LATENCY = "alarm_latency"
+"""Seconds from the date of a new alarm until the integration detected it."""
+
+METRIC_ALARM_POLL_WAIT = "alarm_poll_wait"
+"""Seconds from the date of a new alarm until the pull that found it started."""
+
+METRIC_ALARM_NETWORK_TIME = "alarm_network_time"
+"""Seconds the pull that found a new alarm took until its body was read."""
+
+METRIC_ALARM_PROCESSING_TIME = "alarm_processing_time"
+"""Seconds from reading the body with a new alarm until it was detected."""
+
+METRICS: tuple[str, ...] = (
+    METRIC_REQUEST_TIME,
+    METRIC_RESPONSE_SIZE,
+    METRIC_DECODE_TIME,
+    METRIC_UPDATE_TIME,
+    METRIC_ALARM_LATENCY,
+    METRIC_ALARM_POLL_WAIT,
+    METRIC_ALARM_NETWORK_TIME,
+    METRIC_ALARM_PROCESSING_TIME,
+)
+
+
+class DiveraTelemetry:
+    """Rolling windows of the last TELEMETRY_WINDOW samples per metric."""
+
+    def __init__(self, window: int = TELEMETRY_WINDOW) -> None:
+        """
+        Initialize DiveraTelemetry.
+
+        Args:
+            window (int, optional): Samples kept per metric. Defaults to TELEMETRY_WINDOW.
+        """
+        self._samples: dict[str, deque[float]] = {
+            metric: deque(maxlen=window) for metric in METRICS
+        }
+        self._counts: dict[str, int] = dict.fromkeys(METRICS, 0)
+
+    def record(self, metric: str, value: float) -> None:
+        """
+        Add a sample to a metric.
+
+        Args:
+            metric (str): One of METRICS.
+            value (float): The sample.
+        """
+        self._samples[metric].append(value)
+        self._counts[metric] += 1
+
+    def stats(self, metric: str) -> dict[str, Any]:
+        """
+        Return the statistics of a metric over its window.
+
+        Args:
+            metric (str): One of METRICS.
+
+        Returns:
+            dict[str, Any]: count (all samples so far), last, p50, p95, p99 and
+                max of the window; the values are None without samples.
+        """
+        samples = sorted(self._samples[metric])
+        stats: dict[str, Any] = {"count": self._counts[metric]}
+        if not samples:
+            return stats | dict.fromkeys(("last", "p50", "p95", "p99", "max"))
+        return {
+            **stats,
+            "last": round(self._samples[metric][-1], 2),
+            "p50": _percentile(samples, 50),
+            "p95": _percentile(samples, 95),
+            "p99": _percentile(samples, 99),
+            "max": round(samples[-1], 2),
+        }
+
+    def record_alarm(
+        self,
+        date: float,
+        request_started: float,
+        response_received: float,
+        detected: float,
+    ) -> None:
+        """
+        Add the detection latency of a new alarm and its breakdown.
+
+        All arguments are Unix timestamps. The alarm date has a resolution
+        of one second and comes from the clock of the Divera server, so the
+        poll wait is clamped at 0.
+
+        Args:
+            date (float): The date of the alarm in Divera.
+            request_started (float): Start of the pull that returned the alarm.
+            response_received (float): When the body of that pull was read.
+            detected (float): When the alarm was found in the new snapshot.
+        """
+        self.record(METRIC_ALARM_LATENCY, max(0.0, detected - date))
+        self.record(METRIC_ALARM_POLL_WAIT, max(0.0, request_started - date))
+        self.record(METRIC_ALARM_NETWORK_TIME, response_received - request_started)
+        self.record(METRIC_ALARM_PROCESSING_TIME, detected - response_received)
+
+    def histogram(self, metric: str, bounds: tuple[float, ...]) -> dict[str, int]:
+        """
+        Return how many samples of the window fall into each bucket.
+
+        Args:
+            metric (str): One of METRICS.
+            bounds (tuple[float, ...]): Ascending upper bounds of the buckets.
+
+        Returns:
+            dict[str, int]: Counts keyed "<=bound", the last one ">bound".
+        """
+        counts = [0] * (len(bounds) + 1)
+        for value in self._samples[metric]:
+            counts[bisect_left(bounds, value)] += 1
+        labels = [f"<={bound:g}" for bound in bounds] + [f">{bounds[-1]:g}"]
+        return dict(zip(labels, counts))
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of all metrics, e.g. for diagnostics."""
+        return {metric: self.stats(metric) for metric in METRICS}
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    rank = max(0, -(-len(samples) * percent // 100) - 1)
+    return round(samples[rank], 2)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from yarl import URL
 
+from .const import PARAM_ACCESSKEY
+
 
 def remove_params_from_url(url: URL | str | None) -> str:
     """
@@ -25,3 +27,27 @@ def remove_params_from_url(url: URL | str | None) -> str:
         return URL(url).with_query(None).human_repr()
     except (TypeError, ValueError):
         return "unknown"
+
+
+def remove_accesskey_from_url(url: URL | str | None) -> str:
+    """
+    Remove the accesskey parameter from a URL, keeping the other parameters.
+
+    Like remove_params_from_url, for places that need the rest of the query,
+    e.g. the UCR of a recorded request.
+
+    Args:
+        url (URL | str | None): The URL from which the accesskey needs to be removed.
+
+    Returns:
+        str: URL without the accesskey, or "unknown" if it cannot be parsed.
+    """
+    if url is None:
+        return "unknown"
+    try:
+        url = URL(url)
+        return url.with_query(
+            [(key, value) for key, value in url.query.items() if key != PARAM_ACCESSKEY]
+        ).human_repr()
+    except (TypeError, ValueError):
+        return "unknown"
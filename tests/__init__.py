@@ -0,0 +1 @@
+"""Tests for the Divera 24/7 integration."""
@@ -0,0 +1,101 @@
+"""Fixtures for the tests of the Divera 24/7 integration."""
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+)
+
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_FLOW_MINOR_VERSION,
+    CONF_FLOW_VERSION,
+    DATA_ACCESSKEY,
+    DATA_BASE_URL,
+    DATA_UCRS,
+    DOMAIN,
+)
+
+DiveraServerFactory = Callable[[web.Application], Awaitable[TestServer]]
+DiveraEntryFactory = Callable[..., Awaitable[ConfigEntry]]
+
+
+@pytest.fixture
+def history_db(monkeypatch, tmp_path):
+    """Keep the history database out of the shared test config directory."""
+    monkeypatch.setattr(
+        "custom_components.divera247.history.HISTORY_DB_FILE",
+        str(tmp_path / "history.db"),
+    )
+
+
+@pytest.fixture
+async def divera_server(socket_enabled) -> AsyncIterator[DiveraServerFactory]:
+    """Start fake Divera apps as test servers, closed after the test."""
+    servers: list[TestServer] = []
+
+    async def start(app: web.Application) -> TestServer:
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
+@pytest.fixture
+async def divera_entry(
+    hass: HomeAssistant, enable_custom_integrations, divera_server
+) -> AsyncIterator[DiveraEntryFactory]:
+    """
+    Add config entries against fake Divera apps, unloaded after the test.
+
+    The factory takes the app and optionally the options, the UCRs, the
+    access key and the minor version of the entry; with load=False the
+    entry is only added, not set up.
+    """
+    entries: list[ConfigEntry] = []
+
+    async def add(
+        app: web.Application,
+        options: dict[str, Any] | None = None,
+        *,
+        ucrs: list[int] | None = None,
+        accesskey: str = "secret",
+        minor_version: int = CONF_FLOW_MINOR_VERSION,
+        load: bool = True,
+    ) -> ConfigEntry:
+        server = await divera_server(app)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=CONF_FLOW_VERSION,
+            minor_version=minor_version,
+            data={
+                DATA_ACCESSKEY: accesskey,
+                DATA_UCRS: ucrs or [1],
+                DATA_BASE_URL: str(server.make_url("")).rstrip("/"),
+            },
+            options=options or {},
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        if load:
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+        return entry
+
+    yield add
+    for entry in entries:
+        if entry.state is ConfigEntryState.LOADED:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,80 @@
+"""Tests for the calendar event index."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.divera247.calendar import history_end  # noqa: E402
+from custom_components.divera247.calendar_index import DiveraEventIndex  # noqa: E402
+from custom_components.divera247.divera247 import DiveraClient  # noqa: E402
+
+DAY = 86400
+
+
+def _at(day: float) -> datetime:
+    return datetime.fromtimestamp(day * DAY, tz=UTC)
+
+
+EVENTS = {
+    "1": {"id": 1, "title": "before", "start": 1 * DAY, "end": 2 * DAY},
+    "2": {"id": 2, "title": "spans start", "start": 9 * DAY, "end": 11 * DAY},
+    "3": {"id": 3, "title": "inside", "start": 12 * DAY, "end": 13 * DAY},
+    "4": {"id": 4, "title": "spans end", "start": 19 * DAY, "end": 21 * DAY},
+    "5": {"id": 5, "title": "spans all", "start": 0, "end": 30 * DAY},
+    "6": {"id": 6, "title": "after", "start": 25 * DAY, "end": 26 * DAY},
+    "7": {"id": 7, "title": "instant", "start": 10 * DAY, "end": 10 * DAY},
+    "8": {"id": 8, "title": "no start"},
+}
+
+
+def test_between_overlap():
+    """Events overlapping the range are found, including boundary spanning ones."""
+    index = DiveraEventIndex(EVENTS.values(), lambda event: event["title"])
+
+    assert len(index) == 7
+    assert index.between(_at(10), _at(20)) == [
+        "spans all",
+        "spans start",
+        "instant",
+        "inside",
+        "spans end",
+    ]
+    assert index.between(_at(2), _at(9)) == ["spans all"]
+    assert index.between(_at(40), _at(50)) == []
+
+
+def test_get_events_reuses_index():
+    """The client converts the events once per pull."""
+    client = DiveraClient(None, "secret")
+    client.restore_data(
+        {"data": {"events": {"sorting": list(EVENTS), "items": EVENTS}}}
+    )
+
+    events = client.get_events(_at(10), _at(20))
+    assert [event.summary for event in events] == [
+        "spans all",
+        "spans start",
+        "instant",
+        "inside",
+        "spans end",
+    ]
+    assert client.get_events(_at(10), _at(20))[0] is events[0]
+
+
+def test_history_end():
+    """The history is only queried before the earliest live event."""
+    live = {key: EVENTS[key] for key in ("2", "3", "4")}
+    client = DiveraClient(None, "secret")
+    client.restore_data({"data": {"events": {"sorting": list(live), "items": live}}})
+
+    assert client.get_first_event_start() == _at(9)
+    assert history_end(client, _at(10), _at(20)) is None
+    assert history_end(client, _at(9), _at(20)) is None
+    assert history_end(client, _at(2), _at(20)) == _at(9)
+    assert history_end(client, _at(2), _at(5)) == _at(5)
+
+    client.restore_data({"data": {}})
+    assert client.get_first_event_start() is None
+    assert history_end(client, _at(10), _at(20)) == _at(20)
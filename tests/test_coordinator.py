@@ -0,0 +1,114 @@
+"""Tests for the Divera coordinator."""
+
+from datetime import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+
+from custom_components.divera247.binary_sensor import (  # noqa: E402
+    BINARY_SENSORS,
+    DiveraBinarySensorEntity,
+)
+from custom_components.divera247.const import (  # noqa: E402
+    EVENT_VEHICLE_STATUS_CHANGED,
+)
+from custom_components.divera247.coordinator import (  # noqa: E402
+    AdaptivePolling,
+    DiveraCoordinator,
+)
+from custom_components.divera247.device_tracker import (  # noqa: E402
+    DiveraVehicleTrackerEntity,
+)
+from custom_components.divera247.select import (  # noqa: E402
+    SENSORS as SELECTS,
+    DiveraSelectEntity,
+)
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+def test_quiet_hours_span_midnight():
+    """Quiet hours may wrap around midnight."""
+    polling = AdaptivePolling(quiet_start=time(23, 0), quiet_end=time(6, 0))
+
+    assert polling.is_quiet(time(23, 30))
+    assert polling.is_quiet(time(5, 59))
+    assert not polling.is_quiet(time(6, 0))
+    assert not polling.is_quiet(time(12, 0))
+    assert not AdaptivePolling().is_quiet(time(0, 0))
+
+
+def test_interval():
+    """Open alarms poll fast even in the quiet hours; otherwise idle or quiet."""
+    polling = AdaptivePolling(
+        fast_interval=15,
+        quiet_interval=300,
+        quiet_start=time(22, 0),
+        quiet_end=time(6, 0),
+    )
+
+    assert polling.interval(60, active=True, now=time(3, 0)) == 15
+    assert polling.interval(60, active=False, now=time(3, 0)) == 300
+    assert polling.interval(60, active=False, now=time(12, 0)) == 60
+    # The fast interval never slows down a shorter idle interval
+    assert polling.interval(10, active=True, now=time(12, 0)) == 10
+
+
+async def test_state_writes_per_idle_tick(hass, divera_server):
+    """Only entities whose data slice changed write their state."""
+    fake = FakeDivera(etag=True)
+    server = await divera_server(fake.app())
+    async with ClientSession() as session:
+        coordinator = DiveraCoordinator(
+            hass,
+            session,
+            "secret",
+            str(server.make_url("")).rstrip("/"),
+            ucr_id=1,
+        )
+        await coordinator.async_refresh()
+        entities = [
+            DiveraVehicleTrackerEntity(coordinator, vehicle_id, "auto")
+            for vehicle_id in coordinator.data.get_vehicle_id_list()
+        ]
+        entities.append(DiveraBinarySensorEntity(coordinator, BINARY_SENSORS[0]))
+        entities.append(DiveraSelectEntity(coordinator, SELECTS[0]))
+        writes: list[str] = []
+        unsubscribe = []
+        for entity in entities:
+            entity.async_write_ha_state = (
+                lambda key=entity.entity_description.key: writes.append(key)
+            )
+            unsubscribe.append(
+                coordinator.async_add_listener(
+                    entity._handle_coordinator_update, entity.coordinator_context
+                )
+            )
+
+        async def tick() -> list[str]:
+            writes.clear()
+            await coordinator.async_refresh()
+            return list(writes)
+
+        # 304: nothing to do
+        assert await tick() == []
+        # Changes outside of every entity's slice
+        fake.version += 1
+        assert await tick() == []
+        # One vehicle out of 500
+        fired = []
+        hass.bus.async_listen(EVENT_VEHICLE_STATUS_CHANGED, fired.append)
+        fake.version += 1
+        fake.vehicle_status["3"] = 3
+        assert await tick() == ["vehicle_3_tracker"]
+        await hass.async_block_till_done()
+        assert [event.data["vehicle_id"] for event in fired] == ["3"]
+        # Failed refreshes change the availability of all entities
+        await server.close()
+        assert len(await tick()) == len(entities)
+
+        for unsub in unsubscribe:
+            unsub()
@@ -0,0 +1,390 @@
+"""Tests for the Divera HTTP client against a local fake Divera server."""
+
+import asyncio
+from datetime import UTC
+import json
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession, hdrs, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from custom_components.divera247 import divera247  # noqa: E402
+from custom_components.divera247.divera247 import (  # noqa: E402
+    DiveraClient,
+    DiveraConnectionError,
+)
+from custom_components.divera247.snapshot import DiveraSnapshot  # noqa: E402
+
+PULL_ALL = {
+    "success": True,
+    "data": {
+        "user": {"firstname": "Max", "lastname": "Muster", "accesskey": "secret"},
+        "status": {"status_id": 1, "status_set_date": 1700000000},
+        "ucr_default": 1,
+        "ucr_active": 1,
+        "ucr": {"1": {"name": "FF Test"}, "2": {"name": "FF Zwei"}},
+        "cluster": {
+            "name": "FF Test",
+            "status": {str(i): {"name": f"Status {i}"} for i in range(1, 10)},
+            "statussorting": list(range(1, 10)),
+            "vehicle": {
+                str(i): {"shortname": f"HLF {i}", "fmsstatus_id": 2, "fmsstatus_ts": 0}
+                for i in range(500)
+            },
+            "group": {},
+        },
+        "alarm": {"sorting": [], "items": {}},
+        "news": {"sorting": [], "items": {}},
+        "events": {"sorting": [], "items": {}},
+    },
+}
+ALARMS = {"success": True, "data": {"items": {}}}
+
+
+class FakeDivera:
+    """Minimal stand-in for the pull/all and alarms endpoints."""
+
+    def __init__(self, etag: bool, vehicles: int = 500) -> None:
+        """Serve PULL_ALL with the first `vehicles` vehicles, with an ETag if requested."""
+        self.etag = etag
+        self.vehicles = vehicles
+        self.version = 1
+        self.requests: list[str] = []
+        self.not_modified = 0
+        self.delay = 0.0
+        # FMS status overrides by vehicle id
+        self.vehicle_status: dict[str, int] = {}
+        # UCRs (ucr query parameter) answered with a server error
+        self.failing_ucrs: set[str] = set()
+        # Alarms served in the alarm section, by id
+        self.alarm_items: dict[str, dict] = {}
+        # Helper records served in the helpers section
+        self.helpers: list[dict] = []
+        # Status /api/v2/alarms answers with instead of its body, if set
+        self.alarms_status: int | None = None
+        self.alarms_delay = 0.0
+        self.alarms_version = 1
+        # Requests being answered, the most at once, and the ones answered
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.answered: list[str] = []
+        # Answer every request with 304, validators or not
+        self.always_not_modified = False
+
+    async def _respond(self, request: web.Request, body: dict) -> web.Response:
+        self.requests.append(request.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        self.answered.append(request.path)
+        etag = f'"{request.path}-{self.version}"'
+        if self.always_not_modified or (
+            self.etag and request.headers.get(hdrs.IF_NONE_MATCH) == etag
+        ):
+            self.not_modified += 1
+            return web.Response(status=304)
+        headers = {hdrs.ETAG: etag} if self.etag else {}
+        return web.json_response(body, headers=headers)
+
+    async def pull_all(self, request: web.Request) -> web.Response:
+        if request.query.get("ucr") in self.failing_ucrs:
+            self.requests.append(request.path)
+            return web.Response(status=500)
+        body = json.loads(json.dumps(PULL_ALL))
+        body["data"]["ucr"]["1"]["name"] = f"FF Test {self.version}"
+        # Divera answers for the requested unit
+        body["data"]["ucr_active"] = int(request.query.get("ucr", 1))
+        cluster = body["data"]["cluster"]
+        cluster["vehicle"] = dict(list(cluster["vehicle"].items())[: self.vehicles])
+        for vehicle_id, status in self.vehicle_status.items():
+            body["data"]["cluster"]["vehicle"][vehicle_id]["fmsstatus_id"] = status
+        if self.helpers:
+            body["data"]["helpers"] = self.helpers
+        if self.alarm_items:
+            body["data"]["alarm"] = {
+                "sorting": [int(alarm_id) for alarm_id in self.alarm_items],
+                "items": self.alarm_items,
+            }
+        return await self._respond(request, body)
+
+    async def alarms(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.alarms_delay)
+        if self.alarms_status is not None:
+            self.requests.append(request.path)
+            return web.Response(status=self.alarms_status)
+        body = json.loads(json.dumps(ALARMS))
+        body["data"]["version"] = self.alarms_version
+        return await self._respond(request, body)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v2/pull/all", self.pull_all)
+        app.router.add_get("/api/v2/alarms", self.alarms)
+        return app
+
+
+def _run_pulls(monkeypatch, fake: FakeDivera, pulls: int) -> list:
+    """Pull `pulls` times, bump the server version, pull again; count decodes."""
+    decoded = []
+
+    def counting_json_loads(body):
+        decoded.append(len(body))
+        return json.loads(body)
+
+    monkeypatch.setattr(divera247, "json_loads", counting_json_loads)
+
+    async def scenario():
+        server = TestServer(fake.app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                client = DiveraClient(
+                    session, "secret", base_url=str(server.make_url("")).rstrip("/")
+                )
+                results = [await client.pull_data()]
+                snapshot = client.get_snapshot()
+                for _ in range(pulls):
+                    results.append(await client.pull_data())
+                assert client.get_snapshot() is snapshot
+                fake.version += 1
+                results.append(await client.pull_data())
+                assert client.get_snapshot() is not snapshot
+                assert client.get_cluster_name_from_ucr(1) == f"FF Test {fake.version}"
+                return results, decoded
+        finally:
+            await server.close()
+
+    return asyncio.run(scenario())
+
+
+def test_pull_data_not_modified(monkeypatch, socket_enabled):
+    """A 304 keeps the snapshot without decoding anything."""
+    fake = FakeDivera(etag=True)
+    results, decoded = _run_pulls(monkeypatch, fake, pulls=5)
+
+    assert results == [True, False, False, False, False, False, True]
+    # pull/all and alarms once each for the first pull, pull/all once after the bump
+    assert len(decoded) == 3
+    # Both endpoints for the five unchanged pulls; the bump changes every ETag
+    assert fake.not_modified == 10
+
+
+def test_pull_data_identical_body(monkeypatch, socket_enabled):
+    """Without validators an identical body is detected by its hash."""
+    fake = FakeDivera(etag=False)
+    results, decoded = _run_pulls(monkeypatch, fake, pulls=5)
+
+    assert results == [True, False, False, False, False, False, True]
+    assert len(decoded) == 3
+    assert fake.not_modified == 0
+
+
+def test_pull_data_not_modified_without_previous(socket_enabled):
+    """A 304 to the first request fails the pull instead of decoding nothing."""
+    fake = FakeDivera(etag=True)
+    fake.always_not_modified = True
+
+    async def scenario(client):
+        with pytest.raises(DiveraConnectionError):
+            await client.pull_data()
+        assert client.get_snapshot() is None
+        fake.always_not_modified = False
+        assert await client.pull_data() is True
+        return client.get_raw_data()
+
+    payload, alarms_v2 = asyncio.run(_serve(fake, scenario))
+
+    assert payload is not None
+    assert alarms_v2 is not None
+
+
+def test_pull_data_single_flight(socket_enabled):
+    """Concurrent callers share one pull and its result."""
+    fake = FakeDivera(etag=True)
+    fake.delay = 0.05
+
+    async def scenario():
+        server = TestServer(fake.app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                client = DiveraClient(
+                    session, "secret", base_url=str(server.make_url("")).rstrip("/")
+                )
+                results = await asyncio.gather(*(client.pull_data() for _ in range(5)))
+                snapshot = client.get_snapshot()
+                # A caller cancelled mid-pull does not abort it for the others
+                first = asyncio.create_task(client.pull_data())
+                second = asyncio.create_task(client.pull_data())
+                await asyncio.sleep(0.01)
+                first.cancel()
+                second_result = await second
+                return results, snapshot, second_result
+        finally:
+            await server.close()
+
+    results, snapshot, second_result = asyncio.run(scenario())
+
+    assert results == [True] * 5
+    assert snapshot is not None
+    assert second_result is False
+    assert fake.requests.count("/api/v2/pull/all") == 2
+
+
+async def _serve(fake: FakeDivera, scenario, **kwargs):
+    """Run scenario(client) against fake, passing kwargs to the client."""
+    server = TestServer(fake.app(), handler_cancellation=True)
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            client = DiveraClient(
+                session,
+                "secret",
+                base_url=str(server.make_url("")).rstrip("/"),
+                **kwargs,
+            )
+            return await scenario(client)
+    finally:
+        await server.close()
+
+
+def test_pull_data_concurrent_alarms(socket_enabled):
+    """/api/v2/alarms is requested while pull/all is still running."""
+    fake = FakeDivera(etag=True)
+    fake.delay = 0.05
+
+    async def scenario(client):
+        assert await client.pull_data() is True
+        return client.get_raw_data()
+
+    payload, alarms_v2 = asyncio.run(_serve(fake, scenario))
+
+    assert payload is not None
+    assert alarms_v2["data"]["version"] == 1
+    assert fake.max_in_flight == 2
+
+
+def test_pull_data_failure_cancels_alarms(socket_enabled):
+    """A failed pull/all cancels the running /api/v2/alarms request."""
+    fake = FakeDivera(etag=True)
+    fake.failing_ucrs = {"9"}
+    fake.alarms_delay = 0.2
+
+    async def scenario(client):
+        with pytest.raises(DiveraConnectionError):
+            await client.pull_data()
+        # Long enough for an uncancelled request to be answered
+        await asyncio.sleep(0.3)
+        return client.get_raw_data()
+
+    assert asyncio.run(_serve(fake, scenario, ucr_id="9")) == (None, None)
+    assert "/api/v2/alarms" not in fake.answered
+
+
+def test_pull_data_keeps_alarms_on_failure(socket_enabled):
+    """A failed /api/v2/alarms request keeps the previous alarm details."""
+    fake = FakeDivera(etag=True)
+
+    async def scenario(client):
+        await client.pull_data()
+        _, alarms_v2 = client.get_raw_data()
+        fake.alarms_status = 500
+        fake.version += 1
+        fake.alarms_version += 1
+        assert await client.pull_data() is True
+        assert client.get_raw_data()[1] is alarms_v2
+        assert client.get_cluster_name_from_ucr(1) == f"FF Test {fake.version}"
+        # The details are requested again once the endpoint recovers
+        fake.alarms_status = None
+        assert await client.pull_data() is True
+        return client.get_raw_data()[1]
+
+    alarms_v2 = asyncio.run(_serve(fake, scenario))
+
+    assert alarms_v2["data"]["version"] == 2
+
+
+def test_pull_data_alarms_on_change(socket_enabled):
+    """With alarms_v2_on_change /api/v2/alarms follows the alarm signature."""
+    fake = FakeDivera(etag=True)
+
+    async def scenario(client):
+        counts = []
+        for change in (
+            None,
+            lambda: None,
+            lambda: fake.alarm_items.update({"5": {"id": 5, "ts_update": 1}}),
+            lambda: None,
+            lambda: fake.alarm_items["5"].update({"ts_update": 2}),
+            lambda: fake.alarm_items["5"].update({"closed": True}),
+        ):
+            if change is not None:
+                change()
+                fake.version += 1
+            assert await client.pull_data() is True
+            counts.append(fake.requests.count("/api/v2/alarms"))
+        return counts
+
+    counts = asyncio.run(_serve(fake, scenario, alarms_v2_on_change=True))
+
+    # Requested for the first pull and each change of an alarm only
+    assert counts == [1, 1, 2, 2, 3, 4]
+    assert fake.requests.count("/api/v2/pull/all") == 6
+
+
+def test_vehicle_attributes_built_once_per_snapshot():
+    """All entities of a vehicle share one attribute dict per pull."""
+    client = DiveraClient(None, "secret")
+    client.restore_data(json.loads(json.dumps(PULL_ALL)))
+    attributes = client.get_vehicle_attributes("3")
+
+    assert attributes["shortname"] == "HLF 3"
+    assert attributes["fmsstatus_ts"].timestamp() == 0
+    assert client.get_vehicle_attributes("3") is attributes
+    assert client.get_vehicle_attributes("missing") == {}
+
+    client.restore_data(json.loads(json.dumps(PULL_ALL)))
+    assert client.get_vehicle_attributes("3") is not attributes
+    assert client.get_vehicle_attributes("3") == attributes
+
+
+def test_vehicle_view_per_time_zone():
+    """Views are read-only and built for the time zone they are asked for."""
+    snapshot = DiveraSnapshot.from_payload(json.loads(json.dumps(PULL_ALL)))
+    berlin = ZoneInfo("Europe/Berlin")
+    view = snapshot.vehicle_view("3", UTC)
+
+    with pytest.raises(TypeError):
+        view["shortname"] = "changed"
+    assert snapshot.vehicle_view("3", UTC) is view
+    assert view["fmsstatus_ts"].tzinfo is UTC
+    assert snapshot.vehicle_view("3", berlin)["fmsstatus_ts"].tzinfo is berlin
+    assert snapshot.vehicle_view("missing", UTC) is None
+
+
+def test_lookup_indexes():
+    """States, groups and clusters are resolved from the per-pull indexes."""
+    payload = json.loads(json.dumps(PULL_ALL))
+    payload["data"]["cluster"]["status"]["3"]["name"] = "Einsatzbereit"
+    payload["data"]["cluster"]["group"] = {"7": {"name": "Atemschutz"}, "8": {}}
+    client = DiveraClient(None, "secret")
+    client.restore_data(payload)
+
+    assert client.get_all_state_name()[:3] == ["Status 1", "Status 2", "Einsatzbereit"]
+    assert client.get_state_id_by_name("Einsatzbereit") == 3
+    with pytest.raises(ValueError):
+        client.get_state_id_by_name("einsatzbereit")
+    assert client.find_state_name("EINSATZBEREIT") == "Einsatzbereit"
+    assert client.find_state_name("status 9") == "Status 9"
+    assert client.find_state_name("Urlaub") is None
+    assert client.get_group_name_by_id(7) == "Atemschutz"
+    assert client.get_group_name_by_id("8") is None
+    assert client.get_cluster_name_from_ucr(2) == "FF Zwei"
+    assert client.get_vehicle_name_by_id(4) == "HLF 4"
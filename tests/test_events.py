@@ -0,0 +1,134 @@
+"""Tests for the change events between Divera snapshots."""
+
+import copy
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.divera247.const import (  # noqa: E402
+    EVENT_ALARM_CLOSED,
+    EVENT_ALARM_NEW,
+    EVENT_ALARM_REOPENED,
+    EVENT_ALARM_UPDATED,
+    EVENT_HELPER_STATUS_CHANGED,
+    EVENT_NEWS_NEW,
+    EVENT_VEHICLE_STATUS_CHANGED,
+)
+from custom_components.divera247.events import diff_snapshots  # noqa: E402
+from custom_components.divera247.snapshot import (  # noqa: E402
+    DiveraSnapshot,
+    changed_slices,
+)
+
+PAYLOAD = {
+    "data": {
+        "status": {"status_id": 1},
+        "cluster": {
+            "vehicle": {
+                str(i): {"shortname": f"HLF {i}", "fmsstatus_id": 2} for i in range(100)
+            },
+        },
+        "helpers": [
+            {"id": i, "firstname": "Helper", "lastname": str(i), "status": "active"}
+            for i in range(100)
+        ],
+        "alarm": {
+            "sorting": [2, 1],
+            "items": {
+                "1": {"id": 1, "title": "B1", "ts_update": 10, "closed": False},
+                "2": {"id": 2, "title": "TH", "ts_update": 20, "closed": False},
+            },
+        },
+        "news": {"sorting": [5], "items": {"5": {"id": 5, "title": "Dienst"}}},
+    }
+}
+
+
+def _diff(change, before=None) -> list:
+    """Diff PAYLOAD, modified by before, against a copy modified by change."""
+    old_payload = copy.deepcopy(PAYLOAD)
+    if before is not None:
+        before(old_payload["data"])
+    payload = copy.deepcopy(old_payload)
+    change(payload["data"])
+    old = DiveraSnapshot.from_payload(old_payload)
+    new = DiveraSnapshot.from_payload(payload)
+    return diff_snapshots(old, new, changed_slices(old.slices(), new.slices()))
+
+
+def test_unchanged():
+    """Equal snapshots produce no events."""
+    assert _diff(lambda data: None) == []
+
+
+def test_alarm_events():
+    """Alarms are matched by id and ts_update."""
+
+    def change(data):
+        alarms = data["alarm"]
+        alarms["sorting"].insert(0, 3)
+        alarms["items"]["3"] = {"id": 3, "title": "RD", "ts_update": 30}
+        alarms["items"]["2"].update(ts_update=21)
+        alarms["items"]["1"].update(ts_update=11, closed=True)
+
+    events = _diff(change)
+    assert [(event_type, data["alarm_id"]) for event_type, data in events] == [
+        (EVENT_ALARM_NEW, 3),
+        (EVENT_ALARM_UPDATED, 2),
+        (EVENT_ALARM_CLOSED, 1),
+    ]
+
+
+def test_closed_alarm_events():
+    """Closed alarms only report being reopened, even without a new ts_update."""
+
+    def close(data):
+        for alarm in data["alarm"]["items"].values():
+            alarm["closed"] = True
+
+    def change(data):
+        data["alarm"]["items"]["1"].update(ts_update=11)
+        data["alarm"]["items"]["2"].update(closed=False)
+
+    events = _diff(change, before=close)
+    assert [(event_type, data["alarm_id"]) for event_type, data in events] == [
+        (EVENT_ALARM_REOPENED, 2),
+    ]
+
+
+def test_status_events():
+    """Vehicle and helper status changes carry the old and new status."""
+
+    def change(data):
+        data["cluster"]["vehicle"]["42"]["fmsstatus_id"] = 3
+        data["helpers"][7]["status"] = "on_duty"
+        data["news"] = {
+            "sorting": [6, 5],
+            "items": {**data["news"]["items"], "6": {"id": 6, "title": "Neu"}},
+        }
+
+    events = _diff(change)
+    assert events == [
+        (EVENT_NEWS_NEW, {"item_id": 6, "title": "Neu"}),
+        (
+            EVENT_VEHICLE_STATUS_CHANGED,
+            {
+                "vehicle_id": "42",
+                "name": "HLF 42",
+                "old_status": 2,
+                "new_status": 3,
+                "note": None,
+                "ts": None,
+            },
+        ),
+        (
+            EVENT_HELPER_STATUS_CHANGED,
+            {
+                "helper": "7",
+                "name": "Helper 7",
+                "old_status": "active",
+                "new_status": "on_duty",
+            },
+        ),
+    ]
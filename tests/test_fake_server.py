@@ -0,0 +1,79 @@
+"""Tests for the fake Divera server of the load and soak runs."""
+
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from benchmarks.fake_server import (  # noqa: E402
+    SCENARIOS,
+    FakeDiveraServer,
+    Phase,
+    load_scenario,
+)
+from custom_components.divera247.divera247 import (  # noqa: E402
+    DiveraAuthError,
+    DiveraClient,
+)
+
+
+def _client(session: ClientSession, server: TestServer) -> DiveraClient:
+    base_url = str(server.make_url("")).rstrip("/")
+    return DiveraClient(session, "fake-accesskey", base_url=base_url, ucr_id=1)
+
+
+async def test_client_against_fake_server(socket_enabled):
+    """Conditional pulls, status changes and probe alarms round-trip."""
+    fake = FakeDiveraServer((Phase(change_every=None),))
+    server = TestServer(fake.app())
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            client = _client(session, server)
+            assert await client.pull_data()
+            assert not await client.pull_data()
+
+            await client.set_user_state_by_id("4")
+            assert await client.pull_data()
+            assert client.get_user_state() == "Status 4"
+
+            await client.trigger_probe_alarm()
+            assert await client.pull_data()
+            assert client.get_last_alarm().startswith("Probealarm")
+            assert client.has_open_alarms()
+    finally:
+        await server.close()
+
+    stats = fake.take_stats()
+    assert stats["phases"] == ["steady"]
+    assert stats["requests"]["/api/v2/pull/all 304"] == 1
+    assert stats["requests"]["/api/test-push 200"] == 1
+    assert fake.take_stats()["requests"] == {}
+
+
+async def test_scenario_errors(socket_enabled):
+    """A 401 phase surfaces as an authentication error of the client."""
+    fake = FakeDiveraServer((Phase(name="unauthorized", error_status=401),))
+    server = TestServer(fake.app())
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            client = _client(session, server)
+            with pytest.raises(DiveraAuthError):
+                await client.pull_data()
+    finally:
+        await server.close()
+
+
+def test_load_scenario(tmp_path):
+    """Scenarios come from SCENARIOS or a JSON list of phases."""
+    assert load_scenario("mixed") is SCENARIOS["mixed"]
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps([{"name": "slow", "duration": 5, "latency": 1}]))
+    assert load_scenario(str(path)) == (Phase(name="slow", duration=5, latency=1),)
+    with pytest.raises(ValueError):
+        load_scenario("no-such-scenario")
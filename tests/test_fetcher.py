@@ -0,0 +1,114 @@
+"""Tests for the fetcher shared by the UCRs of one access key."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from custom_components.divera247 import fetcher as fetcher_module  # noqa: E402
+from custom_components.divera247.fetcher import DiveraFetcher  # noqa: E402
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+def test_fetcher_batches_due_ucrs(socket_enabled):
+    """Due siblings are pulled in one batch and share the user sections."""
+    fake = FakeDivera(etag=False)
+    due = {1: 0.0, 2: 0.0, 3: 60.0}
+
+    async def scenario():
+        server = TestServer(fake.app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                fetcher = DiveraFetcher(
+                    session, "secret", base_url=str(server.make_url("")).rstrip("/")
+                )
+                clients = {
+                    ucr_id: fetcher.register(ucr_id, lambda ucr_id=ucr_id: due[ucr_id])
+                    for ucr_id in due
+                }
+                assert await fetcher.async_pull(1) is True
+                pulls_after_batch = fake.requests.count("/api/v2/pull/all")
+                # UCR 2 was pulled with UCR 1, UCR 3 was not due yet
+                assert await fetcher.async_pull(2) is True
+                assert fake.requests.count("/api/v2/pull/all") == pulls_after_batch
+                # Like coordinators after a refresh: 1 and 2 are due in a minute
+                due.update({1: 60.0, 2: 60.0, 3: 0.0})
+                assert await fetcher.async_pull(3) is True
+                return pulls_after_batch, clients
+        finally:
+            await server.close()
+
+    pulls_after_batch, clients = asyncio.run(scenario())
+
+    assert pulls_after_batch == 2
+    assert fake.requests.count("/api/v2/pull/all") == 3
+    first = clients[1].get_snapshot()
+    assert clients[2].get_snapshot().user is first.user
+    assert clients[2].get_snapshot().ucrs is first.ucrs
+    assert clients[3].get_snapshot().vehicles is not first.vehicles
+
+
+async def _with_fetcher(fake: FakeDivera, due: dict, scenario):
+    """Run scenario(fetcher) with the UCRs of due registered."""
+    server = TestServer(fake.app())
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            fetcher = DiveraFetcher(
+                session, "secret", base_url=str(server.make_url("")).rstrip("/")
+            )
+            for ucr_id in due:
+                fetcher.register(ucr_id, lambda ucr_id=ucr_id: due[ucr_id])
+            return await scenario(fetcher)
+    finally:
+        await server.close()
+
+
+def test_fetcher_late_refresh_keeps_change(monkeypatch, socket_enabled):
+    """A change pulled by a sibling is reported however late the UCR asks."""
+    monkeypatch.setattr(fetcher_module, "PULL_BATCH_WINDOW", 0.1)
+    fake = FakeDivera(etag=True)
+    due = {1: 0.0, 2: 0.0}
+
+    async def scenario(fetcher):
+        assert await fetcher.async_pull(1) is True
+        pulls = fake.requests.count("/api/v2/pull/all")
+        await asyncio.sleep(0.2)
+        due.update({1: 60.0, 2: 0.0})
+        # Pulled again (unchanged, 304), but the batch's change is reported
+        results = [await fetcher.async_pull(2)]
+        results.append(await fetcher.async_pull(2))
+        return pulls, results
+
+    pulls, results = asyncio.run(_with_fetcher(fake, due, scenario))
+
+    assert pulls == 2
+    assert results == [True, False]
+    assert fake.requests.count("/api/v2/pull/all") == 4
+    assert fake.not_modified >= 2
+
+
+def test_fetcher_forced_pull_skips_batch_result(socket_enabled):
+    """A forced pull sends a new request instead of using a sibling's result."""
+    fake = FakeDivera(etag=True)
+    due = {1: 0.0, 2: 0.0}
+
+    async def scenario(fetcher):
+        assert await fetcher.async_pull(1) is True
+        fake.version += 1
+        due[1] = 60.0
+        assert await fetcher.async_pull(2, force=True) is True
+        pulls = fake.requests.count("/api/v2/pull/all")
+        assert await fetcher.async_pull(2) is False
+        return pulls, fetcher.register(2)
+
+    pulls, client = asyncio.run(_with_fetcher(fake, due, scenario))
+
+    assert pulls == 3
+    assert client.get_cluster_name_from_ucr(1) == f"FF Test {fake.version}"
@@ -0,0 +1,94 @@
+"""Tests for the alarm, news and event history."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.divera247.const import (  # noqa: E402
+    HISTORY_KIND_ALARM,
+    HISTORY_KIND_EVENT,
+)
+from custom_components.divera247.history import DiveraHistory  # noqa: E402
+from custom_components.divera247.snapshot import DiveraSnapshot  # noqa: E402
+
+DAY = 86400
+
+
+def _at(day: float) -> datetime:
+    return datetime.fromtimestamp(day * DAY, tz=UTC)
+
+
+def _snapshot(alarms: dict, events: dict | None = None) -> DiveraSnapshot:
+    return DiveraSnapshot.from_payload(
+        {
+            "data": {
+                "alarm": {"sorting": list(alarms), "items": alarms},
+                "events": {"sorting": list(events or {}), "items": events or {}},
+            }
+        }
+    )
+
+
+ALARMS = {
+    "1": {"id": 1, "title": "B2 Wohnung", "date": 1 * DAY, "group": [10]},
+    "2": {"id": 2, "title": "TH Person", "address": "Hauptstr. 1", "date": 5 * DAY},
+}
+EVENTS = {
+    "7": {"id": 7, "title": "Übung", "start": 9 * DAY, "end": 11 * DAY},
+}
+
+
+async def test_record_and_query(hass, tmp_path):
+    """Items outlive the API window and are found by range, keyword and group."""
+    history = DiveraHistory(hass, str(tmp_path / "history.db"))
+    first = _snapshot(ALARMS, EVENTS)
+    history.async_record(1, None, first)
+    # The API window moved on: alarm 1 and the event are gone
+    second = _snapshot({"3": {"id": 3, "title": "B3", "date": 20 * DAY}})
+    history.async_record(1, first, second)
+    await hass.async_block_till_done()
+
+    alarms = await history.async_query(HISTORY_KIND_ALARM)
+    assert [alarm["id"] for alarm in alarms] == [3, 2, 1]
+    assert alarms[0]["ucr_id"] == "1"
+    in_range = await history.async_query(HISTORY_KIND_ALARM, _at(1), _at(6))
+    assert [alarm["id"] for alarm in in_range] == [2, 1]
+    by_keyword = await history.async_query(HISTORY_KIND_ALARM, keyword="hauptstr")
+    assert [alarm["id"] for alarm in by_keyword] == [2]
+    assert await history.async_query(HISTORY_KIND_ALARM, keyword="%") == []
+    by_group = await history.async_query(HISTORY_KIND_ALARM, group=10)
+    assert [alarm["id"] for alarm in by_group] == [1]
+    assert await history.async_query(HISTORY_KIND_ALARM, ucr_id=2) == []
+
+    # Events overlapping the range, also across its start
+    events = await history.async_query(HISTORY_KIND_EVENT, _at(10), _at(12))
+    assert [event["title"] for event in events] == ["Übung"]
+    assert await history.async_query(HISTORY_KIND_EVENT, _at(11), _at(12)) == []
+
+    # Changed items replace the stored ones
+    changed = _snapshot({"3": {"id": 3, "title": "B3 Feuer", "date": 20 * DAY}})
+    history.async_record(1, second, changed)
+    await hass.async_block_till_done()
+    assert (await history.async_query(HISTORY_KIND_ALARM, limit=1))[0][
+        "title"
+    ] == "B3 Feuer"
+    await hass.async_add_executor_job(history.close)
+
+
+async def test_remove(hass, tmp_path):
+    """Removing UCRs deletes only their items; a missing file is not created."""
+    path = tmp_path / "history.db"
+    history = DiveraHistory(hass, str(path))
+    await history.async_remove([1])
+    assert not path.exists()
+
+    history.async_record(1, None, _snapshot(ALARMS))
+    history.async_record(2, None, _snapshot({"3": {"id": 3, "date": 2 * DAY}}))
+    await hass.async_block_till_done()
+    await history.async_remove([1])
+    alarms = await history.async_query(HISTORY_KIND_ALARM)
+    assert [(alarm["ucr_id"], alarm["id"]) for alarm in alarms] == [("2", 3)]
+    assert await history.async_query(HISTORY_KIND_ALARM, group=10) == []
+    await hass.async_add_executor_job(history.close)
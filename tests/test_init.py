@@ -0,0 +1,217 @@
+"""Tests for the setup of the Divera integration."""
+
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    async_fire_time_changed,
+)
+
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_FLOW_MINOR_VERSION,
+    CONF_HISTORY,
+    CONF_SCAN_INTERVAL,
+    CONF_STATUS_SENSORS,
+    CONF_VEHICLE_NAME_MODE,
+    DATA_UCRS,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SERVICE_GET_HISTORY,
+    SETUP_RETRY_BASE,
+)
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+async def test_partial_setup(hass, divera_entry):
+    """A failing unit does not take down the others and joins once it recovers."""
+    fake = FakeDivera(etag=False, vehicles=5)
+    fake.failing_ucrs.add("2")
+    entry = await divera_entry(fake.app(), ucrs=[1, 2])
+    assert entry.state is ConfigEntryState.LOADED
+    coordinators = entry.runtime_data.coordinators
+    assert coordinators[1].last_update_success
+    assert coordinators[2].data is None
+    registry = er.async_get(hass)
+    entities = len(er.async_entries_for_config_entry(registry, entry.entry_id))
+    assert entities > 0
+
+    fake.failing_ucrs.clear()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=2 * SETUP_RETRY_BASE)
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinators[2].data is not None
+    # Unit 2 has the same vehicles: its entities double the count
+    assert len(er.async_entries_for_config_entry(registry, entry.entry_id)) == (
+        2 * entities
+    )
+
+
+async def test_vehicles_come_and_go(hass, divera_entry):
+    """Vehicles added or removed in Divera are reconciled without a reload."""
+    fake = FakeDivera(etag=False, vehicles=5)
+    entry = await divera_entry(fake.app())
+    registry = er.async_get(hass)
+    devices = dr.async_get(hass)
+
+    def trackers() -> set[str]:
+        return {
+            entity.unique_id
+            for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+            if entity.domain == "device_tracker"
+        }
+
+    assert trackers() == {f"{DOMAIN}_1_vehicle_{i}_tracker" for i in range(5)}
+    kept = hass.states.get(
+        registry.async_get_entity_id(
+            "device_tracker", DOMAIN, f"{DOMAIN}_1_vehicle_0_tracker"
+        )
+    )
+
+    async def pull(vehicles: int, seconds: int) -> None:
+        fake.vehicles = vehicles
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    await pull(3, 120)
+    assert trackers() == {f"{DOMAIN}_1_vehicle_{i}_tracker" for i in range(3)}
+    assert devices.async_get_device({(DOMAIN, "1_vehicle_4")}) is None
+    assert devices.async_get_device({(DOMAIN, "1_vehicle_0")}) is not None
+
+    await pull(6, 240)
+    assert trackers() == {f"{DOMAIN}_1_vehicle_{i}_tracker" for i in range(6)}
+    # Entities of vehicles that stayed were not recreated
+    state = hass.states.get(kept.entity_id)
+    assert state.last_updated == kept.last_updated
+
+
+async def test_options_applied_without_reload(hass, divera_entry):
+    """Option changes are applied in place; changed units reload the entry."""
+    fake = FakeDivera(etag=False, vehicles=2)
+    entry = await divera_entry(fake.app())
+    runtime_data = entry.runtime_data
+    coordinator = runtime_data.coordinators[1]
+    devices = dr.async_get(hass)
+    assert devices.async_get_device({(DOMAIN, "1_vehicle_0")}).name == "HLF 0"
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={CONF_SCAN_INTERVAL: 600, CONF_VEHICLE_NAME_MODE: "name"},
+    )
+    await hass.async_block_till_done()
+    assert entry.runtime_data is runtime_data
+    # Aligned to the phase of the entry by the poll scheduler
+    assert coordinator.update_interval > timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+    # The vehicles have no "name": the device falls back to the vehicle id
+    assert devices.async_get_device({(DOMAIN, "1_vehicle_0")}).name == "0"
+
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, DATA_UCRS: [1, 2]}
+    )
+    await hass.async_block_till_done()
+    assert entry.runtime_data is not runtime_data
+    assert set(entry.runtime_data.coordinators) == {1, 2}
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {"kind": "alarm", "start": "2026-01-01 00:00:00", "keyword": "Brand"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"items": []}
+
+
+async def test_history_opt_in(hass, divera_entry, history_db):
+    """The history is only kept if enabled and is cleared with the entry."""
+    fake = FakeDivera(etag=False)
+    fake.alarm_items = {"5": {"id": 5, "title": "B2 Brand", "date": 1}}
+    entry = await divera_entry(fake.app())
+    assert entry.runtime_data.coordinators[1].history is None
+
+    async def get_history() -> list[dict]:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_HISTORY,
+            {"kind": "alarm"},
+            blocking=True,
+            return_response=True,
+        )
+        return response["items"]
+
+    assert await get_history() == []
+
+    # Toggling the history reloads the entry
+    runtime_data = entry.runtime_data
+    hass.config_entries.async_update_entry(entry, options={CONF_HISTORY: True})
+    await hass.async_block_till_done()
+    assert entry.runtime_data is not runtime_data
+    assert entry.runtime_data.coordinators[1].history is not None
+    assert [item["id"] for item in await get_history()] == [5]
+
+    history = entry.runtime_data.coordinators[1].history
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert await history.async_query("alarm") == []
+    await hass.async_add_executor_job(history.close)
+
+
+async def test_status_sensors_option(hass, divera_entry):
+    """The helper status sensors only exist with their option and read the counts."""
+    fake = FakeDivera(etag=False, vehicles=1)
+    fake.helpers = [
+        {"id": 1, "status": "active", "group": [7]},
+        {"id": 2, "status": "active", "qualification": [3]},
+        {"id": 3, "status": "inactive", "group": [7]},
+    ]
+    entry = await divera_entry(fake.app())
+    registry = er.async_get(hass)
+
+    def entity_id(key: str) -> str | None:
+        return registry.async_get_entity_id("sensor", DOMAIN, f"{DOMAIN}_1_{key}")
+
+    assert entity_id("status_active") is None
+    assert entity_id("status_overview") is None
+
+    hass.config_entries.async_update_entry(entry, options={CONF_STATUS_SENSORS: True})
+    await hass.async_block_till_done()
+    active = hass.states.get(entity_id("status_active"))
+    assert active.state == "2"
+    assert active.attributes["groups"] == {"7": 1}
+    assert active.attributes["qualifications"] == {"3": 1}
+    assert hass.states.get(entity_id("status_inactive")).state == "1"
+    overview = hass.states.get(entity_id("status_overview"))
+    assert overview.state == "3"
+    assert overview.attributes["active"] == 2
+
+
+async def test_migrate_helper_unique_ids(hass, divera_entry):
+    """The registry entry of the shared helper unique id is removed once."""
+    fake = FakeDivera(etag=False, vehicles=1)
+    fake.helpers = [{"id": 1, "status": "active"}, {"id": 2, "status": "active"}]
+    entry = await divera_entry(fake.app(), minor_version=1, load=False)
+    registry = er.async_get(hass)
+    old = registry.async_get_or_create(
+        "sensor", DOMAIN, f"{DOMAIN}_1_helper_name", config_entry=entry
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.minor_version == CONF_FLOW_MINOR_VERSION
+    assert registry.async_get(old.entity_id) is None
+    helpers = [
+        entity.unique_id
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+        if "_helper_" in entity.unique_id
+    ]
+    assert len(helpers) == 4
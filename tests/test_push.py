@@ -0,0 +1,71 @@
+"""Tests for the push webhook of the Divera integration."""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.setup import async_setup_component  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+)
+
+from custom_components.divera247.const import DOMAIN  # noqa: E402
+from custom_components.divera247.data import DiveraRuntimeData  # noqa: E402
+from custom_components.divera247.push import (  # noqa: E402
+    async_register_push,
+    push_targets,
+)
+
+CLUSTERS = {1: 10, 2: 20}
+
+
+class FakeCoordinator:
+    """Records refresh requests of one UCR."""
+
+    def __init__(self, ucr_id: int, refreshed: list) -> None:
+        """Resolve the cluster of ucr_id like DiveraClient does."""
+        self.ucr_id = ucr_id
+        self.refreshed = refreshed
+        self.divera_client = SimpleNamespace(
+            get_cluster_id_from_ucr=lambda ucr: CLUSTERS[ucr]
+        )
+
+    async def async_request_refresh(self) -> None:
+        self.refreshed.append(self.ucr_id)
+
+
+def test_push_targets():
+    """The ucr parameter wins over the cluster id; unknown pushes refresh all."""
+    coordinators = {ucr_id: FakeCoordinator(ucr_id, []) for ucr_id in CLUSTERS}
+
+    assert push_targets(coordinators, "1", {"cluster_id": 20}) == [1]
+    assert push_targets(coordinators, None, {"cluster_id": 20}) == [2]
+    assert push_targets(coordinators, None, {"data": {"cluster_id": "10"}}) == [1]
+    assert push_targets(coordinators, None, {"cluster_id": 99}) == [1, 2]
+    assert push_targets(coordinators, "7", None) == [1, 2]
+
+
+async def test_push_webhook(hass, hass_client_no_auth):
+    """A push to the webhook refreshes the coordinator of the pushed unit."""
+    assert await async_setup_component(hass, "webhook", {})
+    refreshed: list[int] = []
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    entry.runtime_data = DiveraRuntimeData(
+        {ucr_id: FakeCoordinator(ucr_id, refreshed) for ucr_id in CLUSTERS}
+    )
+    async_register_push(hass, entry, "divera_push")
+    client = await hass_client_no_auth()
+
+    response = await client.post("/api/webhook/divera_push", json={"cluster_id": 20})
+    assert response.status == 200
+    await hass.async_block_till_done()
+    assert refreshed == [2]
+
+    refreshed.clear()
+    response = await client.post("/api/webhook/divera_push", data=b"not json")
+    assert response.status == 200
+    await hass.async_block_till_done()
+    assert refreshed == [1, 2]
@@ -0,0 +1,96 @@
+"""Tests for recording the API responses and replaying them."""
+
+import gzip
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+
+from benchmarks.fake_server import FakeDiveraServer, Phase  # noqa: E402
+from benchmarks.replay import ReplayServer  # noqa: E402
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_RECORD_RESPONSES,
+)
+from custom_components.divera247.divera247 import DiveraClient  # noqa: E402
+from custom_components.divera247.recorder import (  # noqa: E402
+    read_recording,
+    redact_payload,
+)
+
+ACCESSKEY = "recorded-accesskey"
+
+
+def test_redact_payload():
+    """Secrets, personal data and coordinates go, the structure stays."""
+    payload = {
+        "data": {
+            "user": {"accesskey": "k", "firstname": "Max", "auth_jwt": "t", "id": 3},
+            "alarm": {"items": {"1": {"title": "Brand", "lat": 50.1, "text": "x"}}},
+            "helpers": [{"lastname": "Muster", "status": "active", "group": [1]}],
+        }
+    }
+    assert redact_payload(payload) == {
+        "data": {
+            "user": {
+                "accesskey": "**REDACTED**",
+                "firstname": "**REDACTED**",
+                "auth_jwt": "**REDACTED**",
+                "id": 3,
+            },
+            "alarm": {
+                "items": {
+                    "1": {"title": "**REDACTED**", "lat": 0, "text": "**REDACTED**"}
+                }
+            },
+            "helpers": [{"lastname": "**REDACTED**", "status": "active", "group": [1]}],
+        }
+    }
+    assert payload["data"]["user"]["accesskey"] == "k"
+
+
+async def test_record_and_replay(
+    hass, divera_entry, divera_server, monkeypatch, tmp_path
+):
+    """A recorded status change is replayed in order, without the access key."""
+    monkeypatch.setattr("custom_components.divera247.RECORDING_DIR", str(tmp_path))
+    fake = FakeDiveraServer((Phase(change_every=None),))
+    entry = await divera_entry(
+        fake.app(), {CONF_RECORD_RESPONSES: True}, accesskey=ACCESSKEY
+    )
+    coordinator = entry.runtime_data.coordinators[1]
+    client = coordinator.divera_client
+    await coordinator.async_refresh()
+    await client.set_user_state_by_id("4")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+    path = tmp_path / f"{entry.entry_id}.jsonl.gz"
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        assert ACCESSKEY not in file.read()
+    header, responses = read_recording(str(path))
+    assert header["version"] == 1
+    pulls = [r for r in responses if r["url"].startswith("/api/v2/pull/all?")]
+    assert [r["status"] for r in pulls] == [200, 304, 200]
+    assert all("ucr=1" in r["url"] for r in pulls)
+    assert pulls[0]["body"]["data"]["user"]["firstname"] == "**REDACTED**"
+    assert pulls[1]["body"] is None
+
+    replay = ReplayServer(responses, step=True)
+    assert replay.ucr_ids == [1]
+    server = await divera_server(replay.app())
+    async with ClientSession() as session:
+        client = DiveraClient(
+            session,
+            "any-accesskey",
+            base_url=str(server.make_url("")).rstrip("/"),
+            ucr_id=1,
+        )
+        assert await client.pull_data()
+        assert client.get_user_state() == "Status 1"
+        assert not await client.pull_data()
+        assert await client.pull_data()
+        assert client.get_user_state() == "Status 4"
+        assert replay.finished
@@ -0,0 +1,114 @@
+"""Tests for the integration-wide poll scheduler."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from custom_components.divera247.fetcher import DiveraFetcher  # noqa: E402
+from custom_components.divera247.scheduler import DiveraPollScheduler  # noqa: E402
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+def test_align_spreads_groups():
+    """Groups poll at evenly spaced phases, never later than one interval."""
+    scheduler = DiveraPollScheduler()
+    for group in ("a", "b", "c", "d"):
+        scheduler.register(group)
+
+    delays = {group: scheduler.align(group, 60) for group in ("a", "b", "c", "d")}
+
+    assert all(0 < delay <= 60 for delay in delays.values())
+    phases = sorted(delay % 60 for delay in delays.values())
+    gaps = [round(b - a) for a, b in zip(phases, phases[1:])]
+    assert gaps == [15, 15, 15]
+    assert scheduler.align("unknown", 60) == 60
+
+
+def test_align_just_polled_phase(monkeypatch):
+    """A poll slightly ahead of its phase waits one interval, not a second one."""
+    now = 1000.0
+    monkeypatch.setattr("custom_components.divera247.scheduler.monotonic", lambda: now)
+    scheduler = DiveraPollScheduler()
+    scheduler.register("a")
+    scheduler.register("b")
+
+    # Phase of b is 30 s into each interval
+    now += 29.5
+    assert scheduler.align("b", 60) == 60
+    now += 0.5
+    assert scheduler.align("b", 60) == 60
+    # Right after its phase a group waits almost a full interval ...
+    now += 2
+    assert scheduler.align("b", 60) == 58
+    # ... and before it only until the phase
+    assert scheduler.align("a", 60) == 28
+
+
+def test_budget_serves_by_priority():
+    """Once the bucket is empty, waiting polls are released by priority."""
+
+    async def scenario():
+        scheduler = DiveraPollScheduler(rate=20, burst=1)
+        scheduler.register("entry")
+        await scheduler.async_acquire("entry", 1, priority=2)
+        order = []
+
+        async def poll(ucr_id, priority):
+            await scheduler.async_acquire("entry", ucr_id, priority)
+            order.append(ucr_id)
+
+        tasks = [
+            asyncio.create_task(poll(ucr_id, priority))
+            for ucr_id, priority in ((1, 2), (2, 0), (3, 1))
+        ]
+        await asyncio.sleep(0)
+        waiting = [poll["ucr_id"] for poll in scheduler.queue_state()["waiting"]]
+        await asyncio.gather(*tasks)
+        return waiting, order
+
+    waiting, order = asyncio.run(scenario())
+
+    assert waiting == [2, 3, 1]
+    assert order == [2, 3, 1]
+
+
+def test_budget_charges_per_request(socket_enabled):
+    """Every request of a batch costs a token, collected results cost none."""
+    fake = FakeDivera(etag=True)
+
+    async def scenario():
+        scheduler = DiveraPollScheduler(rate=1e-6, burst=10)
+        scheduler.register("entry")
+        server = TestServer(fake.app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                fetcher = DiveraFetcher(
+                    session, "secret", base_url=str(server.make_url("")).rstrip("/")
+                )
+                for ucr_id in (1, 2):
+                    client = fetcher.register(ucr_id, lambda: 0.0)
+                    client.set_request_gate(
+                        lambda ucr_id=ucr_id: scheduler.async_acquire(
+                            "entry", ucr_id, 0
+                        )
+                    )
+                await fetcher.async_pull(1)
+                after_batch = scheduler.queue_state()["tokens"]
+                await fetcher.async_pull(2)
+                return after_batch, scheduler.queue_state()["tokens"]
+        finally:
+            await server.close()
+
+    after_batch, after_collect = asyncio.run(scenario())
+
+    # pull/all and /api/v2/alarms for both units
+    assert after_batch == 6
+    assert after_collect == 6
+    assert len(fake.requests) == 4
@@ -0,0 +1,112 @@
+"""Tests for the Divera snapshot aggregates."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.divera247.snapshot import DiveraSnapshot  # noqa: E402
+
+PAYLOAD = {
+    "data": {
+        "user": {"firstname": "Max", "lastname": "Muster"},
+        "status": {"status_id": 2},
+        "ucr_active": 1,
+        "cluster": {
+            "status": {"1": {"name": "Frei"}, "2": {"name": "Im Dienst"}},
+            "statussorting": [2, 1],
+            "vehicle": {"5": {"shortname": "HLF"}},
+        },
+        "alarm": {
+            "sorting": [12, 11],
+            "items": {"11": {"id": 11, "title": "Old"}, "12": {"id": 12}},
+        },
+        "news": {"sorting": [3]},
+    }
+}
+
+
+def test_snapshot_sections():
+    """The sections of the payload are extracted once, in API order."""
+    snapshot = DiveraSnapshot.from_payload(PAYLOAD)
+
+    assert snapshot.user["firstname"] == "Max"
+    assert snapshot.user_status["status_id"] == 2
+    assert snapshot.ucr_active == 1
+    assert snapshot.status_sorting == (2, 1)
+    assert snapshot.vehicles["5"]["shortname"] == "HLF"
+    assert snapshot.alarms.sorting == ("12", "11")
+    assert snapshot.alarms.first() == {"id": 12}
+    assert [alarm.get("id") for alarm in snapshot.alarms] == [12, 11]
+    # Ids in sorting without an item yield empty items
+    assert snapshot.news.first() == {}
+    assert list(snapshot.events) == []
+    assert snapshot.events.first() is None
+
+
+def test_snapshot_missing_sections():
+    """A payload without data builds an empty snapshot."""
+    for payload in (None, {}, {"data": None}, {"data": {"cluster": []}}):
+        snapshot = DiveraSnapshot.from_payload(payload)
+
+        assert dict(snapshot.user) == {}
+        assert dict(snapshot.vehicles) == {}
+        assert snapshot.alarms.first() is None
+        assert snapshot.ucr_active is None
+
+
+def test_snapshot_immutable():
+    """Neither the snapshot nor its sections can be modified."""
+    snapshot = DiveraSnapshot.from_payload(PAYLOAD)
+
+    with pytest.raises(FrozenInstanceError):
+        snapshot.user = {}
+    with pytest.raises(FrozenInstanceError):
+        snapshot.alarms.sorting = ()
+    with pytest.raises(TypeError):
+        snapshot.user["firstname"] = "Erika"
+    with pytest.raises(TypeError):
+        snapshot.vehicles["6"] = {}
+    with pytest.raises(TypeError):
+        snapshot.alarms.items["13"] = {}
+
+
+HELPERS = [
+    {"id": 1, "status": "active", "group": [10, 11], "qualification": [7]},
+    {"id": 2, "status": "active", "group": [10], "qualification": []},
+    {"id": 3, "status": "on_duty", "groups": {"11": {}}, "qualifications": 7},
+    {"id": 4, "status": "inactive"},
+    {"id": 5},
+]
+
+
+def test_helper_counts():
+    """One pass counts the helpers by status, group and qualification."""
+    snapshot = DiveraSnapshot.from_payload({"data": {"helpers": HELPERS}})
+    counts = snapshot.helper_counts
+
+    assert counts.total == 5
+    assert dict(counts.by_status) == {
+        "active": 2,
+        "on_duty": 1,
+        "inactive": 1,
+        "unknown": 1,
+    }
+    assert counts.count("active", group="10") == 2
+    assert counts.count("on_duty", group=11) == 1
+    assert counts.count("active", qualification="7") == 1
+    assert counts.count("on_duty", qualification="7") == 1
+    assert counts.count("active", qualification="8") == 0
+    assert set(snapshot.helpers_by_key) == {"1", "2", "3", "4", "5"}
+    # Counted once, on first access
+    assert snapshot.helper_counts is counts
+    assert snapshot.with_alarms_v2(None).helper_counts == counts
+
+
+def test_helper_counts_without_helpers():
+    """A payload without helpers has empty counts."""
+    counts = DiveraSnapshot.from_payload({}).helper_counts
+
+    assert counts.total == 0
+    assert counts.count("active") == 0
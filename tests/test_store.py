@@ -0,0 +1,66 @@
+"""Tests for the stored snapshots of the Divera integration."""
+
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    async_fire_time_changed,
+)
+
+from custom_components.divera247.const import (  # noqa: E402
+    ATTR_STALE,
+    STORE_SAVE_DELAY,
+)
+from custom_components.divera247.coordinator import DiveraCoordinator  # noqa: E402
+from custom_components.divera247.device_tracker import (  # noqa: E402
+    DiveraVehicleTrackerEntity,
+)
+from custom_components.divera247.store import REDACTED, DiveraSnapshotStore  # noqa: E402
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+async def test_restore_stored_snapshot(hass, hass_storage, divera_server):
+    """A stored snapshot sets up stale entities that survive a failed refresh."""
+    fake = FakeDivera(etag=True)
+    server = await divera_server(fake.app())
+    base_url = str(server.make_url("")).rstrip("/")
+    async with ClientSession() as session:
+        store = DiveraSnapshotStore(hass, "entry")
+        await store.async_load()
+        coordinator = DiveraCoordinator(
+            hass, session, "secret", base_url, ucr_id=1, store=store
+        )
+        assert not coordinator.async_restore()
+        await coordinator.async_refresh()
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=STORE_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        stored = hass_storage["divera247.entry"]["data"]["ucrs"]["1"]
+        assert stored["payload"]["data"]["user"]["accesskey"] == REDACTED
+        assert stored["payload"]["data"]["user"]["firstname"] == "Max"
+
+        # Next start, offline
+        await server.close()
+        store = DiveraSnapshotStore(hass, "entry")
+        await store.async_load()
+        coordinator = DiveraCoordinator(
+            hass, session, "secret", base_url, ucr_id=1, store=store
+        )
+        assert coordinator.async_restore()
+        assert coordinator.stale
+        assert coordinator.data.get_vehicle_name_by_id("3") == "HLF 3"
+        entity = DiveraVehicleTrackerEntity(coordinator, "3", "auto")
+        assert entity.extra_state_attributes[ATTR_STALE] is True
+
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert entity.available
+        assert entity.extra_state_attributes[ATTR_STALE] is True
@@ -0,0 +1,123 @@
+"""Tests for the performance telemetry."""
+
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+
+from custom_components.divera247.const import (  # noqa: E402
+    CONF_TELEMETRY,
+    DATA_ACCESSKEY,
+)
+from custom_components.divera247.diagnostics import (  # noqa: E402
+    async_get_config_entry_diagnostics,
+)
+from custom_components.divera247.sensor import TELEMETRY_SENSORS  # noqa: E402
+from custom_components.divera247.telemetry import (  # noqa: E402
+    METRIC_ALARM_LATENCY,
+    METRIC_ALARM_NETWORK_TIME,
+    METRIC_ALARM_POLL_WAIT,
+    METRIC_REQUEST_TIME,
+    METRIC_RESPONSE_SIZE,
+    METRICS,
+    DiveraTelemetry,
+)
+
+from .test_divera247 import FakeDivera  # noqa: E402
+
+
+def test_percentiles_over_window():
+    """Percentiles are nearest-rank over the last samples only."""
+    telemetry = DiveraTelemetry(window=100)
+    assert telemetry.stats(METRIC_REQUEST_TIME) == {
+        "count": 0,
+        "last": None,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+        "max": None,
+    }
+    for value in range(1000, 0, -1):
+        telemetry.record(METRIC_REQUEST_TIME, value)
+    stats = telemetry.stats(METRIC_REQUEST_TIME)
+    # Window holds 100..1
+    assert stats == {
+        "count": 1000,
+        "last": 1,
+        "p50": 50,
+        "p95": 95,
+        "p99": 99,
+        "max": 100,
+    }
+    assert set(telemetry.as_dict()) == set(METRICS)
+
+
+def test_alarm_latency_breakdown_and_histogram():
+    """The latency is split at the request start and the body read."""
+    telemetry = DiveraTelemetry()
+    telemetry.record_alarm(1000, 1040, 1040.5, 1041)
+    # Server clock ahead of ours: no negative poll wait
+    telemetry.record_alarm(1000, 999, 999.25, 999.5)
+    assert telemetry.stats(METRIC_ALARM_POLL_WAIT)["max"] == 40
+    assert telemetry.stats(METRIC_ALARM_NETWORK_TIME)["last"] == 0.25
+    assert telemetry.histogram(METRIC_ALARM_LATENCY, (5, 60)) == {
+        "<=5": 1,
+        "<=60": 1,
+        ">60": 0,
+    }
+
+
+def _telemetry_entities(hass, entry):
+    return [
+        entity
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+        if "_telemetry_" in entity.unique_id
+    ]
+
+
+async def test_telemetry_disabled(hass, divera_entry):
+    """Without the option nothing is measured and no sensors are added."""
+    entry = await divera_entry(FakeDivera(etag=False, vehicles=1).app())
+
+    coordinator = entry.runtime_data.coordinators[1]
+    assert coordinator.telemetry is None
+    assert _telemetry_entities(hass, entry) == []
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["ucrs"]["1"]["telemetry"] is None
+
+
+async def test_telemetry_sensors_and_diagnostics(hass, divera_entry):
+    """With the option the requests and new alarms are measured and shown."""
+    fake = FakeDivera(etag=False, vehicles=1)
+    entry = await divera_entry(fake.app(), {CONF_TELEMETRY: True})
+
+    telemetry = entry.runtime_data.coordinators[1].telemetry
+    assert telemetry is not None
+    assert telemetry.stats(METRIC_REQUEST_TIME)["count"] >= 1
+    assert telemetry.stats(METRIC_RESPONSE_SIZE)["max"] > 0
+    entities = _telemetry_entities(hass, entry)
+    assert len(entities) == len(TELEMETRY_SENSORS)
+    size = next(e for e in entities if e.unique_id.endswith(METRIC_RESPONSE_SIZE))
+    state = hass.states.get(size.entity_id)
+    assert float(state.state) > 0
+    assert state.attributes["count"] >= 1
+
+    # Seen by the next pull, 30 seconds after it was raised
+    fake.alarm_items = {"7": {"id": 7, "title": "Brand", "date": time.time() - 30}}
+    await entry.runtime_data.coordinators[1].async_refresh()
+    await hass.async_block_till_done()
+    latency = next(e for e in entities if e.unique_id.endswith(METRIC_ALARM_LATENCY))
+    state = hass.states.get(latency.entity_id)
+    assert 30 <= float(state.state) < 60
+    assert state.attributes["histogram"]["<=60"] == 1
+    assert state.attributes["poll_wait"]["last"] >= 30
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["entry"]["data"][DATA_ACCESSKEY] == "**REDACTED**"
+    assert diagnostics["ucrs"]["1"]["telemetry"][METRIC_REQUEST_TIME]["count"] >= 1
+    assert "secret" not in str(diagnostics)